@@ -0,0 +1,128 @@
+"""
+Shared PPTX extraction package used by the serverless API and the CLI.
+
+The python-pptx engine is not imported with the package: its names below are
+resolved on first access, so the table path starts without loading
+python-pptx and lxml.
+"""
+
+from _extractor.cache import EXTRACTOR_VERSION, ResultCache, cache_from_env
+from _extractor.columnar import build_columnar_table, parse_column
+from _extractor.engine import (
+    ENGINE_PYTHON_PPTX,
+    ENGINE_XML,
+    extract_presentation,
+    iter_presentation,
+    iter_slide_content,
+)
+from _extractor.filters import ExtractionFilter, parse_slide_ranges
+from _extractor.incremental import SlideStore, deck_slide_hashes, diff_decks, slide_store_from_env
+from _extractor.instrumentation import (
+    COUNT_FILES,
+    COUNT_TABLES,
+    NULL_METRICS,
+    STAGE_CACHE,
+    STAGE_DIFF,
+    STAGE_EXTRACT,
+    STAGE_MULTIPART,
+    STAGE_SERIALIZE,
+    STAGE_WRITE,
+    NullMetrics,
+    RequestMetrics,
+    RequestProfiler,
+    SamplingProfiler,
+    profiler_from_env,
+)
+from _extractor.multipart import (
+    MultipartError,
+    MultipartParser,
+    MultipartReader,
+    Part,
+    PartValidator,
+    SpooledUpload,
+    UploadRejected,
+    parse_boundary,
+    spool_part,
+)
+from _extractor.tables import (
+    EVENT_METADATA,
+    EVENT_SLIDE,
+    EVENT_TABLE,
+    FORMAT_COLUMNAR,
+    FORMAT_ROWS,
+    OUTPUT_FORMATS,
+    build_table,
+    collect_presentation,
+    iter_slide_records,
+    iter_table_records,
+)
+from _extractor.warmup import prewarm
+from _extractor.xml_engine import iter_presentation_xml, iter_slide_content_xml
+
+_PPTX_ENGINE_NAMES = ('extract_table', 'iter_presentation_pptx', 'iter_slide_content_pptx')
+
+__all__ = [
+    "COUNT_FILES",
+    "COUNT_TABLES",
+    "ENGINE_PYTHON_PPTX",
+    "ENGINE_XML",
+    "EVENT_METADATA",
+    "EVENT_SLIDE",
+    "EVENT_TABLE",
+    "EXTRACTOR_VERSION",
+    "ExtractionFilter",
+    "FORMAT_COLUMNAR",
+    "FORMAT_ROWS",
+    "MultipartError",
+    "MultipartParser",
+    "MultipartReader",
+    "NULL_METRICS",
+    "NullMetrics",
+    "OUTPUT_FORMATS",
+    "Part",
+    "PartValidator",
+    "RequestMetrics",
+    "RequestProfiler",
+    "ResultCache",
+    "STAGE_CACHE",
+    "STAGE_DIFF",
+    "STAGE_EXTRACT",
+    "STAGE_MULTIPART",
+    "STAGE_SERIALIZE",
+    "STAGE_WRITE",
+    "SamplingProfiler",
+    "SlideStore",
+    "SpooledUpload",
+    "UploadRejected",
+    "build_columnar_table",
+    "build_table",
+    "cache_from_env",
+    "collect_presentation",
+    "deck_slide_hashes",
+    "diff_decks",
+    "extract_presentation",
+    "extract_table",
+    "iter_presentation",
+    "iter_presentation_pptx",
+    "iter_presentation_xml",
+    "iter_slide_content",
+    "iter_slide_content_pptx",
+    "iter_slide_content_xml",
+    "iter_slide_records",
+    "iter_table_records",
+    "parse_boundary",
+    "parse_column",
+    "parse_slide_ranges",
+    "prewarm",
+    "profiler_from_env",
+    "slide_store_from_env",
+    "spool_part",
+]
+
+
+def __getattr__(name: str):
+    if name in _PPTX_ENGINE_NAMES:
+        from _extractor import pptx_engine
+
+        return getattr(pptx_engine, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
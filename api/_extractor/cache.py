@@ -0,0 +1,241 @@
+"""
+Content-addressed cache for extraction results.
+
+Results are keyed on the SHA-256 of the uploaded file plus the extractor
+version, so re-uploading an unchanged deck skips extraction entirely. There
+is an in-process LRU tier bounded by a byte budget and an optional on-disk
+tier of gzip-compressed JSON files, also bounded by a byte budget: once it
+grows past it, the least recently used files are deleted.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+# Bump whenever extraction output changes so stale cache entries are ignored
+EXTRACTOR_VERSION = '3'
+
+DEFAULT_MEMORY_BYTES = 64 * 1024 * 1024  # 64MB
+DEFAULT_DISK_BYTES = 1024 * 1024 * 1024  # 1GB
+DISK_EVICT_TARGET = 0.9  # Evict down to this fraction of the disk budget
+DISK_SUFFIX = '.json.gz'
+
+
+class ResultCache:
+    """Two-tier (memory + optional disk) cache of extraction results.
+
+    Entries are stored as encoded JSON so the memory budget reflects real
+    payload size and callers always receive a fresh copy they may mutate.
+    """
+
+    def __init__(self, max_memory_bytes: int = DEFAULT_MEMORY_BYTES, disk_dir: str | None = None,
+                 max_disk_bytes: int = DEFAULT_DISK_BYTES):
+        """
+        Args:
+            max_memory_bytes: Byte budget for the in-process LRU tier
+            disk_dir: Directory for the on-disk tier, or None to disable it
+            max_disk_bytes: Byte budget for the on-disk tier
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        # Size of the disk tier as last scanned plus what this process wrote
+        # since; other processes sharing the directory are picked up by the
+        # rescan done before each eviction
+        self._disk_bytes: int | None = None
+        self._disk_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(content_sha256: str, *options: str) -> str:
+        """Build a cache key for a file and any output-affecting options.
+
+        Args:
+            content_sha256: Hex SHA-256 digest of the uploaded file bytes
+            options: Extra strings that change the extraction output
+
+        Returns:
+            Hex digest identifying this file/options/version combination
+        """
+        digest = hashlib.sha256()
+        digest.update(EXTRACTOR_VERSION.encode())
+        for option in options:
+            digest.update(b'\0' + option.encode())
+        digest.update(b'\0' + content_sha256.encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        """Look up a cached result, promoting disk hits into memory.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            A fresh copy of the cached result, or None on a miss
+        """
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(payload)
+
+        payload = self._read_disk(key)
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._store_memory(key, payload)
+        return json.loads(payload)
+
+    def put(self, key: str, result: dict):
+        """Store a result in both tiers.
+
+        Args:
+            key: Key from make_key
+            result: JSON-serializable extraction result
+        """
+        payload = json.dumps(result).encode()
+        with self._lock:
+            self._store_memory(key, payload)
+        self._write_disk(key, payload)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current memory usage."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "diskHits": self.disk_hits,
+                "entries": len(self._entries),
+                "memoryBytes": self._memory_bytes,
+            }
+
+    def _store_memory(self, key: str, payload: bytes):
+        """Insert into the LRU tier and evict down to the byte budget."""
+        if len(payload) > self.max_memory_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._entries[key] = payload
+        self._memory_bytes += len(payload)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], f'{key}{DISK_SUFFIX}')
+
+    def _read_disk(self, key: str) -> bytes | None:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with gzip.open(path, 'rb') as f:
+                payload = f.read()
+        except (OSError, EOFError):
+            return None
+        try:
+            # Eviction goes by modification time, so mark the entry as used
+            os.utime(path)
+        except OSError:
+            pass
+        return payload
+
+    def _write_disk(self, key: str, payload: bytes):
+        """Write atomically so concurrent readers never see partial files."""
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            size = os.path.getsize(path)
+        except OSError:
+            # The disk tier is best-effort; a read-only or full disk just
+            # means results stay memory-only
+            return
+
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(entry[1] for entry in self._scan_disk())
+            else:
+                self._disk_bytes += size
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _scan_disk(self) -> list[tuple[float, int, str]]:
+        """List the disk tier's entries as (mtime, size, path) tuples.
+
+        Only the two-character shard directories are scanned, so other
+        caches may keep their own subdirectories under the same root.
+        """
+        entries = []
+        try:
+            with os.scandir(self.disk_dir) as root:
+                shards = [entry.path for entry in root if len(entry.name) == 2 and entry.is_dir()]
+        except OSError:
+            return entries
+        for shard in shards:
+            try:
+                with os.scandir(shard) as files:
+                    names = [entry for entry in files if entry.name.endswith(DISK_SUFFIX)]
+            except OSError:
+                continue
+            for entry in names:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # Removed since the listing
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict_disk(self):
+        """Delete the least recently used files down to DISK_EVICT_TARGET of
+        the budget, leaving headroom so eviction does not run on every write."""
+        entries = sorted(self._scan_disk())
+        total = sum(entry[1] for entry in entries)
+        target = self.max_disk_bytes * DISK_EVICT_TARGET
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass  # Evicted by another process
+            except OSError:
+                continue
+            total -= size
+        self._disk_bytes = total
+
+
+def cache_from_env() -> ResultCache:
+    """Build a ResultCache configured from environment variables.
+
+    PPTX_CACHE_MAX_BYTES sets the memory budget (0 disables the memory
+    tier), PPTX_CACHE_DIR enables the on-disk tier and
+    PPTX_CACHE_DISK_MAX_BYTES sets its budget.
+    """
+    max_bytes = int(os.environ.get('PPTX_CACHE_MAX_BYTES', DEFAULT_MEMORY_BYTES))
+    disk_dir = os.environ.get('PPTX_CACHE_DIR') or None
+    max_disk_bytes = int(os.environ.get('PPTX_CACHE_DISK_MAX_BYTES') or DEFAULT_DISK_BYTES)
+    return ResultCache(max_memory_bytes=max_bytes, disk_dir=disk_dir, max_disk_bytes=max_disk_bytes)
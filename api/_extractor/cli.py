@@ -0,0 +1,250 @@
+"""
+Command-line conversion of PowerPoint decks to structured JSON and markdown.
+
+Slides are streamed from the extraction engine and written to both outputs
+as they arrive, so a deck's full output is never held in memory and large
+archives of decks can be converted in one run. With --workers, slides of
+large decks are parsed on a process pool.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from typing import Iterator
+
+from _extractor.engine import iter_slide_content
+from _extractor.tables import EVENT_METADATA, EVENT_SLIDE
+
+PPTX_EXTENSION = '.pptx'
+
+
+class _OutputFile:
+    """Text output that is removed again if the deck fails part way, so
+    failed conversions never leave truncated files behind."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def commit(self):
+        self.file.close()
+
+    def discard(self):
+        self.file.close()
+        os.unlink(self.path)
+
+
+class JsonWriter:
+    """Writes {"metadata": {...}, "slides": [...]} one slide at a time."""
+
+    def __init__(self, path: str):
+        self.output = _OutputFile(path)
+        self._slide_count = 0
+
+    def start(self, metadata: dict):
+        metadata_json = json.dumps(metadata, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+        self.output.file.write(f'{{\n  "metadata": {metadata_json},\n  "slides": [')
+
+    def write_slide(self, slide: dict):
+        separator = ',' if self._slide_count else ''
+        slide_json = json.dumps(slide, indent=2, ensure_ascii=False).replace('\n', '\n    ')
+        self.output.file.write(f'{separator}\n    {slide_json}')
+        self._slide_count += 1
+
+    def finish(self):
+        self.output.file.write('\n  ]\n}\n' if self._slide_count else ']\n}\n')
+        self.output.commit()
+
+    def discard(self):
+        self.output.discard()
+
+
+class MarkdownWriter:
+    """Writes a readable markdown rendering one slide at a time."""
+
+    def __init__(self, path: str, source_name: str):
+        self.output = _OutputFile(path)
+        self.source_name = source_name
+
+    def start(self, metadata: dict):
+        f = self.output.file
+        f.write(f"# PowerPoint Extraction: {self.source_name}\n\n")
+        f.write(f"**Total Slides:** {metadata['slideCount']}\n\n")
+        f.write("---\n\n")
+
+    def write_slide(self, slide: dict):
+        f = self.output.file
+        f.write(f"## Slide {slide['slideNumber']}")
+        if slide.get("title"):
+            f.write(f": {slide['title']}")
+        f.write("\n\n")
+
+        if slide.get("content"):
+            for item in slide["content"]:
+                indent = "  " * item.get("level", 0)
+                f.write(f"{indent}- {item['text']}\n")
+            f.write("\n")
+
+        for table in slide.get("tables", []):
+            if table["headers"]:
+                f.write("| " + " | ".join(table["headers"]) + " |\n")
+                f.write("| " + " | ".join(["---"] * len(table["headers"])) + " |\n")
+                for row in table["rows"]:
+                    values = [str(row.get(h, "")) for h in table["headers"]]
+                    f.write("| " + " | ".join(values) + " |\n")
+                f.write("\n")
+
+        f.write("---\n\n")
+
+    def finish(self):
+        self.output.commit()
+
+    def discard(self):
+        self.output.discard()
+
+
+def expand_inputs(patterns: list[str]) -> Iterator[str]:
+    """Resolve input arguments to .pptx paths.
+
+    Each argument may be a file, a directory (searched recursively) or a
+    glob pattern. Paths are yielded once, in argument order.
+
+    Args:
+        patterns: Command-line input arguments
+
+    Yields:
+        Paths of .pptx files
+    """
+    seen = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(glob.glob(os.path.join(glob.escape(pattern), '**', f'*{PPTX_EXTENSION}'), recursive=True))
+        elif os.path.exists(pattern):
+            matches = [pattern]
+        else:
+            matches = sorted(glob.glob(pattern, recursive=True))
+
+        for path in matches:
+            key = os.path.abspath(path)
+            if key not in seen and path.lower().endswith(PPTX_EXTENSION):
+                seen.add(key)
+                yield path
+
+
+def _clean_slide(slide: dict) -> dict:
+    """Drop empty content, tables and notes to keep the output compact."""
+    return {key: value for key, value in slide.items() if key in ("slideNumber", "title") or value}
+
+
+def convert_deck(path: str, writers: list, workers: int = 0) -> tuple[int, int]:
+    """Stream one deck's slides into the given writers.
+
+    Args:
+        path: Path of the .pptx file
+        writers: JsonWriter/MarkdownWriter instances for this deck
+        workers: Worker processes for large decks; 0 or 1 keeps it serial
+
+    Returns:
+        Tuple of (slide count, table count)
+    """
+    slide_count = 0
+    table_count = 0
+    try:
+        with open(path, 'rb') as f:
+            for kind, payload in iter_slide_content(f, workers=workers):
+                if kind == EVENT_METADATA:
+                    for writer in writers:
+                        writer.start(payload)
+                elif kind == EVENT_SLIDE:
+                    slide = _clean_slide(payload)
+                    for writer in writers:
+                        writer.write_slide(slide)
+                    slide_count += 1
+                    table_count += len(payload["tables"])
+    except BaseException:
+        for writer in writers:
+            writer.discard()
+        raise
+
+    for writer in writers:
+        writer.finish()
+    return slide_count, table_count
+
+
+def _output_stem(path: str, used: set[str]) -> str:
+    """Pick an output name for a deck, disambiguating repeated names."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    candidate = stem
+    counter = 2
+    while candidate in used:
+        candidate = f"{stem} ({counter})"
+        counter += 1
+    used.add(candidate)
+    return candidate
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Extract PowerPoint content into structured JSON and markdown for AI analysis.",
+    )
+    parser.add_argument('inputs', nargs='+', help="PPTX files, directories or glob patterns")
+    parser.add_argument('-o', '--output-dir', default='.', help="Directory for both outputs (default: current)")
+    parser.add_argument('--json-dir', help="Directory for JSON output (default: --output-dir)")
+    parser.add_argument('--markdown-dir', help="Directory for markdown output (default: --output-dir)")
+    parser.add_argument('--no-json', action='store_true', help="Skip JSON output")
+    parser.add_argument('--no-markdown', action='store_true', help="Skip markdown output")
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('PPTX_EXTRACT_WORKERS') or 0),
+                        help="Worker processes for parsing slides of large decks (default: serial)")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the CLI.
+
+    Returns:
+        Exit status: 0 if every deck converted, 1 if any failed, 2 if no
+        input matched
+    """
+    args = build_parser().parse_args(argv)
+    json_dir = args.json_dir or args.output_dir
+    markdown_dir = args.markdown_dir or args.output_dir
+
+    failures = 0
+    converted = 0
+    used_stems: set[str] = set()
+
+    for path in expand_inputs(args.inputs):
+        stem = _output_stem(path, used_stems)
+        outputs = []
+        writers = []
+        try:
+            if not args.no_json:
+                outputs.append(os.path.join(json_dir, f'{stem}.json'))
+                writers.append(JsonWriter(outputs[-1]))
+            if not args.no_markdown:
+                outputs.append(os.path.join(markdown_dir, f'{stem}.md'))
+                writers.append(MarkdownWriter(outputs[-1], os.path.basename(path)))
+        except OSError as e:
+            for writer in writers:
+                writer.discard()
+            failures += 1
+            print(f"{path}: failed: {e}", file=sys.stderr)
+            continue
+
+        try:
+            slide_count, table_count = convert_deck(path, writers, args.workers)
+        except Exception as e:
+            failures += 1
+            print(f"{path}: failed: {e}", file=sys.stderr)
+            continue
+
+        converted += 1
+        print(f"{path}: {slide_count} slides, {table_count} tables -> {', '.join(outputs) or 'no output'}")
+
+    if converted + failures == 0:
+        print("No .pptx files matched the given inputs", file=sys.stderr)
+        return 2
+    return 1 if failures else 0
@@ -0,0 +1,160 @@
+"""
+Columnar table output with typed numeric columns.
+
+Headers are emitted once and each column's values are stored in a single
+array, parsed in bulk to the column's detected type. This avoids repeating
+header names in every row and keeps duplicate header names distinct, since
+columns are positional.
+"""
+
+import re
+from datetime import datetime
+
+TYPE_INT = 'int'
+TYPE_FLOAT = 'float'
+TYPE_CURRENCY = 'currency'
+TYPE_PERCENT = 'percent'
+TYPE_DATE = 'date'
+TYPE_TEXT = 'text'
+
+# Leading zeros (ZIP codes, IDs) are not treated as numbers
+_INTEGER = r'[1-9]\d{0,2}(?:,\d{3})+|[1-9]\d*|0'
+_NUMBER = rf'(?:{_INTEGER})(?:\.\d+)?|\.\d+'
+_INT_RE = re.compile(rf'^([-+]?)({_INTEGER})$')
+_FLOAT_RE = re.compile(rf'^([-+]?)({_NUMBER})\s?([KMB]?)$', re.IGNORECASE)
+_CURRENCY_RE = re.compile(rf'^(\(?)([-+]?)\$\s?([-+]?)({_NUMBER})\s?([KMB]?)(\)?)$', re.IGNORECASE)
+_PERCENT_RE = re.compile(rf'^([-+]?)({_NUMBER})\s?%$')
+
+_MULTIPLIERS = {'': 1, 'k': 1_000, 'm': 1_000_000, 'b': 1_000_000_000}
+# Month-year values ("Jan 2024") parse to the first of the month
+_DATE_FORMATS = ('%Y-%m-%d', '%m/%d/%Y', '%m/%d/%y', '%b %d, %Y', '%B %d, %Y', '%d-%b-%Y', '%d-%b-%y',
+                 '%b %Y', '%B %Y')
+# Cells meaning "no value"; compared case-insensitively
+_PLACEHOLDERS = frozenset({'-', '--', '\u2013', '\u2014', 'n/a', 'na', '#n/a', 'null', 'none', 'nan'})
+
+
+def _parse_int(value: str) -> int | None:
+    match = _INT_RE.match(value)
+    if not match:
+        return None
+    number = int(match.group(2).replace(',', ''))
+    return -number if match.group(1) == '-' else number
+
+
+def _parse_float(value: str) -> float | None:
+    match = _FLOAT_RE.match(value)
+    if not match:
+        return None
+    number = float(match.group(2).replace(',', '')) * _MULTIPLIERS[match.group(3).lower()]
+    return -number if match.group(1) == '-' else number
+
+
+def _parse_currency(value: str) -> float | None:
+    match = _CURRENCY_RE.match(value)
+    if not match:
+        return None
+    open_paren, sign_before, sign_after, digits, suffix, close_paren = match.groups()
+    if bool(open_paren) != bool(close_paren):
+        return None
+    number = float(digits.replace(',', '')) * _MULTIPLIERS[suffix.lower()]
+    negative = bool(open_paren) or '-' in (sign_before, sign_after)
+    return -number if negative else number
+
+
+def _parse_percent(value: str) -> float | None:
+    """Parse "12.3%" as 12.3 (the number as displayed, not a fraction)."""
+    match = _PERCENT_RE.match(value)
+    if not match:
+        return None
+    number = float(match.group(2).replace(',', ''))
+    return -number if match.group(1) == '-' else number
+
+
+def _parse_date(value: str) -> str | None:
+    """Parse common date layouts to an ISO 8601 date string."""
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+# Tried in order; the first parser that accepts every non-blank value wins
+_PARSERS = (
+    (TYPE_INT, _parse_int),
+    (TYPE_FLOAT, _parse_float),
+    (TYPE_CURRENCY, _parse_currency),
+    (TYPE_PERCENT, _parse_percent),
+    (TYPE_DATE, _parse_date),
+)
+
+
+def parse_column(values: list[str | None]) -> tuple[str, list]:
+    """Detect a column's type and parse all of its values.
+
+    Blank and missing cells become None and do not affect detection.
+    Placeholder cells such as "-" or "N/A" are ignored during detection too,
+    and become None in typed columns; text columns keep them as they are.
+
+    Args:
+        values: Raw cell strings for one column (None for missing cells)
+
+    Returns:
+        Tuple of (column type, parsed values)
+    """
+    present = [(i, v) for i, v in enumerate(values) if v]
+    parsed: list = [None] * len(values)
+    candidates = [(i, v) for i, v in present if v.lower() not in _PLACEHOLDERS]
+
+    if candidates:
+        for column_type, parser in _PARSERS:
+            converted = []
+            for _, value in candidates:
+                result = parser(value)
+                if result is None:
+                    break
+                converted.append(result)
+            else:
+                for (i, _), result in zip(candidates, converted):
+                    parsed[i] = result
+                return column_type, parsed
+
+    for i, value in present:
+        parsed[i] = value
+    return TYPE_TEXT, parsed
+
+
+def build_columnar_table(cell_rows: list[list[str]]) -> dict:
+    """Turn a grid of cell strings into headers plus typed column arrays.
+
+    The first row is treated as the header row. Cells beyond the header
+    count are dropped, matching the row format; tables without headers get
+    "Column N" names.
+
+    Args:
+        cell_rows: Stripped cell text, one list per table row
+
+    Returns:
+        dict with 'headers', 'columns', 'columnTypes' and 'rowCount'
+    """
+    headers = cell_rows[0] if cell_rows else []
+    data_rows = cell_rows[1:]
+
+    if not headers:
+        width = max((len(row) for row in data_rows), default=0)
+        headers = [f"Column {j + 1}" for j in range(width)]
+
+    column_types = []
+    columns = []
+    for j in range(len(headers)):
+        column_type, values = parse_column([row[j] if j < len(row) else None for row in data_rows])
+        column_types.append(column_type)
+        columns.append(values)
+
+    return {
+        "headers": headers,
+        "columns": columns,
+        "columnTypes": column_types,
+        "rowCount": len(data_rows),
+    }
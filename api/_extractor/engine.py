@@ -0,0 +1,123 @@
+"""
+Engine selection with python-pptx fallback.
+
+Every caller (the API handler and the CLI) goes through these entry points.
+The ZIP/XML engine is tried first; if the package cannot be opened that way
+extraction restarts with python-pptx. The decision is made before any table
+or slide is yielded, and the engine that ran is reported in the metadata
+event as 'engine'.
+
+python-pptx (and lxml) take most of a cold start to import, so the fallback
+engine is only imported once a deck actually needs it.
+"""
+
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterator
+
+from _extractor.filters import ExtractionFilter
+from _extractor.instrumentation import NULL_METRICS, STAGE_OPEN, STAGE_TABLES
+from _extractor.tables import FORMAT_ROWS, collect_presentation
+from _extractor.xml_engine import iter_presentation_xml, iter_slide_content_xml
+
+if TYPE_CHECKING:
+    from _extractor.incremental import SlideStore
+    from _extractor.instrumentation import RequestMetrics
+
+ENGINE_XML = 'xml'
+ENGINE_PYTHON_PPTX = 'python-pptx'
+
+
+def _pptx_engine():
+    """Import the python-pptx engine on first use."""
+    from _extractor import pptx_engine
+
+    return pptx_engine
+
+
+def _with_fallback(source: bytes | BinaryIO, events: Iterator[tuple[str, dict]],
+                   fallback: Callable[[bytes | BinaryIO], Iterator[tuple[str, dict]]],
+                   metrics: 'RequestMetrics | None' = None) -> Iterator[tuple[str, dict]]:
+    """Run the XML engine's event stream, switching to python-pptx if it
+    fails to open the deck."""
+    if metrics is None:
+        metrics = NULL_METRICS
+
+    try:
+        with metrics.stage(STAGE_OPEN):
+            kind, metadata = next(events)
+        metadata["engine"] = ENGINE_XML
+    except Exception as e:
+        metrics.note('engineFallback', type(e).__name__)
+        if not isinstance(source, (bytes, bytearray)):
+            source.seek(0)
+        with metrics.stage(STAGE_OPEN):
+            events = fallback(source)
+            kind, metadata = next(events)
+        metadata["engine"] = ENGINE_PYTHON_PPTX
+
+    yield kind, metadata
+    yield from metrics.timed(STAGE_TABLES, events)
+
+
+def iter_presentation(source: bytes | BinaryIO, output_format: str = FORMAT_ROWS,
+                      table_filter: ExtractionFilter | None = None, workers: int = 0,
+                      min_parallel_slides: int | None = None, slide_store: 'SlideStore | None' = None,
+                      deck_hash: str | None = None, reuse_slides: bool = True,
+                      metrics: 'RequestMetrics | None' = None) -> Iterator[tuple[str, dict]]:
+    """Stream the tables of a PowerPoint presentation.
+
+    Args:
+        source: Raw bytes of the PPTX file, or a seekable binary file
+        output_format: Table record format, 'rows' or 'columnar'
+        table_filter: Optional slide/table selection
+        workers: Worker processes for large decks (XML engine only)
+        min_parallel_slides: Slide count at which the process pool is used
+        slide_store: Optional per-slide result store (XML engine only)
+        deck_hash: SHA-256 of the file, recorded with its slide fingerprints
+            so later uploads can be diffed against it
+        reuse_slides: Whether to serve slides from slide_store rather than
+            only updating it
+        metrics: Optional request metrics to record stage timings in
+
+    Yields:
+        ('metadata', dict) then ('table', record) per table
+    """
+    events = iter_presentation_xml(source, output_format, table_filter, workers=workers,
+                                   min_parallel_slides=min_parallel_slides, slide_store=slide_store,
+                                   deck_hash=deck_hash, reuse_slides=reuse_slides, metrics=metrics)
+    return _with_fallback(source, events,
+                          lambda src: _pptx_engine().iter_presentation_pptx(src, output_format, table_filter,
+                                                                            metrics=metrics),
+                          metrics)
+
+
+def extract_presentation(source: bytes | BinaryIO, output_format: str = FORMAT_ROWS,
+                         table_filter: ExtractionFilter | None = None) -> dict:
+    """Extract all tables from a PowerPoint presentation.
+
+    Args:
+        source: Raw bytes of the PPTX file, or a seekable binary file
+        output_format: Table record format, 'rows' or 'columnar'
+        table_filter: Optional slide/table selection
+
+    Returns:
+        dict with 'metadata' and 'tables' keys
+    """
+    return collect_presentation(iter_presentation(source, output_format, table_filter))
+
+
+def iter_slide_content(source: bytes | BinaryIO, output_format: str = FORMAT_ROWS, workers: int = 0,
+                       min_parallel_slides: int | None = None) -> Iterator[tuple[str, dict]]:
+    """Stream the title, body text, tables and notes of each slide.
+
+    Args:
+        source: Raw bytes of the PPTX file, or a seekable binary file
+        output_format: Table record format, 'rows' or 'columnar'
+        workers: Worker processes for large decks (XML engine only)
+        min_parallel_slides: Slide count at which the process pool is used
+
+    Yields:
+        ('metadata', dict) then ('slide', record) per slide (see
+        iter_slide_content_xml)
+    """
+    events = iter_slide_content_xml(source, output_format, workers=workers, min_parallel_slides=min_parallel_slides)
+    return _with_fallback(source, events, lambda src: _pptx_engine().iter_slide_content_pptx(src, output_format))
@@ -0,0 +1,146 @@
+"""
+Selective extraction filters.
+
+Lets callers restrict extraction to a slide range, slides whose title matches
+a pattern, tables whose headers match a pattern, and a maximum number of
+tables. Engines apply each check as early as they can: excluded slides are
+never opened, slides with a non-matching title are not parsed past the
+title, and extraction stops once the table limit is reached.
+"""
+
+import re
+
+
+class ExtractionFilter:
+    """Slide and table selection applied during extraction.
+
+    Attributes:
+        slide_ranges: Inclusive (start, end) slide number ranges; end may be
+            None for open-ended ranges. None selects every slide.
+        title_pattern: Regex searched in the slide title (case-insensitive)
+        header_pattern: Regex searched in each header cell; a table is kept
+            if any header matches (case-insensitive)
+        max_tables: Stop after this many tables
+    """
+
+    def __init__(self, slide_ranges: list[tuple[int, int | None]] | None = None,
+                 title_pattern: str | None = None, header_pattern: str | None = None,
+                 max_tables: int | None = None):
+        self.slide_ranges = slide_ranges
+        self.title_pattern = re.compile(title_pattern, re.IGNORECASE) if title_pattern else None
+        self.header_pattern = re.compile(header_pattern, re.IGNORECASE) if header_pattern else None
+        self.max_tables = max_tables
+
+    @classmethod
+    def from_params(cls, slides: str | None = None, title: str | None = None,
+                    header: str | None = None, max_tables: str | None = None) -> 'ExtractionFilter':
+        """Build a filter from raw request parameters.
+
+        Args:
+            slides: Slide range list such as "1-5,8,12-"
+            title: Slide title regex
+            header: Header cell regex
+            max_tables: Maximum number of tables, as a string
+
+        Returns:
+            ExtractionFilter
+
+        Raises:
+            ValueError: With a client-safe message if a parameter is invalid
+        """
+        slide_ranges = parse_slide_ranges(slides) if slides else None
+
+        for name, pattern in (("title", title), ("header", header)):
+            if pattern:
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    raise ValueError(f"Invalid {name} pattern: {e}")
+
+        limit = None
+        if max_tables:
+            try:
+                limit = int(max_tables)
+            except ValueError:
+                limit = 0
+            if limit < 1:
+                raise ValueError("maxTables must be a positive integer")
+
+        return cls(slide_ranges, title, header, limit)
+
+    @property
+    def is_active(self) -> bool:
+        return bool(self.slide_ranges or self.title_pattern or self.header_pattern or self.max_tables)
+
+    def cache_key(self) -> str:
+        """Stable description of the filter for use in result cache keys."""
+        ranges = ','.join(f"{start}-{'' if end is None else end}" for start, end in self.slide_ranges or [])
+        return '|'.join([
+            f"slides={ranges}",
+            f"title={self.title_pattern.pattern if self.title_pattern else ''}",
+            f"header={self.header_pattern.pattern if self.header_pattern else ''}",
+            f"max={self.max_tables or ''}",
+        ])
+
+    def accepts_slide_number(self, slide_num: int) -> bool:
+        if not self.slide_ranges:
+            return True
+        return any(start <= slide_num and (end is None or slide_num <= end) for start, end in self.slide_ranges)
+
+    def accepts_title(self, title: str | None) -> bool:
+        if self.title_pattern is None:
+            return True
+        return title is not None and self.title_pattern.search(title) is not None
+
+    def accepts_headers(self, headers: list[str]) -> bool:
+        if self.header_pattern is None:
+            return True
+        return any(self.header_pattern.search(header) for header in headers)
+
+    def select_tables(self, title: str | None, tables: list) -> list:
+        """Apply the title and header checks to an unfiltered slide scan.
+
+        Args:
+            title: Slide title
+            tables: Cell grids of each table on the slide
+
+        Returns:
+            Grids as a filtering scan would produce them: empty if the title
+            is rejected, with None for non-empty tables whose headers are
+            rejected
+        """
+        if not self.accepts_title(title):
+            return []
+        if self.header_pattern is None:
+            return tables
+        return [cell_rows if len(cell_rows) < 2 or self.accepts_headers(cell_rows[0]) else None
+                for cell_rows in tables]
+
+
+def parse_slide_ranges(value: str) -> list[tuple[int, int | None]]:
+    """Parse a slide range list such as "1-5,8,12-".
+
+    Args:
+        value: Comma-separated slide numbers and ranges (1-indexed)
+
+    Returns:
+        Inclusive (start, end) tuples; end is None for open-ended ranges
+
+    Raises:
+        ValueError: With a client-safe message if the list is malformed
+    """
+    ranges = []
+    for item in value.split(','):
+        item = item.strip()
+        match = re.fullmatch(r'(\d+)(?:\s*(-)\s*(\d*))?', item)
+        if not match or int(match.group(1)) < 1:
+            raise ValueError(f"Invalid slide range: {item or value}")
+        start = int(match.group(1))
+        if match.group(2) is None:
+            end = start
+        else:
+            end = int(match.group(3)) if match.group(3) else None
+        if end is not None and end < start:
+            raise ValueError(f"Invalid slide range: {item}")
+        ranges.append((start, end))
+    return ranges
@@ -0,0 +1,245 @@
+"""
+Incremental re-extraction using per-slide fingerprints.
+
+Successive exports of the same deck usually differ in only a few slides.
+Each slide part is fingerprinted by the SHA-256 of its XML, and the scan of
+every slide (title plus table cell grids) is kept in a store keyed by that
+fingerprint. When a new deck arrives only slides with an unseen fingerprint
+are parsed; the rest are served from the store.
+
+The store also keeps each deck's ordered list of slide fingerprints, so a
+deck can be diffed against any previously extracted deck by its file hash.
+"""
+
+import hashlib
+import os
+import zipfile
+from typing import BinaryIO, Iterable, Iterator
+
+from _extractor.cache import ResultCache
+from _extractor.filters import ExtractionFilter
+from _extractor.xml_engine import slide_part_names
+
+DEFAULT_STORE_MEMORY_BYTES = 32 * 1024 * 1024  # 32MB
+DEFAULT_STORE_DISK_BYTES = 256 * 1024 * 1024  # 256MB
+STORE_DISK_SUBDIR = 'slides'  # Under PPTX_CACHE_DIR, apart from whole-deck results
+
+CHANGE_ADDED = 'added'
+CHANGE_REMOVED = 'removed'
+CHANGE_CHANGED = 'changed'
+
+
+def hash_slide_parts(zf: zipfile.ZipFile, part_names: list[str]) -> list[str]:
+    """Fingerprint each slide part by the SHA-256 of its XML.
+
+    Args:
+        zf: Open PPTX archive
+        part_names: Slide part names in presentation order
+
+    Returns:
+        Hex digests in the same order
+    """
+    hashes = []
+    for part_name in part_names:
+        digest = hashlib.sha256()
+        with zf.open(part_name) as stream:
+            for chunk in iter(lambda: stream.read(64 * 1024), b''):
+                digest.update(chunk)
+        hashes.append(digest.hexdigest())
+    return hashes
+
+
+class SlideStore:
+    """Per-slide scan results and per-deck slide fingerprint lists.
+
+    Backed by a ResultCache, so entries are bounded by its memory budget and
+    survive cold starts when its disk tier is enabled. Stored scans are
+    unfiltered; filters are applied when they are reused, and scans made
+    with a title or header filter are never stored.
+    """
+
+    def __init__(self, cache: ResultCache):
+        self.cache = cache
+
+    def get_slide(self, slide_hash: str) -> tuple[str | None, list] | None:
+        """Return the stored (title, table cell grids) of a slide, if any."""
+        entry = self.cache.get(self.cache.make_key(slide_hash, 'slide'))
+        if entry is None:
+            return None
+        return entry["title"], entry["tables"]
+
+    def put_slide(self, slide_hash: str, title: str | None, tables: list):
+        self.cache.put(self.cache.make_key(slide_hash, 'slide'), {"title": title, "tables": tables})
+
+    def get_manifest(self, deck_hash: str) -> list[str] | None:
+        """Return the slide fingerprints of a previously extracted deck."""
+        entry = self.cache.get(self.cache.make_key(deck_hash, 'manifest'))
+        return entry["slides"] if entry is not None else None
+
+    def put_manifest(self, deck_hash: str, slide_hashes: list[str]):
+        self.cache.put(self.cache.make_key(deck_hash, 'manifest'), {"slides": slide_hashes})
+
+    def lookup(self, slide_hashes: dict[int, str], slide_parts: list[tuple[int, str]]) -> dict[int, tuple]:
+        """Find stored scans for the selected slides of a deck.
+
+        Args:
+            slide_hashes: Slide number -> fingerprint, for at least the
+                selected slides
+            slide_parts: (slide number, part name) pairs being extracted
+
+        Returns:
+            dict of slide number -> (title, table cell grids) for slides
+            already in the store
+        """
+        reused = {}
+        for slide_num, _ in slide_parts:
+            scan = self.get_slide(slide_hashes[slide_num])
+            if scan is not None:
+                reused[slide_num] = scan
+        return reused
+
+
+def slide_store_from_env() -> SlideStore:
+    """Build a SlideStore configured from environment variables.
+
+    PPTX_SLIDE_STORE_MAX_BYTES sets the memory budget. PPTX_CACHE_DIR,
+    shared with the result cache, enables the on-disk tier in its own
+    subdirectory, bounded by PPTX_SLIDE_STORE_DISK_MAX_BYTES.
+    """
+    max_bytes = int(os.environ.get('PPTX_SLIDE_STORE_MAX_BYTES', DEFAULT_STORE_MEMORY_BYTES))
+    cache_dir = os.environ.get('PPTX_CACHE_DIR')
+    disk_dir = os.path.join(cache_dir, STORE_DISK_SUBDIR) if cache_dir else None
+    max_disk_bytes = int(os.environ.get('PPTX_SLIDE_STORE_DISK_MAX_BYTES') or DEFAULT_STORE_DISK_BYTES)
+    return SlideStore(ResultCache(max_memory_bytes=max_bytes, disk_dir=disk_dir, max_disk_bytes=max_disk_bytes))
+
+
+def merge_slide_scans(slide_parts: list[tuple[int, str]], reused: dict[int, tuple],
+                      scans: Iterator[tuple[int, str | None, list]], slide_hashes: dict[int, str],
+                      store: SlideStore, table_filter: ExtractionFilter | None = None,
+                      scans_filtered: bool = False) -> Iterator[tuple[int, str | None, list]]:
+    """Interleave reused and freshly parsed slides in presentation order.
+
+    Freshly parsed slides are added to the store as they arrive, unless
+    they were scanned with the filter.
+
+    Args:
+        slide_parts: (slide number, part name) pairs being extracted
+        reused: Stored scans from SlideStore.lookup
+        scans: Scans of the remaining slides, in order
+        slide_hashes: Slide number -> fingerprint of the selected slides
+        store: Store to record new scans in
+        table_filter: Optional title/header filter applied to every slide
+        scans_filtered: Whether scans were made with table_filter already
+            applied; they are then passed through and not stored
+
+    Yields:
+        (slide number, title, table cell grids) per slide
+    """
+    for slide_num, _ in slide_parts:
+        scan = reused.get(slide_num)
+        if scan is None:
+            _, slide_title, slide_tables = next(scans)
+            if scans_filtered:
+                yield slide_num, slide_title, slide_tables
+                continue
+            store.put_slide(slide_hashes[slide_num], slide_title, slide_tables)
+        else:
+            slide_title, slide_tables = scan
+
+        if table_filter is not None:
+            slide_tables = table_filter.select_tables(slide_title, slide_tables)
+        yield slide_num, slide_title, slide_tables
+
+
+def deck_slide_hashes(store: SlideStore, source: BinaryIO, deck_hash: str) -> list[str] | None:
+    """Return a deck's slide fingerprints, computing and storing them if needed.
+
+    Args:
+        store: Slide store
+        source: Seekable PPTX file; rewound afterwards
+        deck_hash: SHA-256 of the file
+
+    Returns:
+        Slide fingerprints, or None if the archive cannot be read
+    """
+    slide_hashes = store.get_manifest(deck_hash)
+    if slide_hashes is not None:
+        return slide_hashes
+
+    try:
+        with zipfile.ZipFile(source) as zf:
+            slide_hashes = hash_slide_parts(zf, slide_part_names(zf))
+    except (zipfile.BadZipFile, KeyError, SyntaxError):
+        return None
+    finally:
+        source.seek(0)
+
+    store.put_manifest(deck_hash, slide_hashes)
+    return slide_hashes
+
+
+def _record_tables(tables: Iterable[list[list[str]]]) -> list[list[list[str]]]:
+    """Tables that produce records, indexed the way tableIndex is."""
+    return [cell_rows for cell_rows in tables if len(cell_rows) >= 2]
+
+
+def diff_decks(store: SlideStore, previous_hash: str, slide_hashes: list[str]) -> dict:
+    """Compare a deck with a previously extracted one.
+
+    Slides are compared by position. Table changes are reported for changed
+    and added slides whose scans are in the store, using the unfiltered
+    tableIndex.
+
+    Args:
+        store: Slide store
+        previous_hash: File SHA-256 of the earlier deck
+        slide_hashes: Slide fingerprints of the current deck
+
+    Returns:
+        dict with 'since' and 'available'; when the earlier deck is known
+        also 'changedSlides', 'addedSlides', 'removedSlides' and 'tables'
+        (a list of {slideNumber, tableIndex, change})
+    """
+    previous = store.get_manifest(previous_hash)
+    if previous is None:
+        return {"since": previous_hash, "available": False}
+
+    changed_slides = []
+    added_slides = []
+    table_changes = []
+
+    for slide_num, slide_hash in enumerate(slide_hashes, 1):
+        if slide_num > len(previous):
+            added_slides.append(slide_num)
+            previous_scan = (None, [])
+        elif slide_hash != previous[slide_num - 1]:
+            changed_slides.append(slide_num)
+            previous_scan = store.get_slide(previous[slide_num - 1])
+        else:
+            continue
+
+        current_scan = store.get_slide(slide_hash)
+        if previous_scan is None or current_scan is None:
+            continue
+
+        old_tables = _record_tables(previous_scan[1])
+        new_tables = _record_tables(current_scan[1])
+        for table_index in range(max(len(old_tables), len(new_tables))):
+            if table_index >= len(old_tables):
+                change = CHANGE_ADDED
+            elif table_index >= len(new_tables):
+                change = CHANGE_REMOVED
+            elif old_tables[table_index] != new_tables[table_index]:
+                change = CHANGE_CHANGED
+            else:
+                continue
+            table_changes.append({"slideNumber": slide_num, "tableIndex": table_index, "change": change})
+
+    return {
+        "since": previous_hash,
+        "available": True,
+        "changedSlides": changed_slides,
+        "addedSlides": added_slides,
+        "removedSlides": list(range(len(slide_hashes) + 1, len(previous) + 1)),
+        "tables": table_changes,
+    }
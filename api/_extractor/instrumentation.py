@@ -0,0 +1,378 @@
+"""
+Per-request instrumentation for the extraction function.
+
+A RequestMetrics object follows one request through the handler and the
+extraction engines, recording how long each stage took, how much work was
+done (bytes, slides, shapes, tables) and which decisions were taken (cache
+status, engine, workers). The handler reports it as a Server-Timing header,
+an optional metadata.timings block and one JSON log line per request.
+
+Stage timings are exclusive: while a nested stage runs (e.g. the shape walk
+inside table extraction) its time is not charged to the enclosing stage, so
+stage durations add up to at most the request's total time.
+
+Setting PPTX_PROFILE_THRESHOLD_MS also turns on a sampling profiler that
+writes a collapsed-stack profile for every request slower than the
+threshold.
+
+Peak memory is reported two ways. peakRssDeltaBytes is how far the request
+pushed the process's peak RSS, which is 0 on a warm instance unless the
+request sets a new high-water mark. peakAllocatedBytes is the request's own
+peak of Python heap allocations, traced with tracemalloc; tracing slows
+allocation, so it is only done on request (timings=1 or profiling).
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Iterable, Iterator, TypeVar
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+T = TypeVar('T')
+
+# Stage names, as reported in Server-Timing and metadata.timings
+STAGE_MULTIPART = 'multipart'  # Reading and spooling the request body
+STAGE_CACHE = 'cache'  # Result cache lookup and store
+STAGE_OPEN = 'open'  # Opening the ZIP package and reading the slide list
+STAGE_SLIDE_STORE = 'store'  # Slide fingerprints and per-slide store
+STAGE_SHAPES = 'shapes'  # Parsing slide XML and walking its shapes
+STAGE_TABLES = 'tables'  # Building table records from cell grids
+STAGE_EXTRACT = 'extract'  # Waiting on batch workers
+STAGE_DIFF = 'diff'
+STAGE_SERIALIZE = 'serialize'  # json.dumps of the response
+STAGE_WRITE = 'write'  # Writing the response to the socket
+
+COUNT_SLIDES = 'slides'
+COUNT_PARSED_SLIDES = 'parsedSlides'  # Slides parsed rather than served from the slide store
+COUNT_SHAPES = 'shapes'
+COUNT_TABLES = 'tables'
+COUNT_FILES = 'files'
+
+LOG_EVENT = 'pptx-extract'
+
+DEFAULT_PROFILE_INTERVAL_MS = 5
+PROFILE_EXTENSION = '.folded'
+
+# tracemalloc's peak is process-wide, so only one request is traced at once
+_memory_trace_lock = threading.Lock()
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident set size of this process so far, if known."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+class RequestMetrics:
+    """Timings, counters and decisions for one request.
+
+    Not thread-safe: a request's metrics are only touched by the thread
+    handling it.
+
+    Attributes:
+        stages: Stage name -> exclusive seconds spent in it
+        counts: Counter name -> value
+        decisions: Cache/engine/worker choices made for the request
+        bytes_read: Request body bytes consumed
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+        self.decisions: dict = {}
+        self.bytes_read = 0
+        self._stack: list[list] = []  # [stage name, time it last resumed]
+        self._rss_start = peak_rss_bytes()
+        self._tracing = False
+        self._trace_started = False  # Whether tracing was started for this request
+        self._trace_base = 0
+        self._peak_allocated: int | None = None
+
+    def _push(self, name: str):
+        now = time.perf_counter()
+        if self._stack:
+            self._charge(now)
+        self._stack.append([name, now])
+
+    def _pop(self):
+        now = time.perf_counter()
+        self._charge(now)
+        self._stack.pop()
+        if self._stack:
+            self._stack[-1][1] = now
+
+    def _charge(self, now: float):
+        entry = self._stack[-1]
+        self.stages[entry[0]] = self.stages.get(entry[0], 0.0) + now - entry[1]
+        entry[1] = now
+
+    @contextmanager
+    def stage(self, name: str):
+        """Charge the time spent in the block to a stage."""
+        self._push(name)
+        try:
+            yield
+        finally:
+            self._pop()
+
+    def timed(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        """Iterate over items, charging the time taken to produce each one
+        to a stage. Time spent by the consumer between items is not
+        charged."""
+        iterator = iter(items)
+        while True:
+            self._push(name)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._pop()
+            yield item
+
+    def count(self, name: str, n: int = 1):
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def note(self, name: str, value):
+        """Record a decision, e.g. note('cache', 'hit')."""
+        self.decisions[name] = value
+
+    def record_metadata(self, metadata: dict, table_count: int):
+        """Pick up counts and engine decisions from a result's metadata."""
+        if "slideCount" in metadata:
+            self.counts[COUNT_SLIDES] = metadata["slideCount"]
+        self.counts[COUNT_TABLES] = self.counts.get(COUNT_TABLES, 0) + table_count
+        for key in ("engine", "workers", "incremental", "truncated"):
+            if key in metadata:
+                self.decisions[key] = metadata[key]
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def peak_rss_delta(self) -> int | None:
+        """Growth of the process's peak RSS since the request started.
+
+        This is a new process high-water mark rather than the request's own
+        peak: concurrent requests share the figure, and 0 means the request
+        stayed under an earlier peak. See trace_memory for a per-request
+        measurement.
+        """
+        current = peak_rss_bytes()
+        if current is None or self._rss_start is None:
+            return None
+        return current - self._rss_start
+
+    def trace_memory(self) -> bool:
+        """Start measuring the request's peak Python heap allocation.
+
+        Allocations by other threads are traced too, so the figure is only
+        exact while no other request runs; slides scanned by worker
+        processes are not included.
+
+        Returns:
+            False if another request is already being traced
+        """
+        if not _memory_trace_lock.acquire(blocking=False):
+            return False
+        # Imported here to keep tracemalloc (and pickle) off the cold-start path
+        import tracemalloc
+
+        self._trace_started = not tracemalloc.is_tracing()
+        if self._trace_started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._trace_base = tracemalloc.get_traced_memory()[0]
+        self._tracing = True
+        return True
+
+    def peak_allocated(self) -> int | None:
+        """Peak Python heap allocated since trace_memory(), if traced."""
+        if self._tracing:
+            import tracemalloc
+
+            self._peak_allocated = max(0, tracemalloc.get_traced_memory()[1] - self._trace_base)
+        return self._peak_allocated
+
+    def stop_memory_trace(self):
+        """Stop tracing, keeping the peak measured so far."""
+        if not self._tracing:
+            return
+        self.peak_allocated()
+        if self._trace_started:
+            import tracemalloc
+
+            tracemalloc.stop()
+        self._tracing = False
+        _memory_trace_lock.release()
+
+    def summary(self) -> dict:
+        """The metadata.timings block: durations in milliseconds."""
+        summary = {
+            "totalMs": _ms(self.elapsed()),
+            "stages": {name: _ms(seconds) for name, seconds in self.stages.items()},
+            "counts": dict(self.counts),
+            "bytesRead": self.bytes_read,
+            "peakRssDeltaBytes": self.peak_rss_delta(),
+        }
+        peak_allocated = self.peak_allocated()
+        if peak_allocated is not None:
+            summary["peakAllocatedBytes"] = peak_allocated
+        return summary
+
+    def server_timing(self) -> str:
+        """Format the stages as a Server-Timing header value."""
+        entries = [f'{name};dur={seconds * 1000:.1f}' for name, seconds in self.stages.items()]
+        entries.append(f'total;dur={self.elapsed() * 1000:.1f}')
+        return ', '.join(entries)
+
+    def log(self, **fields):
+        """Write the request's metrics as one JSON line to stderr.
+
+        Args:
+            **fields: Request details to include (status, filename, ...);
+                None values are dropped
+        """
+        record = {"event": LOG_EVENT, **{key: value for key, value in fields.items() if value is not None}}
+        record.update(self.summary())
+        record["decisions"] = self.decisions
+        sys.stderr.write(json.dumps(record, default=str) + '\n')
+        sys.stderr.flush()
+
+
+class NullMetrics:
+    """Stand-in used when a caller does not collect metrics."""
+
+    def stage(self, name: str):
+        return nullcontext()
+
+    def timed(self, name: str, items: Iterable[T]) -> Iterable[T]:
+        return items
+
+    def count(self, name: str, n: int = 1):
+        pass
+
+    def note(self, name: str, value):
+        pass
+
+
+NULL_METRICS = NullMetrics()
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack at a fixed interval.
+
+    Samples are kept as collapsed stacks ("outer;inner count"), the format
+    read by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        """
+        Args:
+            thread_id: threading.get_ident() of the thread to sample
+            interval: Seconds between samples
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='pptx-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def write(self, path: str):
+        with open(path, 'w') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+class RequestProfiler:
+    """Profiles every request and keeps the profiles of slow ones."""
+
+    def __init__(self, threshold_ms: float, output_dir: str, interval_ms: float = DEFAULT_PROFILE_INTERVAL_MS):
+        """
+        Args:
+            threshold_ms: Requests at least this slow have their profile
+                written
+            output_dir: Directory for profile files
+            interval_ms: Milliseconds between stack samples
+        """
+        self.threshold_ms = threshold_ms
+        self.output_dir = output_dir
+        self.interval_ms = interval_ms
+
+    def start(self) -> SamplingProfiler:
+        """Start sampling the calling thread."""
+        sampler = SamplingProfiler(threading.get_ident(), self.interval_ms / 1000)
+        sampler.start()
+        return sampler
+
+    def finish(self, sampler: SamplingProfiler, metrics: RequestMetrics, name: str) -> str | None:
+        """Stop sampling and write the profile if the request was slow.
+
+        Args:
+            sampler: Profiler returned by start()
+            metrics: The request's metrics
+            name: Label for the profile file, e.g. the deck hash
+
+        Returns:
+            Path of the written profile, or None
+        """
+        sampler.stop()
+        if metrics.elapsed() * 1000 < self.threshold_ms or not sampler.samples:
+            return None
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(self.output_dir, f'{time.time_ns() // 1_000_000}-{name}{PROFILE_EXTENSION}')
+            sampler.write(path)
+        except OSError:
+            # Profiles are best-effort diagnostics
+            return None
+        return path
+
+
+def profiler_from_env() -> RequestProfiler | None:
+    """Build a RequestProfiler configured from environment variables.
+
+    PPTX_PROFILE_THRESHOLD_MS enables profiling of requests at least that
+    slow, PPTX_PROFILE_DIR sets where profiles are written and
+    PPTX_PROFILE_INTERVAL_MS the sampling interval.
+    """
+    threshold = os.environ.get('PPTX_PROFILE_THRESHOLD_MS')
+    if not threshold:
+        return None
+    output_dir = os.environ.get('PPTX_PROFILE_DIR') or os.path.join(tempfile.gettempdir(), 'pptx-profiles')
+    interval = float(os.environ.get('PPTX_PROFILE_INTERVAL_MS', DEFAULT_PROFILE_INTERVAL_MS))
+    return RequestProfiler(float(threshold), output_dir, interval)
@@ -0,0 +1,357 @@
+"""
+Streaming multipart/form-data parsing.
+
+Reads the request body in fixed-size chunks so uploads can be validated and
+rejected before they are fully received. File parts are spooled to a
+temporary file once they outgrow a small in-memory buffer.
+
+MultipartParser does the parsing without any I/O; MultipartReader drives it
+from a blocking stream, and the asyncio server feeds it chunks as they
+arrive on the event loop.
+"""
+
+import hashlib
+import tempfile
+from collections import deque
+from email.parser import BytesHeaderParser
+from email.policy import HTTP
+from typing import BinaryIO, Callable, Iterator
+
+DEFAULT_CHUNK_SIZE = 64 * 1024  # 64KB
+SPOOL_MAX_MEMORY_BYTES = 1024 * 1024  # 1MB held in memory before spilling to disk
+MAX_HEADER_BYTES = 16 * 1024  # Per-part header block limit
+HEAD_CHECK_BYTES = 4  # Leading bytes handed to the first-chunk validator
+
+
+class MultipartError(ValueError):
+    """Raised when the request body is not well-formed multipart data."""
+
+
+class UploadRejected(Exception):
+    """Raised when an upload fails validation while it is being read.
+
+    The message is safe to return to the client.
+    """
+
+
+def parse_boundary(content_type: str) -> bytes | None:
+    """Extract the boundary parameter from a multipart Content-Type header.
+
+    Args:
+        content_type: Raw Content-Type header value
+
+    Returns:
+        Boundary as bytes, or None if this is not multipart/form-data
+    """
+    media_type, _, params = content_type.partition(';')
+    if media_type.strip().lower() != 'multipart/form-data':
+        return None
+    for param in params.split(';'):
+        key, _, value = param.strip().partition('=')
+        if key.lower() == 'boundary' and value:
+            return value.strip('"').encode('latin-1')
+    return None
+
+
+# Parser events
+EVENT_PART = 'part'  # A part's headers were read
+EVENT_DATA = 'data'  # Some of the current part's body
+EVENT_PART_END = 'end'  # The current part's body is complete
+EVENT_DONE = 'done'  # The closing delimiter was read
+
+_PREAMBLE, _AFTER_DELIMITER, _HEADERS, _BODY, _DONE = range(5)
+
+
+class MultipartParser:
+    """Push-style multipart/form-data parser.
+
+    Bytes are fed in as they arrive, in chunks of any size, and each call
+    returns the parse events they complete. The parser does no I/O, so the
+    same parsing drives the blocking MultipartReader and non-blocking
+    readers on an event loop.
+
+    Never holds more than the fed chunk plus a delimiter's worth of bytes,
+    or one part header block.
+    """
+
+    def __init__(self, boundary: bytes):
+        """
+        Args:
+            boundary: Boundary from parse_boundary
+        """
+        self._delimiter = b'\r\n--' + boundary
+        # Leading CRLF lets the first boundary match the same delimiter
+        self._buffer = b'\r\n'
+        self._state = _PREAMBLE
+
+    @property
+    def done(self) -> bool:
+        """Whether the closing delimiter has been read."""
+        return self._state == _DONE
+
+    def feed(self, data: bytes) -> list[tuple]:
+        """Parse the next bytes of the body.
+
+        Args:
+            data: Body bytes following those already fed
+
+        Returns:
+            Events completed by this data, in order: (EVENT_PART, headers),
+            (EVENT_DATA, bytes), (EVENT_PART_END,) and finally (EVENT_DONE,).
+            Bytes after the closing delimiter are ignored.
+
+        Raises:
+            MultipartError: If a part's header block is too large
+        """
+        if self._state == _DONE:
+            return []
+        self._buffer += data
+        events = []
+        keep = len(self._delimiter) - 1
+
+        while True:
+            if self._state == _PREAMBLE:
+                index = self._buffer.find(self._delimiter)
+                if index == -1:
+                    self._buffer = self._buffer[-keep:]
+                    return events
+                self._buffer = self._buffer[index + len(self._delimiter):]
+                self._state = _AFTER_DELIMITER
+
+            elif self._state == _AFTER_DELIMITER:
+                if len(self._buffer) < 2:
+                    return events
+                if self._buffer.startswith(b'--'):
+                    self._buffer = b''
+                    self._state = _DONE
+                    events.append((EVENT_DONE,))
+                    return events
+                self._state = _HEADERS
+
+            elif self._state == _HEADERS:
+                index = self._buffer.find(b'\r\n\r\n')
+                if index == -1:
+                    if len(self._buffer) > MAX_HEADER_BYTES:
+                        raise MultipartError("Multipart part headers too large")
+                    return events
+                block = self._buffer[:index]
+                self._buffer = self._buffer[index + 4:]
+                headers = BytesHeaderParser(policy=HTTP).parsebytes(block.lstrip(b'\r\n') + b'\r\n\r\n')
+                events.append((EVENT_PART, headers))
+                self._state = _BODY
+
+            else:  # _BODY
+                index = self._buffer.find(self._delimiter)
+                if index == -1:
+                    if len(self._buffer) > keep:
+                        events.append((EVENT_DATA, self._buffer[:-keep]))
+                        self._buffer = self._buffer[-keep:]
+                    return events
+                if index:
+                    events.append((EVENT_DATA, self._buffer[:index]))
+                events.append((EVENT_PART_END,))
+                self._buffer = self._buffer[index + len(self._delimiter):]
+                self._state = _AFTER_DELIMITER
+
+    def close(self):
+        """Signal the end of the body.
+
+        Raises:
+            MultipartError: If the body ended before the closing delimiter
+        """
+        if self._state != _DONE:
+            raise MultipartError("Malformed multipart body")
+
+
+class Part:
+    """A single part of a multipart body.
+
+    Part data must be consumed (via iter_chunks or drain) before the reader
+    moves on to the next part.
+    """
+
+    def __init__(self, reader: 'MultipartReader', headers):
+        self._reader = reader
+        self._done = False
+        self.headers = headers
+        self.name = headers.get_param('name', header='content-disposition')
+        self.filename = headers.get_filename()
+
+    def iter_chunks(self) -> Iterator[bytes]:
+        """Yield the part body in chunks until the next boundary."""
+        while not self._done:
+            event = self._reader._next_event()
+            if event[0] == EVENT_PART_END:
+                self._done = True
+            else:
+                yield event[1]
+
+    def drain(self):
+        """Discard any unread part body."""
+        for _ in self.iter_chunks():
+            pass
+
+
+class MultipartReader:
+    """Incremental multipart/form-data parser over a binary stream.
+
+    Reads one chunk at a time, only when the parser needs more data, so at
+    most roughly two chunks of the body are held in memory, plus one part
+    header block.
+    """
+
+    def __init__(self, stream: BinaryIO, boundary: bytes, content_length: int,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Args:
+            stream: Request body stream (e.g. BaseHTTPRequestHandler.rfile)
+            boundary: Boundary from parse_boundary
+            content_length: Value of the Content-Length header
+            chunk_size: Bytes to read from the stream at a time
+        """
+        self._stream = stream
+        self._remaining = content_length
+        self._chunk_size = chunk_size
+        self._parser = MultipartParser(boundary)
+        self._events: deque[tuple] = deque()
+        self._current: Part | None = None
+        self.bytes_read = 0
+
+    def _next_event(self) -> tuple:
+        """Return the next parse event, reading more of the body as needed.
+
+        Raises:
+            MultipartError: If the body ends before the closing delimiter
+        """
+        while not self._events:
+            chunk = self._stream.read(min(self._chunk_size, self._remaining)) if self._remaining > 0 else b''
+            if not chunk:
+                self._remaining = 0
+                self._parser.close()
+                return (EVENT_DONE,)
+            self._remaining -= len(chunk)
+            self.bytes_read += len(chunk)
+            self._events.extend(self._parser.feed(chunk))
+        return self._events.popleft()
+
+    def __iter__(self) -> Iterator[Part]:
+        """Yield each part in order. Unread data of a part is skipped."""
+        while True:
+            if self._current is not None:
+                self._current.drain()
+
+            event = self._next_event()
+            if event[0] == EVENT_DONE:
+                return
+            self._current = Part(self, event[1])
+            yield self._current
+
+
+class SpooledUpload:
+    """A file part copied off the request stream.
+
+    Attributes:
+        filename: Client-supplied filename
+        file: Seekable binary file positioned at the start of the data
+        size: Number of bytes received
+        sha256: Hex digest of the file contents
+    """
+
+    def __init__(self, filename: str, file, size: int, sha256: str):
+        self.filename = filename
+        self.file = file
+        self.size = size
+        self.sha256 = sha256
+
+    def close(self):
+        self.file.close()
+
+
+class PartValidator:
+    """Incremental checks applied to a file part as its chunks arrive.
+
+    The first few bytes are handed to check_head once, and the running size
+    is capped, so a bogus or oversized file is rejected on the chunk that
+    gives it away.
+    """
+
+    def __init__(self, max_bytes: int, check_head: Callable[[bytes], str | None] | None = None):
+        """
+        Args:
+            max_bytes: Maximum accepted file size
+            check_head: Optional validator called once with the first few
+                bytes; returns an error message to reject the upload
+        """
+        self.max_bytes = max_bytes
+        self.check_head = check_head
+        self.size = 0
+        self._head = b''
+        self._head_checked = check_head is None
+
+    def update(self, chunk: bytes):
+        """Check the next chunk of the part.
+
+        Raises:
+            UploadRejected: If validation fails or the size limit is exceeded
+        """
+        if not self._head_checked:
+            self._head += chunk[:HEAD_CHECK_BYTES - len(self._head)]
+            if len(self._head) >= HEAD_CHECK_BYTES:
+                self._check_head()
+
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadRejected(f"File size must be less than {self.max_bytes // (1024 * 1024)}MB")
+
+    def finish(self):
+        """Check a part that ended before HEAD_CHECK_BYTES were seen.
+
+        Raises:
+            UploadRejected: If validation fails
+        """
+        if not self._head_checked:
+            self._check_head()
+
+    def _check_head(self):
+        error = self.check_head(self._head)
+        if error:
+            raise UploadRejected(error)
+        self._head_checked = True
+
+
+def spool_part(part: Part, filename: str, max_bytes: int,
+               check_head: Callable[[bytes], str | None] | None = None) -> SpooledUpload:
+    """Copy a file part into a spooled temporary file.
+
+    Reading stops as soon as the size limit is exceeded or the leading bytes
+    fail validation, so oversized or bogus uploads are never fully read.
+
+    Args:
+        part: File part from MultipartReader
+        filename: Name to record on the upload
+        max_bytes: Maximum accepted file size
+        check_head: Optional validator called once with the first few bytes;
+            returns an error message to reject the upload
+
+    Returns:
+        SpooledUpload positioned at offset 0
+
+    Raises:
+        UploadRejected: If validation fails or the size limit is exceeded
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY_BYTES)
+    digest = hashlib.sha256()
+    validator = PartValidator(max_bytes, check_head)
+
+    try:
+        for chunk in part.iter_chunks():
+            validator.update(chunk)
+            digest.update(chunk)
+            spool.write(chunk)
+        validator.finish()
+    except BaseException:
+        spool.close()
+        raise
+
+    spool.seek(0)
+    return SpooledUpload(filename, spool, validator.size, digest.hexdigest())
@@ -0,0 +1,185 @@
+"""
+Parallel slide scanning across a process pool.
+
+The parent process decompresses slide parts from the archive and hands raw
+slide XML to workers in contiguous batches; workers parse titles and tables
+(or, for the structured CLI, full slide content) independently and results
+are yielded back in slide order. If the pool
+breaks (a worker is killed, or workers cannot be started), the pool is
+discarded and the remaining slides are scanned in this process; the next
+request starts a fresh pool.
+"""
+
+import io
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterator
+
+from _extractor.filters import ExtractionFilter
+from _extractor.xml_engine import iter_slide_content_scans, iter_slide_scans, scan_slide, scan_slide_content
+
+DEFAULT_MIN_PARALLEL_SLIDES = 60  # Below this the serial path is faster
+BATCHES_PER_WORKER = 4  # Smaller batches balance uneven slides across workers
+MAX_IN_FLIGHT_PER_WORKER = 2  # Bounds slide XML held by pending batches
+
+_executor: ProcessPoolExecutor | None = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def get_executor(workers: int) -> Executor | None:
+    """Return the shared process pool, creating it on first use.
+
+    The pool is reused across requests handled by this process.
+
+    Args:
+        workers: Number of worker processes
+
+    Returns:
+        The pool, or None if processes cannot be started here (e.g. no
+        /dev/shm in some serverless sandboxes)
+    """
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            try:
+                _executor = ProcessPoolExecutor(max_workers=workers)
+            except (OSError, NotImplementedError):
+                _executor = None
+                return None
+            _executor_workers = workers
+        return _executor
+
+
+def discard_executor(executor: Executor):
+    """Shut down a broken pool and, if it is still the shared one, drop it
+    so the next get_executor call starts a fresh pool."""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def scan_slide_batch(batch: list[tuple[int, bytes]],
+                     table_filter: ExtractionFilter | None = None) -> list[tuple[int, str | None, list]]:
+    """Worker entry point: scan a batch of slides from their raw XML.
+
+    Args:
+        batch: (slide number, slide XML) pairs
+        table_filter: Optional title/header filter
+
+    Returns:
+        (slide number, title, table cell grids) for each slide in the batch
+    """
+    results = []
+    for slide_num, slide_xml in batch:
+        title, tables = scan_slide(io.BytesIO(slide_xml), table_filter)
+        results.append((slide_num, title, tables))
+    return results
+
+
+def scan_slide_content_batch(batch: list[tuple[int, bytes]]) -> list[tuple[int, str | None, list[dict], list]]:
+    """Worker entry point: scan the full content of a batch of slides.
+
+    Args:
+        batch: (slide number, slide XML) pairs
+
+    Returns:
+        (slide number, title, paragraphs, table cell grids) for each slide
+        in the batch
+    """
+    return [(slide_num, *scan_slide_content(io.BytesIO(slide_xml))) for slide_num, slide_xml in batch]
+
+
+def iter_slide_scans_parallel(zf: zipfile.ZipFile, slide_parts: list[tuple[int, str]], executor: Executor,
+                              workers: int, table_filter: ExtractionFilter | None = None
+                              ) -> Iterator[tuple[int, str | None, list]]:
+    """Scan slides on a process pool, yielding results in slide order.
+
+    Only a bounded number of batches are in flight at once, so slide XML for
+    a very large deck is never all held in memory. If the pool breaks, it is
+    discarded and the slides not yet yielded are scanned serially.
+
+    Args:
+        zf: Open PPTX archive
+        slide_parts: (slide number, part name) pairs in presentation order
+        executor: Pool from get_executor
+        workers: Worker count the pool was created with
+        table_filter: Optional title/header filter
+
+    Yields:
+        (slide number, title, table cell grids) per slide
+    """
+    return _iter_batches_parallel(zf, slide_parts, executor, workers,
+                                  lambda slides: executor.submit(scan_slide_batch, slides, table_filter),
+                                  lambda remaining: iter_slide_scans(zf, remaining, table_filter))
+
+
+def iter_slide_content_scans_parallel(zf: zipfile.ZipFile, slide_parts: list[tuple[int, str]], executor: Executor,
+                                      workers: int) -> Iterator[tuple[int, str | None, list[dict], list]]:
+    """Scan the full content of slides on a process pool, in slide order.
+
+    Batching, memory bounds and the serial fallback are those of
+    iter_slide_scans_parallel.
+
+    Args:
+        zf: Open PPTX archive
+        slide_parts: (slide number, part name) pairs in presentation order
+        executor: Pool from get_executor
+        workers: Worker count the pool was created with
+
+    Yields:
+        (slide number, title, paragraphs, table cell grids) per slide
+    """
+    return _iter_batches_parallel(zf, slide_parts, executor, workers,
+                                  lambda slides: executor.submit(scan_slide_content_batch, slides),
+                                  lambda remaining: iter_slide_content_scans(zf, remaining))
+
+
+def _iter_batches_parallel(zf: zipfile.ZipFile, slide_parts: list[tuple[int, str]], executor: Executor,
+                           workers: int, submit: Callable, scan_serially: Callable) -> Iterator[tuple]:
+    """Submit slide XML in batches and yield the workers' scans in order.
+
+    Args:
+        zf: Open PPTX archive
+        slide_parts: (slide number, part name) pairs in presentation order
+        executor: Pool the batches are submitted to
+        workers: Worker count the pool was created with
+        submit: Submits a list of (slide number, slide XML) pairs, returning
+            a future of per-slide scans
+        scan_serially: Scans the given slide parts in this process, used
+            for the slides not yet yielded if the pool breaks
+    """
+    batch_size = max(1, -(-len(slide_parts) // (workers * BATCHES_PER_WORKER)))
+    batches = (slide_parts[start:start + batch_size] for start in range(0, len(slide_parts), batch_size))
+
+    pending = deque()
+    scanned = 0  # Slides yielded so far, in order
+    try:
+        try:
+            for batch in batches:
+                slides = [(slide_num, zf.read(part_name)) for slide_num, part_name in batch]
+                pending.append(submit(slides))
+                if len(pending) >= workers * MAX_IN_FLIGHT_PER_WORKER:
+                    for scan in pending.popleft().result():
+                        yield scan
+                        scanned += 1
+
+            while pending:
+                for scan in pending.popleft().result():
+                    yield scan
+                    scanned += 1
+        except (BrokenProcessPool, OSError):
+            # A worker died (e.g. OOM-killed) or could not be started, which
+            # only surfaces on submit() or result()
+            discard_executor(executor)
+            yield from scan_serially(slide_parts[scanned:])
+    finally:
+        for future in pending:
+            future.cancel()
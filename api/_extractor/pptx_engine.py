@@ -0,0 +1,180 @@
+"""
+python-pptx extraction engine.
+
+Slower than the ZIP/XML engine since it builds the full python-pptx object
+graph, but tolerant of packages the XML engine cannot read. Used as the
+fallback engine for both table and slide content extraction.
+"""
+
+import io
+from typing import TYPE_CHECKING, BinaryIO, Iterator
+
+from pptx import Presentation
+
+from _extractor.filters import ExtractionFilter
+from _extractor.instrumentation import COUNT_PARSED_SLIDES, COUNT_SHAPES, NULL_METRICS, STAGE_SHAPES
+from _extractor.tables import (
+    EVENT_METADATA,
+    EVENT_SLIDE,
+    FORMAT_ROWS,
+    build_table,
+    iter_slide_records,
+    iter_table_records,
+)
+from _extractor.xml_engine import SKIPPED_TEXT_PREFIXES
+
+if TYPE_CHECKING:
+    from _extractor.instrumentation import RequestMetrics
+
+
+def extract_table(table) -> dict:
+    """Extract table data as list of dicts with headers as keys.
+
+    Args:
+        table: A python-pptx Table object
+
+    Returns:
+        dict with 'headers' (list) and 'rows' (list of dicts)
+    """
+    return build_table(table_cell_rows(table))
+
+
+def table_cell_rows(table, table_filter: ExtractionFilter | None = None) -> list[list[str]] | None:
+    """Read stripped cell text for every row of a python-pptx Table.
+
+    Returns None for a non-empty table whose headers the filter rejects.
+    """
+    rows = [[cell.text.strip() for cell in row.cells] for row in table.rows]
+    if table_filter is not None and len(rows) > 1 and not table_filter.accepts_headers(rows[0]):
+        return None
+    return rows
+
+
+def text_frame_paragraphs(text_frame) -> list[dict]:
+    """Extract the non-empty paragraphs of a text frame with their levels."""
+    paragraphs = []
+    for para in text_frame.paragraphs:
+        text = para.text.strip()
+        if text:
+            paragraphs.append({"text": text, "level": para.level})
+    return paragraphs
+
+
+def _open(source: bytes | BinaryIO):
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    return Presentation(source)
+
+
+def _slide_title(slide) -> str | None:
+    if slide.shapes.title:
+        return slide.shapes.title.text.strip()
+    return None
+
+
+def iter_slide_scans_pptx(prs, table_filter: ExtractionFilter | None = None,
+                          metrics: 'RequestMetrics | None' = None) -> Iterator[tuple[int, str | None, list]]:
+    """Scan the slides of a python-pptx Presentation for tables.
+
+    Args:
+        prs: Open Presentation
+        table_filter: Optional slide/table selection
+        metrics: Optional request metrics; scanned slides and shapes are
+            counted
+
+    Yields:
+        (slide number, title, table cell grids) per selected slide
+    """
+    if metrics is None:
+        metrics = NULL_METRICS
+
+    for slide_num, slide in enumerate(prs.slides, 1):
+        if table_filter is not None and not table_filter.accepts_slide_number(slide_num):
+            continue
+
+        metrics.count(COUNT_PARSED_SLIDES)
+        metrics.count(COUNT_SHAPES, len(slide.shapes))
+
+        slide_title = _slide_title(slide)
+        if table_filter is not None and not table_filter.accepts_title(slide_title):
+            continue
+
+        # Extract all tables from slide
+        slide_tables = [table_cell_rows(shape.table, table_filter) for shape in slide.shapes if shape.has_table]
+        yield slide_num, slide_title, slide_tables
+
+
+def iter_presentation_pptx(source: bytes | BinaryIO, output_format: str = FORMAT_ROWS,
+                           table_filter: ExtractionFilter | None = None,
+                           metrics: 'RequestMetrics | None' = None) -> Iterator[tuple[str, dict]]:
+    """Stream the tables of a PowerPoint presentation using python-pptx.
+
+    Args:
+        source: Raw bytes of the PPTX file, or a seekable binary file
+        output_format: Table record format, 'rows' or 'columnar'
+        table_filter: Optional slide/table selection
+        metrics: Optional request metrics; slide scanning is timed as the
+            'shapes' stage
+
+    Yields:
+        ('metadata', {'slideCount': n}) then ('table', record) per table
+    """
+    if metrics is None:
+        metrics = NULL_METRICS
+
+    prs = _open(source)
+
+    metadata = {"slideCount": len(prs.slides)}
+    yield EVENT_METADATA, metadata
+    scans = metrics.timed(STAGE_SHAPES, iter_slide_scans_pptx(prs, table_filter, metrics))
+    yield from iter_slide_records(scans, metadata, output_format, table_filter)
+
+
+def iter_slide_content_pptx(source: bytes | BinaryIO, output_format: str = FORMAT_ROWS) -> Iterator[tuple[str, dict]]:
+    """Stream the full content of each slide using python-pptx.
+
+    Args:
+        source: Raw bytes of the PPTX file, or a seekable binary file
+        output_format: Table record format, 'rows' or 'columnar'
+
+    Yields:
+        ('metadata', dict) then ('slide', record) per slide; see
+        iter_slide_content_xml for the record layout
+    """
+    prs = _open(source)
+
+    yield EVENT_METADATA, {
+        "slideCount": len(prs.slides),
+        "slideWidth": prs.slide_width.inches if prs.slide_width else None,
+        "slideHeight": prs.slide_height.inches if prs.slide_height else None,
+    }
+
+    for slide_num, slide in enumerate(prs.slides, 1):
+        slide_title = _slide_title(slide)
+        title_shape = slide.shapes.title
+        content = []
+        slide_tables = []
+
+        for shape in slide.shapes:
+            # Skip title shape (already captured)
+            if shape == title_shape:
+                continue
+            if shape.has_table:
+                slide_tables.append(table_cell_rows(shape.table))
+            elif shape.has_text_frame:
+                content.extend(
+                    para for para in text_frame_paragraphs(shape.text_frame)
+                    if not para["text"].startswith(SKIPPED_TEXT_PREFIXES)
+                )
+
+        notes = None
+        if slide.has_notes_slide and slide.notes_slide.notes_text_frame:
+            notes = slide.notes_slide.notes_text_frame.text.strip() or None
+
+        yield EVENT_SLIDE, {
+            "slideNumber": slide_num,
+            "title": slide_title,
+            "content": content,
+            "tables": list(iter_table_records(slide_num, slide_title, slide_tables, output_format)),
+            "notes": notes,
+        }
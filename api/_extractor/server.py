@@ -0,0 +1,528 @@
+"""
+Asynchronous server for self-hosted deployments of the extraction function.
+
+The serverless handler class handles one request at a time per process.
+This module puts an asyncio front end in front of the same handler class:
+
+- request headers are read on the event loop, and requests whose
+  Content-Length exceeds the upload limit for their mode (single file or
+  ?batch=1) are rejected there without reading the body
+- the body is received on the event loop into a spooled file, checked as
+  it arrives, so an upload failing validation is rejected on the chunk that
+  gives it away and a slow client never holds a worker; a total deadline
+  bounds how long a body may take
+- once the upload is spooled, the request is run through the unchanged
+  handler on a bounded thread pool, so status codes, CORS headers, error
+  bodies and NDJSON streaming are exactly what the serverless function
+  returns
+- admission control caps admitted requests and in-flight upload bytes;
+  past either limit the server answers 503 with Retry-After without reading
+  the body
+
+Usage:
+    cd api && python -m _extractor.server --port 8000
+"""
+
+import argparse
+import asyncio
+import http.client
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Callable
+from urllib.parse import parse_qs, urlsplit
+
+from _extractor.instrumentation import RequestMetrics
+from _extractor.multipart import (
+    DEFAULT_CHUNK_SIZE,
+    EVENT_DATA,
+    EVENT_PART,
+    EVENT_PART_END,
+    SPOOL_MAX_MEMORY_BYTES,
+    MultipartError,
+    MultipartParser,
+    PartValidator,
+    UploadRejected,
+    parse_boundary,
+)
+
+HANDLER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pptx-extract.py')
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)  # Requests extracted at once
+DEFAULT_QUEUE = 16  # Admitted requests receiving their body or waiting for a worker
+DEFAULT_MAX_INFLIGHT_BYTES = 256 * 1024 * 1024  # 256MB of uploads across admitted requests
+DEFAULT_RETRY_AFTER_SECONDS = 5
+DEFAULT_BODY_TIMEOUT_SECONDS = 300  # Total time allowed to receive a request body
+
+MAX_HEADER_BYTES = 64 * 1024
+READ_TIMEOUT_SECONDS = 30  # Idle time allowed while reading headers or a body chunk
+LINGER_SECONDS = 2  # Time spent discarding an unread body before closing
+DISCARD_CHUNK_BYTES = 64 * 1024
+BUSY_MESSAGE = "Server is busy, please retry shortly"
+BODY_TIMEOUT_MESSAGE = "Upload took too long to arrive"
+
+
+class _StreamWriterFile:
+    """Write-only file object that lets a worker thread write to an asyncio
+    stream, waiting for the transport to drain so a slow client applies
+    backpressure to the handler."""
+
+    def __init__(self, writer: asyncio.StreamWriter, loop: asyncio.AbstractEventLoop):
+        self.writer = writer
+        self.loop = loop
+
+    async def _write(self, data: bytes):
+        self.writer.write(data)
+        await self.writer.drain()
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        asyncio.run_coroutine_threadsafe(self._write(data), self.loop).result()
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+class UploadCheck:
+    """Validates a multipart upload as its chunks arrive on the event loop.
+
+    Applies the handler's checks that can reject a request before its body
+    has been fully received: the filename, leading bytes and size of a
+    single upload, or the number of files in a batch. The handler repeats
+    them on the spooled body, so a check missed here is still enforced.
+    """
+
+    def __init__(self, boundary: bytes, max_file_bytes: int,
+                 check_filename: Callable[[str], str | None] | None = None,
+                 check_head: Callable[[bytes], str | None] | None = None, max_files: int | None = None):
+        """
+        Args:
+            boundary: Boundary from parse_boundary
+            max_file_bytes: Maximum accepted size of a single upload
+            check_filename: Optional filename validator; returns an error
+                message to reject the upload
+            check_head: Optional validator for the file's first few bytes
+            max_files: File limit of a batch upload; None for a single
+                upload, where only the first file part is checked
+        """
+        self.parser = MultipartParser(boundary)
+        self.max_file_bytes = max_file_bytes
+        self.check_filename = check_filename
+        self.check_head = check_head
+        self.max_files = max_files
+        self.files = 0
+        self.validator: PartValidator | None = None
+
+    def feed(self, data: bytes):
+        """Check the next bytes of the body.
+
+        Raises:
+            UploadRejected: If the upload fails validation
+            MultipartError: If the body is not well-formed multipart data
+        """
+        for event in self.parser.feed(data):
+            if event[0] == EVENT_PART:
+                self.start_part(event[1])
+            elif self.validator is None:
+                continue
+            elif event[0] == EVENT_DATA:
+                self.validator.update(event[1])
+            elif event[0] == EVENT_PART_END:
+                self.validator.finish()
+                self.validator = None
+
+    def start_part(self, headers):
+        filename = headers.get_filename()
+        if headers.get_param('name', header='content-disposition') != 'file' or filename is None:
+            return
+        self.files += 1
+        if self.max_files is not None:
+            # Batch files fail individually; only the file count rejects the request
+            if self.files > self.max_files:
+                raise UploadRejected(f"A batch may contain at most {self.max_files} files")
+            return
+        if self.files > 1:
+            return  # Only the first file of a single upload is extracted
+
+        error = self.check_filename(filename or "unknown.pptx") if self.check_filename is not None else None
+        if error:
+            raise UploadRejected(error)
+        self.validator = PartValidator(self.max_file_bytes, self.check_head)
+
+
+def run_handler(handler_class, rfile, wfile, client_address) -> bool:
+    """Serve one request with a BaseHTTPRequestHandler subclass.
+
+    BaseHTTPRequestHandler.__init__ expects a socket, so the stream
+    attributes it would set up are assigned directly and exactly one request
+    is handled.
+
+    Args:
+        handler_class: The handler class
+        rfile: Binary file the raw request is read from: request line,
+            headers and body
+        wfile: Binary file the response is written to
+        client_address: (host, port) of the client
+
+    Returns:
+        Whether the connection may be kept open for another request
+    """
+    request = handler_class.__new__(handler_class)
+    request.rfile = rfile
+    request.wfile = wfile
+    request.client_address = client_address
+    request.server = None
+    request.close_connection = True
+    request.handle_one_request()
+    return not request.close_connection
+
+
+class ExtractionServer:
+    """asyncio front end running a handler class on a bounded thread pool.
+
+    A request is admitted if fewer than workers + max_queue requests are
+    already admitted, whether still receiving their body or waiting for or
+    holding a worker, and its Content-Length fits within max_inflight_bytes
+    of admitted uploads. A single request is always admitted when nothing
+    else is in flight, so uploads larger than the byte budget can still be
+    served one at a time. Requests over the body limit for their mode are
+    never admitted.
+    """
+
+    def __init__(self, handler_class, workers: int = DEFAULT_WORKERS, max_queue: int = DEFAULT_QUEUE,
+                 max_inflight_bytes: int = DEFAULT_MAX_INFLIGHT_BYTES,
+                 retry_after: int = DEFAULT_RETRY_AFTER_SECONDS, max_body_bytes: int | None = None,
+                 max_batch_body_bytes: int | None = None,
+                 upload_check: Callable[[bytes, bool], UploadCheck] | None = None,
+                 body_timeout: float = DEFAULT_BODY_TIMEOUT_SECONDS):
+        """
+        Args:
+            handler_class: BaseHTTPRequestHandler subclass serving requests
+            workers: Requests run by the handler at once
+            max_queue: Admitted requests allowed beyond workers, receiving
+                their body or waiting for a worker
+            max_inflight_bytes: Upload bytes allowed across admitted requests
+            retry_after: Retry-After seconds sent with 503 responses
+            max_body_bytes: Largest body the handler accepts for a single
+                upload; larger requests are passed to the handler without
+                their body so it can reject them from the headers alone
+            max_batch_body_bytes: Largest body accepted with ?batch=1;
+                defaults to max_body_bytes
+            upload_check: Optional factory called with a request's
+                multipart boundary and whether it is a batch, returning the
+                UploadCheck its body is fed to as it arrives. When set,
+                requests without a boundary are passed to the handler
+                without their body
+            body_timeout: Seconds allowed to receive a whole request body
+        """
+        self.handler_class = handler_class
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_inflight_bytes = max_inflight_bytes
+        self.retry_after = retry_after
+        self.max_body_bytes = max_body_bytes
+        self.max_batch_body_bytes = max_batch_body_bytes if max_batch_body_bytes is not None else max_body_bytes
+        self.upload_check = upload_check
+        self.body_timeout = body_timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pptx-extract')
+        self.admitted = 0
+        self.inflight_bytes = 0
+
+    @classmethod
+    def from_module(cls, module, **options) -> 'ExtractionServer':
+        """Build a server for the serverless function module, taking the
+        largest accepted bodies and the upload checks from its limits and
+        validators."""
+
+        def upload_check(boundary: bytes, batch: bool) -> UploadCheck:
+            return UploadCheck(boundary, module.MAX_FILE_SIZE_BYTES, module.validate_pptx_filename,
+                               module.validate_pptx_header, module.MAX_BATCH_FILES if batch else None)
+
+        return cls(
+            module.handler,
+            max_body_bytes=module.MAX_FILE_SIZE_BYTES + module.MULTIPART_OVERHEAD_BYTES,
+            max_batch_body_bytes=module.MAX_BATCH_BYTES + module.MULTIPART_OVERHEAD_BYTES,
+            upload_check=upload_check,
+            **options,
+        )
+
+    @staticmethod
+    def is_batch(target: str) -> bool:
+        """Whether a request target asks for a batch upload (?batch=1)."""
+        values = parse_qs(urlsplit(target).query).get('batch')
+        return bool(values) and values[0].lower() in ('1', 'true')
+
+    def body_limit(self, target: str) -> int | None:
+        """Largest body accepted for a request target, matching the limit
+        the handler applies for ?batch=1 and single uploads."""
+        return self.max_batch_body_bytes if self.is_batch(target) else self.max_body_bytes
+
+    def admit(self, content_length: int) -> str | None:
+        """Reserve capacity for a request.
+
+        Returns:
+            None if admitted, else the limit that was hit ('queue' or
+            'bytes')
+        """
+        if self.admitted >= self.workers + self.max_queue:
+            return 'queue'
+        if self.admitted and self.inflight_bytes + content_length > self.max_inflight_bytes:
+            return 'bytes'
+        self.admitted += 1
+        self.inflight_bytes += content_length
+        return None
+
+    def release(self, content_length: int):
+        self.admitted -= 1
+        self.inflight_bytes -= content_length
+
+    async def start(self, host: str, port: int) -> asyncio.Server:
+        """Start listening; port 0 picks a free port."""
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+
+    async def serve(self, host: str, port: int):
+        server = await self.start(host, port)
+        bound_host, bound_port = server.sockets[0].getsockname()[:2]
+        print(f"Serving on http://{bound_host}:{bound_port}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client_address = writer.get_extra_info('peername') or ('', 0)
+        try:
+            while await self.handle_request(reader, writer, client_address):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError):
+            # Client went away, sent oversized headers or stalled
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def handle_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                             client_address: tuple) -> bool:
+        """Read and serve one request.
+
+        Returns:
+            Whether to wait for another request on the connection
+        """
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), READ_TIMEOUT_SECONDS)
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                return False  # Connection closed between requests
+            raise
+
+        request_line, _, header_block = head.partition(b'\r\n')
+        method, _, target = request_line.decode('latin-1').partition(' ')
+        target = target.rsplit(' ', 1)[0]
+        headers = http.client.parse_headers(io.BytesIO(header_block))
+        try:
+            content_length = max(0, int(headers.get('Content-Length', 0)))
+        except ValueError:
+            content_length = 0
+
+        max_body_bytes = self.body_limit(target)
+        boundary = parse_boundary(headers.get('Content-Type', ''))
+        if method != 'POST' or content_length == 0 or (
+                max_body_bytes is not None and content_length > max_body_bytes) or (
+                self.upload_check is not None and boundary is None):
+            # Preflights and requests the handler rejects from their headers
+            # are answered on the loop without reading a body
+            wfile = io.BytesIO()
+            keep_alive = run_handler(self.handler_class, io.BytesIO(head), wfile, client_address)
+            writer.write(wfile.getvalue())
+            await writer.drain()
+            if content_length:
+                await self.discard_body(reader, writer)
+                return False
+            return keep_alive
+
+        rejected = self.admit(content_length)
+        if rejected is not None:
+            await self.send_error(writer, request_line, HTTPStatus.SERVICE_UNAVAILABLE, BUSY_MESSAGE,
+                                  {'Retry-After': str(self.retry_after)}, rejected=rejected)
+            await self.discard_body(reader, writer)
+            return False
+
+        try:
+            check = self.upload_check(boundary, self.is_batch(target)) if self.upload_check is not None else None
+            spool = await self.receive_body(reader, writer, request_line, head, content_length, check)
+            if spool is None:
+                return False
+            with spool:
+                loop = asyncio.get_running_loop()
+                wfile = _StreamWriterFile(writer, loop)
+                return await loop.run_in_executor(self.executor, run_handler, self.handler_class, spool, wfile,
+                                                  client_address)
+        finally:
+            self.release(content_length)
+
+    async def receive_body(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request_line: bytes,
+                           head: bytes, content_length: int, check: UploadCheck | None):
+        """Receive a request body into a spooled file on the event loop.
+
+        Each chunk is fed to the upload check as it arrives. A rejected
+        upload is answered with a 400 without reading the rest of it, and a
+        body that does not arrive within body_timeout with a 408.
+
+        Args:
+            reader: Connection the body is read from
+            writer: Connection error responses are written to
+            request_line: Request line, for the request log
+            head: Request line and headers, written ahead of the body so
+                the handler can read the whole request from the spool
+            content_length: Body bytes to read
+            check: UploadCheck to feed, if any
+
+        Returns:
+            The spooled request positioned at offset 0, or None if the
+            request was answered here or the client went away, in which case
+            the connection must be closed
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.body_timeout
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY_BYTES)
+        spool.write(head)
+        remaining = content_length
+        try:
+            while remaining:
+                timeout = min(READ_TIMEOUT_SECONDS, deadline - loop.time())
+                if timeout <= 0:
+                    raise asyncio.TimeoutError
+                chunk = await asyncio.wait_for(reader.read(min(DEFAULT_CHUNK_SIZE, remaining)), timeout)
+                if not chunk:
+                    spool.close()
+                    return None  # Client went away
+                remaining -= len(chunk)
+                if check is not None:
+                    check.feed(chunk)
+                spool.write(chunk)
+        except (UploadRejected, MultipartError) as e:
+            spool.close()
+            await self.send_error(writer, request_line, HTTPStatus.BAD_REQUEST, str(e), rejected='upload')
+            await self.discard_body(reader, writer)
+            return None
+        except asyncio.TimeoutError:
+            spool.close()
+            await self.send_error(writer, request_line, HTTPStatus.REQUEST_TIMEOUT, BODY_TIMEOUT_MESSAGE,
+                                  rejected='timeout')
+            return None
+        except BaseException:
+            spool.close()
+            raise
+
+        spool.seek(0)
+        return spool
+
+    @staticmethod
+    async def discard_body(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Finish sending and briefly discard what is left of a rejected
+        upload before the connection is closed.
+
+        Closing a socket with unread data resets the connection, which can
+        make the client lose the error response it has not read yet.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + LINGER_SECONDS
+        try:
+            if writer.can_write_eof():
+                writer.write_eof()
+            while (remaining := deadline - loop.time()) > 0:
+                if not await asyncio.wait_for(reader.read(DISCARD_CHUNK_BYTES), remaining):
+                    break
+        except (ConnectionError, asyncio.TimeoutError):
+            pass
+
+    async def send_error(self, writer: asyncio.StreamWriter, request_line: bytes, status: HTTPStatus,
+                         message: str, headers: dict | None = None, rejected: str | None = None):
+        """Send an error in the handler's JSON error format, closing the
+        connection, and log it.
+
+        Args:
+            writer: Connection to answer on
+            request_line: Request line, for the request log
+            status: HTTP status
+            message: Error message to include
+            headers: Extra response headers
+            rejected: Why the server answered instead of the handler, noted
+                in the request log
+        """
+        payload = json.dumps({"success": False, "error": message}).encode()
+        extra = ''.join(f'{name}: {value}\r\n' for name, value in (headers or {}).items())
+        writer.write((
+            f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+            'Content-Type: application/json\r\n'
+            'Access-Control-Allow-Origin: *\r\n'
+            f'{extra}'
+            f'Content-Length: {len(payload)}\r\n'
+            'Connection: close\r\n\r\n'
+        ).encode() + payload)
+        await writer.drain()
+
+        metrics = RequestMetrics()
+        metrics.note('rejected', rejected)
+        metrics.note('admitted', self.admitted)
+        metrics.note('inflightBytes', self.inflight_bytes)
+        parts = request_line.decode('latin-1').split(' ')
+        metrics.log(method=parts[0], path=parts[1] if len(parts) > 1 else None, status=status.value)
+
+
+def load_handler_module(path: str = HANDLER_PATH):
+    """Import the serverless function module (its filename is not a valid
+    module name)."""
+    spec = importlib.util.spec_from_file_location('pptx_extract', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_parser() -> argparse.ArgumentParser:
+    env = os.environ
+    parser = argparse.ArgumentParser(description="Serve the PPTX extraction function with bounded concurrency.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=int(env.get('PPTX_SERVER_WORKERS') or DEFAULT_WORKERS),
+                        help="Requests extracted at once")
+    parser.add_argument('--queue', type=int, default=int(env.get('PPTX_SERVER_QUEUE') or DEFAULT_QUEUE),
+                        help="Admitted requests allowed beyond workers, receiving or waiting")
+    parser.add_argument('--max-inflight-bytes', type=int,
+                        default=int(env.get('PPTX_SERVER_MAX_INFLIGHT_BYTES') or DEFAULT_MAX_INFLIGHT_BYTES),
+                        help="Upload bytes allowed across admitted requests")
+    parser.add_argument('--retry-after', type=int, default=DEFAULT_RETRY_AFTER_SECONDS,
+                        help="Retry-After seconds sent with 503 responses")
+    parser.add_argument('--body-timeout', type=float,
+                        default=float(env.get('PPTX_SERVER_BODY_TIMEOUT_SECONDS') or DEFAULT_BODY_TIMEOUT_SECONDS),
+                        help="Seconds allowed to receive a whole request body")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    module = load_handler_module()
+    server = ExtractionServer.from_module(
+        module,
+        workers=args.workers,
+        max_queue=args.queue,
+        max_inflight_bytes=args.max_inflight_bytes,
+        retry_after=args.retry_after,
+        body_timeout=args.body_timeout,
+    )
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
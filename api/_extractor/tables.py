@@ -0,0 +1,141 @@
+"""
+Table row shaping shared by every extraction engine.
+
+Engines produce an event stream: one ('metadata', dict) event once the deck
+is opened, followed by a ('table', dict) event per extracted table. Slide
+content streams carry a ('slide', dict) event per slide instead.
+"""
+
+from typing import Iterable, Iterator
+
+from _extractor.columnar import build_columnar_table
+from _extractor.filters import ExtractionFilter
+
+EVENT_METADATA = 'metadata'
+EVENT_TABLE = 'table'
+EVENT_SLIDE = 'slide'
+
+FORMAT_ROWS = 'rows'
+FORMAT_COLUMNAR = 'columnar'
+OUTPUT_FORMATS = (FORMAT_ROWS, FORMAT_COLUMNAR)
+
+
+def build_table(cell_rows: list[list[str]]) -> dict:
+    """Turn a grid of cell strings into headers plus row dicts.
+
+    The first row is treated as the header row. Data rows become dicts keyed
+    by header; tables without headers fall back to "Column N" keys.
+
+    Args:
+        cell_rows: Stripped cell text, one list per table row
+
+    Returns:
+        dict with 'headers' (list) and 'rows' (list of dicts)
+    """
+    rows = []
+    headers = []
+
+    for i, cells in enumerate(cell_rows):
+        if i == 0:
+            # First row is headers
+            headers = cells
+        else:
+            if headers:
+                row_dict = {headers[j]: cells[j] for j in range(min(len(headers), len(cells)))}
+            else:
+                # Fallback for tables without headers
+                row_dict = {f"Column {j + 1}": cells[j] for j in range(len(cells))}
+            rows.append(row_dict)
+
+    return {"headers": headers, "rows": rows}
+
+
+def iter_table_records(slide_num: int, slide_title: str | None, slide_tables: Iterable[list[list[str]] | None],
+                       output_format: str = FORMAT_ROWS) -> Iterator[dict]:
+    """Yield the API table records for one slide.
+
+    Args:
+        slide_num: 1-indexed slide number
+        slide_title: Slide title, or None
+        slide_tables: Cell grids of each table, in slide order. None marks a
+            non-empty table rejected by a filter: it is skipped but still
+            counted, so tableIndex stays stable regardless of filters.
+        output_format: 'rows' for header-keyed row dicts, or 'columnar'
+            for typed column arrays (see build_columnar_table)
+
+    Yields:
+        Table records for non-empty tables, numbered within the slide
+    """
+    # Track table index within slide
+    table_index = 0
+
+    for cell_rows in slide_tables:
+        if cell_rows is None:
+            table_index += 1
+            continue
+
+        # Only include non-empty tables
+        if len(cell_rows) < 2:
+            continue
+
+        record = {
+            "slideNumber": slide_num,
+            "slideTitle": slide_title,
+            "tableIndex": table_index,
+        }
+        if output_format == FORMAT_COLUMNAR:
+            record.update(build_columnar_table(cell_rows))
+        else:
+            table_data = build_table(cell_rows)
+            record["headers"] = table_data["headers"]
+            record["rows"] = table_data["rows"]
+            record["rowCount"] = len(table_data["rows"])
+
+        yield record
+        table_index += 1
+
+
+def iter_slide_records(scans: Iterable[tuple[int, str | None, list]], metadata: dict,
+                       output_format: str = FORMAT_ROWS,
+                       table_filter: ExtractionFilter | None = None) -> Iterator[tuple[str, dict]]:
+    """Turn per-slide scan results into table events, honoring a table limit.
+
+    Args:
+        scans: (slide number, title, table cell grids) per slide
+        metadata: Metadata dict already yielded by the engine; 'truncated'
+            is set on it if the table limit stops extraction early
+        output_format: Table record format, 'rows' or 'columnar'
+        table_filter: Optional filter whose max_tables limit is applied
+
+    Yields:
+        ('table', record) events
+    """
+    max_tables = table_filter.max_tables if table_filter is not None else None
+    count = 0
+
+    for slide_num, slide_title, slide_tables in scans:
+        for record in iter_table_records(slide_num, slide_title, slide_tables, output_format):
+            yield EVENT_TABLE, record
+            count += 1
+            if max_tables is not None and count >= max_tables:
+                metadata["truncated"] = True
+                return
+
+
+def collect_presentation(events: Iterable[tuple[str, dict]]) -> dict:
+    """Gather an engine event stream into a single result dict.
+
+    Args:
+        events: (kind, payload) events from an extraction engine
+
+    Returns:
+        dict with 'metadata' and 'tables' keys
+    """
+    metadata = {}
+    tables = []
+    for kind, payload in events:
+        if kind == EVENT_METADATA:
+            metadata = payload
+        elif kind == EVENT_TABLE:
+            tables.append(payload)
+    return {"metadata": metadata, "tables": tables}
@@ -0,0 +1,108 @@
+"""
+Pre-warming for cold starts.
+
+prewarm() is meant to run at container init, before the first request
+arrives: it pushes a tiny built-in deck through the table extraction path so
+every module, parser and regex that path needs is loaded, and can optionally
+start the slide-scanning process pool and import python-pptx for the
+fallback engine.
+"""
+
+import io
+import json
+import time
+import zipfile
+
+from _extractor.engine import iter_presentation
+from _extractor.instrumentation import RequestMetrics
+from _extractor.tables import OUTPUT_FORMATS, collect_presentation
+from _extractor.xml_engine import (
+    GRAPHIC_DATA_URI_TABLE,
+    NS_A,
+    NS_P,
+    NS_PKG_RELS,
+    NS_R,
+    RT_OFFICE_DOCUMENT,
+    RT_SLIDE,
+)
+
+WARMUP_TABLE_ROWS = (('Date', 'Impressions', 'CTR', 'Spend'), ('Jan 2024', '1,234', '0.52%', '$1,250.00'))
+
+
+def _table_row_xml(cells: tuple[str, ...]) -> str:
+    return '<a:tr>' + ''.join(
+        f'<a:tc><a:txBody><a:p><a:r><a:t>{text}</a:t></a:r></a:p></a:txBody></a:tc>' for text in cells
+    ) + '</a:tr>'
+
+
+WARMUP_SLIDE_XML = (
+    f'<p:sld xmlns:a="{NS_A}" xmlns:p="{NS_P}"><p:cSld><p:spTree>'
+    '<p:sp><p:nvSpPr><p:cNvPr id="2" name="Title"/><p:cNvSpPr/><p:nvPr><p:ph type="title"/></p:nvPr></p:nvSpPr>'
+    '<p:spPr/><p:txBody><a:bodyPr/><a:p><a:r><a:t>Warm-up</a:t></a:r></a:p></p:txBody></p:sp>'
+    '<p:graphicFrame><p:nvGraphicFramePr><p:cNvPr id="3" name="Table"/><p:cNvGraphicFramePr/><p:nvPr/>'
+    f'</p:nvGraphicFramePr><p:xfrm/><a:graphic><a:graphicData uri="{GRAPHIC_DATA_URI_TABLE}"><a:tbl>'
+    + ''.join(_table_row_xml(row) for row in WARMUP_TABLE_ROWS)
+    + '</a:tbl></a:graphicData></a:graphic></p:graphicFrame>'
+    '</p:spTree></p:cSld></p:sld>'
+).encode()
+
+
+def _relationships(rel_type: str, target: str) -> str:
+    return (f'<Relationships xmlns="{NS_PKG_RELS}">'
+            f'<Relationship Id="rId1" Type="{rel_type}" Target="{target}"/></Relationships>')
+
+
+def warmup_deck() -> bytes:
+    """Build a one-slide deck with a single table, readable by the XML engine."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        zf.writestr('_rels/.rels', _relationships(RT_OFFICE_DOCUMENT, 'ppt/presentation.xml'))
+        zf.writestr('ppt/presentation.xml', (
+            f'<p:presentation xmlns:p="{NS_P}" xmlns:r="{NS_R}">'
+            '<p:sldIdLst><p:sldId id="256" r:id="rId1"/></p:sldIdLst>'
+            '<p:sldSz cx="9144000" cy="6858000"/></p:presentation>'
+        ))
+        zf.writestr('ppt/_rels/presentation.xml.rels', _relationships(RT_SLIDE, 'slides/slide1.xml'))
+        zf.writestr('ppt/slides/slide1.xml', WARMUP_SLIDE_XML)
+    return buffer.getvalue()
+
+
+def prewarm(load_fallback: bool = False, workers: int = 0) -> float:
+    """Load everything the table extraction path needs ahead of the first request.
+
+    Args:
+        load_fallback: Also import python-pptx for the fallback engine
+        workers: Start this many slide-scanning worker processes (as
+            configured with PPTX_EXTRACT_WORKERS); 0 or 1 starts none
+
+    Returns:
+        Seconds spent warming up
+
+    Raises:
+        BrokenProcessPool, OSError: If worker processes cannot be started
+    """
+    started = time.perf_counter()
+
+    deck = warmup_deck()
+    for output_format in OUTPUT_FORMATS:
+        json.dumps(collect_presentation(iter_presentation(deck, output_format, metrics=RequestMetrics())))
+
+    if workers > 1:
+        from concurrent.futures.process import BrokenProcessPool
+
+        from _extractor import parallel
+
+        executor = parallel.get_executor(workers)
+        if executor is not None:
+            try:
+                # Worker processes only start once work is submitted
+                list(executor.map(parallel.scan_slide_batch, [[(1, WARMUP_SLIDE_XML)]] * workers))
+            except (BrokenProcessPool, OSError):
+                # Leave no broken pool behind for the first request
+                parallel.discard_executor(executor)
+                raise
+
+    if load_fallback:
+        from _extractor import pptx_engine  # noqa: F401
+
+    return time.perf_counter() - started
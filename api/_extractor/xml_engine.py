@@ -0,0 +1,571 @@
+"""
+ZIP/XML table extraction engine.
+
+Reads slide parts straight out of the PPTX archive and pulls table cell text
+with an incremental XML parser, without building a python-pptx object graph.
+Output matches the python-pptx based extractor in api/pptx-extract.py.
+"""
+
+import io
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import TYPE_CHECKING, BinaryIO, Iterator
+
+from _extractor.filters import ExtractionFilter
+from _extractor.instrumentation import COUNT_PARSED_SLIDES, COUNT_SHAPES, NULL_METRICS, STAGE_SHAPES, STAGE_SLIDE_STORE
+from _extractor.tables import EVENT_METADATA, EVENT_SLIDE, FORMAT_ROWS, iter_slide_records, iter_table_records
+
+if TYPE_CHECKING:
+    from _extractor.incremental import SlideStore
+    from _extractor.instrumentation import RequestMetrics
+
+# Namespaces
+NS_A = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+NS_P = 'http://schemas.openxmlformats.org/presentationml/2006/main'
+NS_R = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+NS_PKG_RELS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+RT_OFFICE_DOCUMENT = NS_R + '/officeDocument'
+RT_SLIDE = NS_R + '/slide'
+RT_NOTES_SLIDE = NS_R + '/notesSlide'
+GRAPHIC_DATA_URI_TABLE = 'http://schemas.openxmlformats.org/drawingml/2006/table'
+
+DEFAULT_PRESENTATION_PART = 'ppt/presentation.xml'
+
+EMU_PER_INCH = 914400
+PH_TYPE_BODY = 'body'
+
+# Body text left behind by image placeholders and backgrounds in exported decks
+SKIPPED_TEXT_PREFIXES = ('/src/', 'preencoded', 'Image')
+
+# Element tags
+TAG_SP_TREE = f'{{{NS_P}}}spTree'
+TAG_SP = f'{{{NS_P}}}sp'
+TAG_GRAPHIC_FRAME = f'{{{NS_P}}}graphicFrame'
+TAG_PH = f'{{{NS_P}}}ph'
+TAG_NV_PR = f'{{{NS_P}}}nvPr'
+TAG_TX_BODY_P = f'{{{NS_P}}}txBody'
+TAG_TX_BODY_A = f'{{{NS_A}}}txBody'
+TAG_PARAGRAPH = f'{{{NS_A}}}p'
+TAG_PARAGRAPH_PR = f'{{{NS_A}}}pPr'
+TAG_RUN = f'{{{NS_A}}}r'
+TAG_FIELD = f'{{{NS_A}}}fld'
+TAG_BREAK = f'{{{NS_A}}}br'
+TAG_TEXT = f'{{{NS_A}}}t'
+TAG_GRAPHIC = f'{{{NS_A}}}graphic'
+TAG_GRAPHIC_DATA = f'{{{NS_A}}}graphicData'
+TAG_TABLE = f'{{{NS_A}}}tbl'
+TAG_ROW = f'{{{NS_A}}}tr'
+TAG_CELL = f'{{{NS_A}}}tc'
+TAG_SLIDE_ID_LIST = f'{{{NS_P}}}sldIdLst'
+TAG_SLIDE_ID = f'{{{NS_P}}}sldId'
+TAG_SLIDE_SIZE = f'{{{NS_P}}}sldSz'
+TAG_RELATIONSHIP = f'{{{NS_PKG_RELS}}}Relationship'
+ATTR_R_ID = f'{{{NS_R}}}id'
+
+# Direct children of p:spTree that python-pptx treats as shapes
+SHAPE_TAGS = frozenset(
+    f'{{{NS_P}}}{name}'
+    for name in ('sp', 'grpSp', 'graphicFrame', 'cxnSp', 'pic', 'contentPart')
+)
+
+
+def _rels_part_name(part_name: str) -> str:
+    """Return the name of the relationships part for a package part."""
+    directory, filename = posixpath.split(part_name)
+    return posixpath.join(directory, '_rels', f'{filename}.rels')
+
+
+def _read_rels(zf: zipfile.ZipFile, part_name: str) -> dict[str, tuple[str, str]]:
+    """Map relationship ids to (type, absolute target part name).
+
+    Args:
+        zf: Open PPTX archive
+        part_name: Source part whose relationships should be read
+
+    Returns:
+        dict of rId -> (relationship type, target part name)
+    """
+    base_dir = posixpath.dirname(part_name)
+    root = ET.fromstring(zf.read(_rels_part_name(part_name)))
+    rels = {}
+    for rel in root.iter(TAG_RELATIONSHIP):
+        if rel.get('TargetMode') == 'External':
+            continue
+        target = rel.get('Target', '')
+        if target.startswith('/'):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(base_dir, target))
+        rels[rel.get('Id')] = (rel.get('Type'), target)
+    return rels
+
+
+def _presentation_part_name(zf: zipfile.ZipFile) -> str:
+    """Locate the main presentation part from the package relationships."""
+    try:
+        package_rels = _read_rels(zf, '')
+    except KeyError:
+        return DEFAULT_PRESENTATION_PART
+    for rel_type, target in package_rels.values():
+        if rel_type == RT_OFFICE_DOCUMENT:
+            return target
+    return DEFAULT_PRESENTATION_PART
+
+
+def slide_size(zf: zipfile.ZipFile) -> tuple[float | None, float | None]:
+    """Return the slide width and height in inches, if the deck sets them."""
+    root = ET.fromstring(zf.read(_presentation_part_name(zf)))
+    size = root.find(TAG_SLIDE_SIZE)
+    if size is None:
+        return None, None
+    return int(size.get('cx')) / EMU_PER_INCH, int(size.get('cy')) / EMU_PER_INCH
+
+
+def slide_part_names(zf: zipfile.ZipFile) -> list[str]:
+    """List slide part names in presentation order.
+
+    Order follows p:sldIdLst in the presentation part, the same order
+    python-pptx uses for `prs.slides`.
+
+    Args:
+        zf: Open PPTX archive
+
+    Returns:
+        Slide part names, e.g. ['ppt/slides/slide1.xml', ...]
+    """
+    presentation_part = _presentation_part_name(zf)
+    rels = _read_rels(zf, presentation_part)
+    root = ET.fromstring(zf.read(presentation_part))
+
+    slide_list = root.find(TAG_SLIDE_ID_LIST)
+    if slide_list is None:
+        return []
+
+    part_names = []
+    for slide_id in slide_list.iter(TAG_SLIDE_ID):
+        rel_type, target = rels[slide_id.get(ATTR_R_ID)]
+        if rel_type == RT_SLIDE:
+            part_names.append(target)
+    return part_names
+
+
+def _paragraph_text(paragraph: ET.Element) -> str:
+    """Concatenate run, field and line-break text of an a:p element."""
+    parts = []
+    for child in paragraph:
+        if child.tag == TAG_RUN or child.tag == TAG_FIELD:
+            t = child.find(TAG_TEXT)
+            parts.append((t.text or '') if t is not None else '')
+        elif child.tag == TAG_BREAK:
+            parts.append('\v')
+    return ''.join(parts)
+
+
+def _text_body_text(tx_body: ET.Element | None) -> str:
+    """Return the text of a text body, paragraphs joined by newlines."""
+    if tx_body is None:
+        return ''
+    return '\n'.join(_paragraph_text(p) for p in tx_body.findall(TAG_PARAGRAPH))
+
+
+def _placeholder(shape: ET.Element) -> ET.Element | None:
+    """Return the p:ph element of a shape, if it is a placeholder."""
+    for non_visual in shape:
+        nv_pr = non_visual.find(TAG_NV_PR)
+        if nv_pr is not None:
+            return nv_pr.find(TAG_PH)
+        break
+    return None
+
+
+def _shape_table(shape: ET.Element) -> ET.Element | None:
+    """Return the a:tbl element of a graphic frame holding a table."""
+    graphic = shape.find(TAG_GRAPHIC)
+    if graphic is None:
+        return None
+    graphic_data = graphic.find(TAG_GRAPHIC_DATA)
+    if graphic_data is None or graphic_data.get('uri') != GRAPHIC_DATA_URI_TABLE:
+        return None
+    return graphic_data.find(TAG_TABLE)
+
+
+def _text_body_paragraphs(tx_body: ET.Element) -> list[dict]:
+    """Return the non-empty paragraphs of a text body with their levels."""
+    paragraphs = []
+    for p in tx_body.findall(TAG_PARAGRAPH):
+        text = _paragraph_text(p).strip()
+        if text:
+            p_pr = p.find(TAG_PARAGRAPH_PR)
+            level = int(p_pr.get('lvl', 0)) if p_pr is not None else 0
+            paragraphs.append({"text": text, "level": level})
+    return paragraphs
+
+
+def _row_cells(tr: ET.Element) -> list[str]:
+    return [_text_body_text(tc.find(TAG_TX_BODY_A)).strip() for tc in tr.findall(TAG_CELL)]
+
+
+def table_cell_rows(tbl: ET.Element, table_filter: ExtractionFilter | None = None) -> list[list[str]] | None:
+    """Read stripped cell text for every row of an a:tbl element.
+
+    Args:
+        tbl: Table element
+        table_filter: Optional filter; only the header row is read for
+            tables whose headers it rejects
+
+    Returns:
+        Cell grid, or None for a non-empty table rejected by the filter
+    """
+    rows = tbl.findall(TAG_ROW)
+    if table_filter is not None and table_filter.header_pattern is not None and len(rows) > 1:
+        headers = _row_cells(rows[0])
+        if not table_filter.accepts_headers(headers):
+            return None
+        return [headers] + [_row_cells(tr) for tr in rows[1:]]
+    return [_row_cells(tr) for tr in rows]
+
+
+def _iter_shapes(stream) -> Iterator[ET.Element]:
+    """Yield each shape directly under p:spTree once it has been parsed.
+
+    The slide XML is parsed incrementally and each shape subtree is cleared
+    once the caller moves on, so only one shape is held in memory at a time.
+    """
+    depth = 0
+    sp_tree_depth = None
+
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            depth += 1
+            if sp_tree_depth is None and elem.tag == TAG_SP_TREE:
+                sp_tree_depth = depth
+            continue
+
+        if sp_tree_depth is not None and depth == sp_tree_depth + 1:
+            if elem.tag in SHAPE_TAGS:
+                yield elem
+            elem.clear()
+        elif depth == sp_tree_depth:
+            sp_tree_depth = None
+
+        depth -= 1
+
+
+def _is_title(shape: ET.Element) -> bool:
+    """Title is the first placeholder with idx 0, as in python-pptx."""
+    ph = _placeholder(shape)
+    return ph is not None and ph.get('idx', '0') == '0'
+
+
+def _shape_title(shape: ET.Element) -> str | None:
+    if shape.tag == TAG_SP:
+        return _text_body_text(shape.find(TAG_TX_BODY_P)).strip()
+    return None
+
+
+def scan_slide(stream, table_filter: ExtractionFilter | None = None,
+               metrics: 'RequestMetrics | None' = None) -> tuple[str | None, list]:
+    """Find the title and tables of a single slide part.
+
+    Shapes are read one at a time (see _iter_shapes). When a title filter
+    rejects the slide, parsing stops as soon as the title has been read.
+
+    Args:
+        stream: File-like object containing slide XML
+        table_filter: Optional title/header filter
+        metrics: Optional request metrics; shapes walked are counted
+
+    Returns:
+        Tuple of (slide title or None, cell grid of each table); rejected
+        tables are None (see iter_table_records)
+    """
+    if metrics is None:
+        metrics = NULL_METRICS
+
+    title = None
+    title_found = False
+    tables = []
+
+    for shape in _iter_shapes(stream):
+        metrics.count(COUNT_SHAPES)
+        if not title_found and _is_title(shape):
+            title_found = True
+            title = _shape_title(shape)
+            if table_filter is not None and not table_filter.accepts_title(title):
+                return title, []
+
+        if shape.tag == TAG_GRAPHIC_FRAME:
+            tbl = _shape_table(shape)
+            if tbl is not None:
+                tables.append(table_cell_rows(tbl, table_filter))
+
+    if table_filter is not None and not table_filter.accepts_title(title):
+        return title, []
+    return title, tables
+
+
+def scan_slide_content(stream) -> tuple[str | None, list[dict], list]:
+    """Read the title, body text and tables of a single slide part.
+
+    Body text comes from every text-bearing shape other than the title, one
+    entry per non-empty paragraph, skipping SKIPPED_TEXT_PREFIXES.
+
+    Args:
+        stream: File-like object containing slide XML
+
+    Returns:
+        Tuple of (slide title or None, paragraphs as {'text', 'level'},
+        cell grid of each table)
+    """
+    title = None
+    title_found = False
+    content = []
+    tables = []
+
+    for shape in _iter_shapes(stream):
+        if not title_found and _is_title(shape):
+            title_found = True
+            title = _shape_title(shape)
+            continue
+
+        if shape.tag == TAG_GRAPHIC_FRAME:
+            tbl = _shape_table(shape)
+            if tbl is not None:
+                tables.append(table_cell_rows(tbl))
+        elif shape.tag == TAG_SP:
+            tx_body = shape.find(TAG_TX_BODY_P)
+            if tx_body is not None:
+                content.extend(
+                    para for para in _text_body_paragraphs(tx_body)
+                    if not para["text"].startswith(SKIPPED_TEXT_PREFIXES)
+                )
+
+    return title, content, tables
+
+
+def slide_notes(zf: zipfile.ZipFile, part_name: str) -> str | None:
+    """Return the speaker notes text of a slide, if it has any.
+
+    Args:
+        zf: Open PPTX archive
+        part_name: Slide part name
+
+    Returns:
+        Stripped text of the notes slide's body placeholder, or None
+    """
+    try:
+        rels = _read_rels(zf, part_name)
+    except KeyError:
+        return None
+
+    for rel_type, target in rels.values():
+        if rel_type != RT_NOTES_SLIDE:
+            continue
+        root = ET.fromstring(zf.read(target))
+        sp_tree = root.find(f'.//{TAG_SP_TREE}')
+        for shape in sp_tree if sp_tree is not None else ():
+            ph = _placeholder(shape)
+            if ph is not None and ph.get('type', 'obj') == PH_TYPE_BODY:
+                return _text_body_text(shape.find(TAG_TX_BODY_P)).strip() or None
+        return None
+    return None
+
+
+def iter_slide_scans(zf: zipfile.ZipFile, slide_parts: list[tuple[int, str]],
+                     table_filter: ExtractionFilter | None = None,
+                     metrics: 'RequestMetrics | None' = None) -> Iterator[tuple[int, str | None, list]]:
+    """Scan slides one after another in this process.
+
+    Args:
+        zf: Open PPTX archive
+        slide_parts: (slide number, part name) pairs in presentation order
+        table_filter: Optional title/header filter
+        metrics: Optional request metrics; shapes walked are counted
+
+    Yields:
+        (slide number, title, table cell grids) per slide
+    """
+    for slide_num, part_name in slide_parts:
+        with zf.open(part_name) as stream:
+            slide_title, slide_tables = scan_slide(stream, table_filter, metrics)
+        yield slide_num, slide_title, slide_tables
+
+
+def iter_presentation_xml(source: bytes | BinaryIO, output_format: str = FORMAT_ROWS,
+                          table_filter: ExtractionFilter | None = None, workers: int = 0,
+                          min_parallel_slides: int | None = None, slide_store: 'SlideStore | None' = None,
+                          deck_hash: str | None = None, reuse_slides: bool = True,
+                          metrics: 'RequestMetrics | None' = None) -> Iterator[tuple[str, dict]]:
+    """Stream the tables of a PowerPoint presentation via its raw XML.
+
+    The archive is opened and its slide list read before the metadata event
+    is yielded, so a malformed package fails on the first next() call.
+
+    Args:
+        source: Raw bytes of the PPTX file, or a seekable binary file
+        output_format: Table record format, 'rows' or 'columnar'
+        table_filter: Optional slide/table selection; slides outside its
+            range are never parsed
+        workers: Worker processes for large decks; 0 or 1 keeps it serial
+        min_parallel_slides: Slide count at which the process pool is used
+        slide_store: Optional per-slide result store; slides whose XML is
+            already in it are not parsed again. Only selected slides are
+            fingerprinted. New slides are parsed unfiltered and stored so
+            they can serve any later filter, except under a title or header
+            filter: those are parsed with the filter and not stored, so the
+            store never makes a filtered request parse more.
+        deck_hash: SHA-256 of the file, used to record the deck's slide
+            fingerprints in slide_store for later diffs when every slide is
+            selected
+        reuse_slides: Whether to serve slides from slide_store; if False
+            every selected slide is parsed, and the store is still updated
+        metrics: Optional request metrics; slide parsing is timed as the
+            'shapes' stage and slide store work as 'store'. Shapes are not
+            counted for slides scanned by worker processes.
+
+    Yields:
+        ('metadata', {'slideCount': n}) then ('table', record) per table.
+        Metadata includes 'workers' when slides were scanned in parallel,
+        'incremental' with reused/parsed slide counts when slide_store is
+        given, and 'truncated' when the filter's table limit stopped
+        extraction.
+
+    Raises:
+        zipfile.BadZipFile, KeyError, ET.ParseError: If the archive is not a
+            well-formed presentation package
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    if metrics is None:
+        metrics = NULL_METRICS
+
+    with zipfile.ZipFile(source) as zf:
+        part_names = slide_part_names(zf)
+        metadata = {"slideCount": len(part_names)}
+
+        slide_parts = [
+            (slide_num, part_name) for slide_num, part_name in enumerate(part_names, 1)
+            if table_filter is None or table_filter.accepts_slide_number(slide_num)
+        ]
+
+        parse_parts = slide_parts
+        scan_filter = table_filter
+        if slide_store is not None:
+            from _extractor import incremental
+
+            with metrics.stage(STAGE_SLIDE_STORE):
+                hashes = incremental.hash_slide_parts(zf, [part_name for _, part_name in slide_parts])
+                slide_hashes = {slide_num: slide_hash for (slide_num, _), slide_hash in zip(slide_parts, hashes)}
+                if deck_hash is not None and len(slide_parts) == len(part_names):
+                    slide_store.put_manifest(deck_hash, hashes)
+                reused = slide_store.lookup(slide_hashes, slide_parts) if reuse_slides else {}
+            parse_parts = [(slide_num, part_name) for slide_num, part_name in slide_parts if slide_num not in reused]
+            # Stored scans must be unfiltered so any later filter can reuse
+            # them; under a title or header filter new slides are scanned
+            # with it instead and not stored
+            scans_filtered = table_filter is not None and bool(
+                table_filter.title_pattern or table_filter.header_pattern)
+            if not scans_filtered:
+                scan_filter = None
+            metadata["incremental"] = {"reusedSlides": len(reused), "newSlides": len(parse_parts)}
+
+        scans = None
+        if workers > 1:
+            # Imported lazily so the serial path never loads multiprocessing
+            from _extractor import parallel
+
+            threshold = parallel.DEFAULT_MIN_PARALLEL_SLIDES if min_parallel_slides is None else min_parallel_slides
+            executor = parallel.get_executor(workers) if len(parse_parts) >= threshold else None
+            if executor is not None:
+                scans = parallel.iter_slide_scans_parallel(zf, parse_parts, executor, workers, scan_filter)
+                metadata["workers"] = workers
+
+        if scans is None:
+            scans = iter_slide_scans(zf, parse_parts, scan_filter, metrics)
+
+        metrics.count(COUNT_PARSED_SLIDES, len(parse_parts))
+        scans = metrics.timed(STAGE_SHAPES, scans)
+
+        if slide_store is not None:
+            scans = metrics.timed(STAGE_SLIDE_STORE, incremental.merge_slide_scans(
+                slide_parts, reused, scans, slide_hashes, slide_store, table_filter, scans_filtered))
+
+        yield EVENT_METADATA, metadata
+        yield from iter_slide_records(scans, metadata, output_format, table_filter)
+
+
+def iter_slide_content_scans(zf: zipfile.ZipFile, slide_parts: list[tuple[int, str]]
+                             ) -> Iterator[tuple[int, str | None, list[dict], list]]:
+    """Scan the content of slides one after another in this process.
+
+    Args:
+        zf: Open PPTX archive
+        slide_parts: (slide number, part name) pairs in presentation order
+
+    Yields:
+        (slide number, title, paragraphs, table cell grids) per slide
+    """
+    for slide_num, part_name in slide_parts:
+        with zf.open(part_name) as stream:
+            slide_title, content, slide_tables = scan_slide_content(stream)
+        yield slide_num, slide_title, content, slide_tables
+
+
+def iter_slide_content_xml(source: bytes | BinaryIO, output_format: str = FORMAT_ROWS, workers: int = 0,
+                           min_parallel_slides: int | None = None) -> Iterator[tuple[str, dict]]:
+    """Stream the full content of each slide via the raw XML.
+
+    Slides are read one at a time, or a bounded number of batches at a time
+    on a process pool, so memory use does not grow with the size of the
+    deck.
+
+    Args:
+        source: Raw bytes of the PPTX file, or a seekable binary file
+        output_format: Table record format, 'rows' or 'columnar'
+        workers: Worker processes for large decks; 0 or 1 keeps it serial
+        min_parallel_slides: Slide count at which the process pool is used
+
+    Yields:
+        ('metadata', {'slideCount', 'slideWidth', 'slideHeight'}) then
+        ('slide', record) per slide, where each record has 'slideNumber',
+        'title', 'content' (paragraphs as {'text', 'level'}), 'tables'
+        (table records) and 'notes'
+
+    Raises:
+        zipfile.BadZipFile, KeyError, ET.ParseError: If the archive is not a
+            well-formed presentation package
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    with zipfile.ZipFile(source) as zf:
+        part_names = slide_part_names(zf)
+        width, height = slide_size(zf)
+
+        slide_parts = list(enumerate(part_names, 1))
+
+        scans = None
+        if workers > 1:
+            # Imported lazily so the serial path never loads multiprocessing
+            from _extractor import parallel
+
+            threshold = parallel.DEFAULT_MIN_PARALLEL_SLIDES if min_parallel_slides is None else min_parallel_slides
+            executor = parallel.get_executor(workers) if len(slide_parts) >= threshold else None
+            if executor is not None:
+                scans = parallel.iter_slide_content_scans_parallel(zf, slide_parts, executor, workers)
+
+        if scans is None:
+            scans = iter_slide_content_scans(zf, slide_parts)
+
+        yield EVENT_METADATA, {"slideCount": len(part_names), "slideWidth": width, "slideHeight": height}
+
+        for slide_num, slide_title, content, slide_tables in scans:
+            yield EVENT_SLIDE, {
+                "slideNumber": slide_num,
+                "title": slide_title,
+                "content": content,
+                "tables": list(iter_table_records(slide_num, slide_title, slide_tables, output_format)),
+                "notes": slide_notes(zf, part_names[slide_num - 1]),
+            }
@@ -3,94 +3,138 @@ PowerPoint Table Extraction API
 Extracts tables from PPTX files and returns structured JSON.
 """
 
+import itertools
 import json
-import io
-import cgi
+import os
+import sys
 from http.server import BaseHTTPRequestHandler
-from pptx import Presentation
+from typing import Iterator
+from urllib.parse import parse_qs, urlsplit
+
+# Shared extraction helpers live next to this function in api/_extractor
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _extractor import (  # noqa: E402
+    COUNT_FILES,
+    COUNT_TABLES,
+    EVENT_METADATA,
+    EVENT_TABLE,
+    FORMAT_ROWS,
+    NULL_METRICS,
+    OUTPUT_FORMATS,
+    STAGE_CACHE,
+    STAGE_DIFF,
+    STAGE_EXTRACT,
+    STAGE_MULTIPART,
+    STAGE_SERIALIZE,
+    STAGE_WRITE,
+    ExtractionFilter,
+    MultipartError,
+    MultipartReader,
+    Part,
+    RequestMetrics,
+    SamplingProfiler,
+    SpooledUpload,
+    UploadRejected,
+    cache_from_env,
+    collect_presentation,
+    deck_slide_hashes,
+    diff_decks,
+    iter_presentation,
+    parse_boundary,
+    prewarm,
+    profiler_from_env,
+    slide_store_from_env,
+    spool_part,
+)
 
 # Constants
 MAX_FILE_SIZE_BYTES = 50 * 1024 * 1024  # 50MB
 PPTX_MAGIC_BYTES = b'PK'  # PPTX files are ZIP archives starting with PK
+MULTIPART_OVERHEAD_BYTES = 64 * 1024  # Allowance for boundaries and part headers
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+NO_TABLES_WARNING = "No data tables found in this PowerPoint"
+# Metadata describing one extraction run rather than the deck; not cached
+RUN_METADATA_KEYS = ('engine', 'workers', 'incremental')
+
+# Parallel slide extraction for very large decks (off unless workers > 1)
+EXTRACT_WORKERS = int(os.environ.get('PPTX_EXTRACT_WORKERS', 0))
+PARALLEL_MIN_SLIDES = int(os.environ['PPTX_PARALLEL_MIN_SLIDES']) if os.environ.get('PPTX_PARALLEL_MIN_SLIDES') else None
+
+# Batch uploads (?batch=1)
+MAX_BATCH_FILES = 50
+MAX_BATCH_BYTES = 500 * 1024 * 1024  # 500MB across all files
+BATCH_CONCURRENCY = int(os.environ.get('PPTX_BATCH_CONCURRENCY', 4))  # Decks parsed at once
+
+# Shared across requests handled by this process
+result_cache = cache_from_env()
+slide_store = slide_store_from_env()
+profiler = profiler_from_env()  # Sampling profiler for slow requests, if enabled
+
+# Warm the extraction path at container init instead of on the first
+# request: PPTX_PREWARM=1 for the table path, 'full' to also load python-pptx
+PREWARM = os.environ.get('PPTX_PREWARM', '').lower()
+if PREWARM not in ('', '0', 'false'):
+    warmup_metrics = RequestMetrics()
+    try:
+        prewarm(load_fallback=PREWARM == 'full', workers=EXTRACT_WORKERS)
+    except Exception as e:
+        # A failed warm-up must not stop the function from loading; requests
+        # then just pay the warm-up cost themselves
+        warmup_metrics.log(prewarm=PREWARM, error=f"{type(e).__name__}: {e}")
+
+
+def iter_upload(upload: SpooledUpload, output_format: str, table_filter: ExtractionFilter,
+                no_cache: bool = False, metrics: RequestMetrics | None = None) -> Iterator[tuple[str, dict]]:
+    """Stream the tables of an uploaded deck with this deployment's settings.
 
+    Args:
+        upload: The uploaded file
+        output_format: Table record format, 'rows' or 'columnar'
+        table_filter: Slide/table selection
+        no_cache: Parse every slide instead of reusing stored ones; the
+            slide store is still updated
+        metrics: Optional request metrics to record stage timings in
+
+    Yields:
+        ('metadata', dict) then ('table', record) per table
+    """
+    return iter_presentation(upload.file, output_format, table_filter, workers=EXTRACT_WORKERS,
+                             min_parallel_slides=PARALLEL_MIN_SLIDES, slide_store=slide_store,
+                             deck_hash=upload.sha256, reuse_slides=not no_cache, metrics=metrics)
 
-def extract_table(table):
-    """Extract table data as list of dicts with headers as keys.
+
+def validate_pptx_filename(filename: str) -> str | None:
+    """Validate the extension of an uploaded file.
 
     Args:
-        table: A python-pptx Table object
+        filename: Original filename
 
     Returns:
-        dict with 'headers' (list) and 'rows' (list of dicts)
+        Error message if invalid, None if valid
     """
-    rows = []
-    headers = []
-
-    for i, row in enumerate(table.rows):
-        cells = [cell.text.strip() for cell in row.cells]
-        if i == 0:
-            # First row is headers
-            headers = cells
-        else:
-            if headers:
-                row_dict = {headers[j]: cells[j] for j in range(min(len(headers), len(cells)))}
-            else:
-                # Fallback for tables without headers
-                row_dict = {f"Column {j + 1}": cells[j] for j in range(len(cells))}
-            rows.append(row_dict)
-
-    return {"headers": headers, "rows": rows}
+    if not filename.lower().endswith('.pptx'):
+        return "Please upload a .pptx file"
+    return None
 
 
-def extract_presentation(file_bytes: bytes) -> dict:
-    """Extract all tables from a PowerPoint presentation.
+def validate_pptx_header(head: bytes) -> str | None:
+    """Validate the leading bytes of an uploaded file.
 
     Args:
-        file_bytes: Raw bytes of the PPTX file
+        head: First bytes of the file
 
     Returns:
-        dict with 'metadata' and 'tables' keys
+        Error message if invalid, None if valid
     """
-    prs = Presentation(io.BytesIO(file_bytes))
-
-    tables = []
-
-    for slide_num, slide in enumerate(prs.slides, 1):
-        # Get slide title
-        slide_title = None
-        if slide.shapes.title:
-            slide_title = slide.shapes.title.text.strip()
-
-        # Track table index within slide
-        table_index = 0
-
-        # Extract all tables from slide
-        for shape in slide.shapes:
-            if shape.has_table:
-                table_data = extract_table(shape.table)
-
-                # Only include non-empty tables
-                if table_data["rows"]:
-                    tables.append({
-                        "slideNumber": slide_num,
-                        "slideTitle": slide_title,
-                        "tableIndex": table_index,
-                        "headers": table_data["headers"],
-                        "rows": table_data["rows"],
-                        "rowCount": len(table_data["rows"])
-                    })
-                    table_index += 1
-
-    return {
-        "metadata": {
-            "slideCount": len(prs.slides)
-        },
-        "tables": tables
-    }
+    # PPTX files are ZIP archives
+    if len(head) < 2 or head[:2] != PPTX_MAGIC_BYTES:
+        return "Invalid PowerPoint file format"
+    return None
 
 
 def validate_pptx_file(file_bytes: bytes, filename: str) -> str | None:
-    """Validate that the uploaded file is a valid PPTX.
+    """Validate that an in-memory file is a valid PPTX.
 
     Args:
         file_bytes: Raw bytes of the file
@@ -100,103 +144,596 @@ def validate_pptx_file(file_bytes: bytes, filename: str) -> str | None:
         Error message if invalid, None if valid
     """
     # Check file extension
-    if not filename.lower().endswith('.pptx'):
-        return "Please upload a .pptx file"
+    error = validate_pptx_filename(filename)
+    if error:
+        return error
 
     # Check file size
     if len(file_bytes) > MAX_FILE_SIZE_BYTES:
         return f"File size must be less than {MAX_FILE_SIZE_BYTES // (1024 * 1024)}MB"
 
-    # Check magic bytes (PPTX files are ZIP archives)
-    if len(file_bytes) < 2 or file_bytes[:2] != PPTX_MAGIC_BYTES:
-        return "Invalid PowerPoint file format"
+    # Check magic bytes
+    return validate_pptx_header(file_bytes[:2])
 
-    return None
+
+def cache_lookup(upload: SpooledUpload, output_format: str, table_filter: ExtractionFilter,
+                 no_cache: bool) -> tuple[str, dict | None, str]:
+    """Look up a previous result for an upload in the result cache.
+
+    Args:
+        upload: The uploaded file
+        output_format: Table record format, 'rows' or 'columnar'
+        table_filter: Slide/table selection
+        no_cache: Skip the lookup so the deck is re-extracted
+
+    Returns:
+        Tuple of (cache key, cached result or None, cache status 'hit',
+        'miss' or 'bypass')
+    """
+    options = [f'format={output_format}']
+    if table_filter.is_active:
+        options.append(table_filter.cache_key())
+    cache_key = result_cache.make_key(upload.sha256, *options)
+    cached = None if no_cache else result_cache.get(cache_key)
+    cache_status = 'bypass' if no_cache else ('hit' if cached is not None else 'miss')
+    return cache_key, cached, cache_status
+
+
+def cache_entry(metadata: dict, tables: list) -> dict:
+    """Build the result cache entry for a fresh extraction.
+
+    Fields describing how this run went (engine, workers, slide store reuse)
+    are left out, so cache hits do not report work they did not do.
+    """
+    return {
+        "metadata": {key: value for key, value in metadata.items() if key not in RUN_METADATA_KEYS},
+        "tables": tables,
+    }
+
+
+def extract_upload(upload: SpooledUpload, output_format: str, table_filter: ExtractionFilter,
+                   no_cache: bool, since: str | None = None,
+                   metrics: RequestMetrics | None = None) -> tuple[dict, str]:
+    """Extract one uploaded deck, going through the result cache.
+
+    Args:
+        upload: The uploaded file
+        output_format: Table record format, 'rows' or 'columnar'
+        table_filter: Slide/table selection
+        no_cache: Skip the cache lookup and re-extract (the fresh result is
+            still stored)
+        since: deckHash of an earlier upload to diff against
+        metrics: Optional request metrics to record stage timings in
+
+    Returns:
+        Tuple of (API response body, cache status 'hit', 'miss' or 'bypass')
+    """
+    if metrics is None:
+        metrics = NULL_METRICS
+
+    # Reuse a cached result for repeat uploads unless the client asked for
+    # a fresh extraction
+    with metrics.stage(STAGE_CACHE):
+        cache_key, result, cache_status = cache_lookup(upload, output_format, table_filter, no_cache)
+    metrics.note('cache', cache_status)
+
+    if result is None:
+        result = collect_presentation(iter_upload(upload, output_format, table_filter, no_cache, metrics))
+        with metrics.stage(STAGE_CACHE):
+            result_cache.put(cache_key, cache_entry(result["metadata"], result["tables"]))
+
+    result["success"] = True
+    result["metadata"]["cache"] = {"status": cache_status, **result_cache.stats()}
+    result["metadata"]["filename"] = upload.filename
+    result["metadata"]["deckHash"] = upload.sha256
+
+    if since:
+        with metrics.stage(STAGE_DIFF):
+            result["diff"] = deck_diff(upload, since)
+
+    if len(result["tables"]) == 0:
+        result["warning"] = NO_TABLES_WARNING
+
+    return result, cache_status
+
+
+def deck_diff(upload: SpooledUpload, since: str) -> dict:
+    """Diff an uploaded deck against an earlier upload by its deckHash.
+
+    Args:
+        upload: The uploaded file
+        since: deckHash of the earlier upload
+
+    Returns:
+        Diff from diff_decks; 'available' is false if either deck's slide
+        fingerprints are unknown to this instance
+    """
+    slide_hashes = deck_slide_hashes(slide_store, upload.file, upload.sha256)
+    if slide_hashes is None:
+        return {"since": since, "available": False}
+    return diff_decks(slide_store, since, slide_hashes)
+
+
+def extract_batch_file(upload: SpooledUpload, output_format: str, table_filter: ExtractionFilter,
+                       no_cache: bool) -> dict:
+    """Batch worker: extract one deck, turning failures into an error entry.
+
+    The upload is closed as soon as it has been processed so queued decks
+    release their spool files early.
+    """
+    try:
+        result, _ = extract_upload(upload, output_format, table_filter, no_cache)
+        return result
+    except Exception as e:
+        return {"success": False, "error": f"Failed to extract data: {str(e)}"}
+    finally:
+        upload.close()
+
+
+def unique_filename(filename: str, seen: set[str]) -> str:
+    """Disambiguate repeated filenames in a batch as "name (2).pptx" etc."""
+    candidate = filename
+    stem, ext = os.path.splitext(filename)
+    counter = 2
+    while candidate in seen:
+        candidate = f"{stem} ({counter}){ext}"
+        counter += 1
+    seen.add(candidate)
+    return candidate
 
 
 class handler(BaseHTTPRequestHandler):
     """Vercel serverless function handler for PPTX extraction."""
 
+    # HTTP/1.1 is required for chunked NDJSON responses
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # body waits on the client's delayed ACK
+    disable_nagle_algorithm = True
+
     def do_POST(self):
+        self.metrics = RequestMetrics()
+        sampler = profiler.start() if profiler is not None else None
+        if sampler is not None or self.query_flag('timings'):
+            self.metrics.trace_memory()
+        self.multipart_reader = None
+        self.response_status = None
+        self.streaming = False
+        upload = None
+        error = None
         try:
-            # Parse content type
-            content_type = self.headers.get('Content-Type', '')
+            output_format = self.query_param('format') or FORMAT_ROWS
+            if output_format not in OUTPUT_FORMATS:
+                self.close_connection = True
+                self.send_error_response(400, f"Unsupported format: {output_format}")
+                return
 
-            if 'multipart/form-data' not in content_type:
-                self.send_error_response(400, "Expected multipart/form-data")
+            try:
+                table_filter = ExtractionFilter.from_params(
+                    slides=self.query_param('slides'),
+                    title=self.query_param('title'),
+                    header=self.query_param('header'),
+                    max_tables=self.query_param('maxTables'),
+                )
+            except ValueError as e:
+                self.close_connection = True
+                self.send_error_response(400, str(e))
                 return
 
-            # Get content length
-            content_length = int(self.headers.get('Content-Length', 0))
-            if content_length == 0:
-                self.send_error_response(400, "No file uploaded")
+            no_cache = 'no-cache' in self.headers.get('Cache-Control', '').lower()
+            since = self.query_param('since')
+            batch = self.query_flag('batch')
+
+            try:
+                parts = self.open_multipart(MAX_BATCH_BYTES if batch else MAX_FILE_SIZE_BYTES)
+                if batch:
+                    self.handle_batch(parts, output_format, table_filter, no_cache)
+                    return
+                with self.metrics.stage(STAGE_MULTIPART):
+                    upload = self.receive_upload(parts)
+                self.metrics.bytes_read = self.multipart_reader.bytes_read
+            except (UploadRejected, MultipartError) as e:
+                # The rest of the body is never read, so the connection
+                # cannot be reused
+                self.close_connection = True
+                self.send_error_response(400, str(e))
                 return
 
-            # Parse multipart form data using cgi module
-            environ = {
-                'REQUEST_METHOD': 'POST',
-                'CONTENT_TYPE': content_type,
-                'CONTENT_LENGTH': str(content_length),
-            }
-
-            form = cgi.FieldStorage(
-                fp=self.rfile,
-                headers=self.headers,
-                environ=environ
-            )
-
-            # Get the file from form data
-            file_item = form.get('file')
-            if file_item is None or not hasattr(file_item, 'file'):
-                self.send_error_response(400, "No file found in request")
+            if self.wants_ndjson():
+                self.stream_ndjson(upload, output_format, table_filter, no_cache, since)
                 return
 
-            # Read file content
-            file_bytes = file_item.file.read()
-            filename = file_item.filename or "unknown.pptx"
+            result, cache_status = extract_upload(upload, output_format, table_filter, no_cache, since,
+                                                  metrics=self.metrics)
+            self.metrics.record_metadata(result["metadata"], len(result["tables"]))
+            if self.query_flag('timings'):
+                result["metadata"]["timings"] = self.metrics.summary()
 
-            # Validate the file
-            validation_error = validate_pptx_file(file_bytes, filename)
+            # Send success response
+            self.send_json_response(200, result, {'X-Cache': cache_status.upper()})
+
+        except Exception as e:
+            error = e
+            if not self.body_consumed():
+                # The rest of the upload is still unread and would be parsed
+                # as the next request on this connection
+                self.close_connection = True
+            message = f"Failed to extract data: {str(e)}"
+            if self.streaming:
+                # Headers are already sent; report the failure in-band
+                self.write_chunk({"type": "error", "success": False, "error": message})
+                self.end_chunks()
+            else:
+                self.send_error_response(500, message)
+        finally:
+            if upload is not None:
+                upload.close()
+            self.log_metrics(upload, sampler, error)
+
+    def send_response(self, code: int, message: str | None = None):
+        """Send the status line, remembering the status for the request log."""
+        self.response_status = code
+        super().send_response(code, message)
+
+    def log_metrics(self, upload: SpooledUpload | None, sampler: SamplingProfiler | None,
+                    error: Exception | None):
+        """Write the request's structured log line.
+
+        Args:
+            upload: The uploaded file, if one was received
+            sampler: Profiler sampling this request, if profiling is enabled;
+                its profile is written when the request was slow
+            error: Exception that turned the request into a 500, if any
+        """
+        if self.multipart_reader is not None:
+            self.metrics.bytes_read = self.multipart_reader.bytes_read
+
+        self.metrics.stop_memory_trace()
+        profile = None
+        if sampler is not None:
+            profile = profiler.finish(sampler, self.metrics, upload.sha256[:16] if upload is not None else 'request')
+
+        self.metrics.log(
+            method=self.command,
+            path=self.path,
+            status=self.response_status,
+            filename=upload.filename if upload is not None else None,
+            deckHash=upload.sha256 if upload is not None else None,
+            fileBytes=upload.size if upload is not None else None,
+            error=f"{type(error).__name__}: {error}" if error is not None else None,
+            profile=profile,
+        )
+
+    def body_consumed(self) -> bool:
+        """Whether the whole request body has been read from the connection."""
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            return False
+        bytes_read = self.multipart_reader.bytes_read if self.multipart_reader is not None else 0
+        return bytes_read >= content_length
+
+    def open_multipart(self, max_content_bytes: int) -> Iterator[Part]:
+        """Check the request headers and start parsing the multipart body.
+
+        Args:
+            max_content_bytes: Largest accepted upload payload, excluding
+                multipart overhead
+
+        Returns:
+            Iterator over the body's parts
+
+        Raises:
+            UploadRejected: If the request is not an acceptable upload
+        """
+        boundary = parse_boundary(self.headers.get('Content-Type', ''))
+        if boundary is None:
+            raise UploadRejected("Expected multipart/form-data")
+
+        content_length = int(self.headers.get('Content-Length', 0))
+        if content_length == 0:
+            raise UploadRejected("No file uploaded")
+        if content_length > max_content_bytes + MULTIPART_OVERHEAD_BYTES:
+            raise UploadRejected(f"File size must be less than {max_content_bytes // (1024 * 1024)}MB")
+
+        self.multipart_reader = MultipartReader(self.rfile, boundary, content_length)
+        return iter(self.multipart_reader)
+
+    def receive_upload(self, parts: Iterator[Part]) -> SpooledUpload:
+        """Stream the 'file' part of the multipart body into a spooled file.
+
+        The upload is rejected as soon as its extension, leading bytes or
+        running size fail validation, without reading the rest of the body.
+
+        Args:
+            parts: Iterator from open_multipart
+
+        Returns:
+            SpooledUpload for the uploaded file
+
+        Raises:
+            UploadRejected: If the request or file is invalid
+            MultipartError: If the body is not well-formed multipart data
+        """
+        for part in parts:
+            if part.name != 'file' or part.filename is None:
+                continue
+
+            filename = part.filename or "unknown.pptx"
+            validation_error = validate_pptx_filename(filename)
             if validation_error:
-                self.send_error_response(400, validation_error)
+                raise UploadRejected(validation_error)
+
+            upload = spool_part(part, filename, MAX_FILE_SIZE_BYTES, check_head=validate_pptx_header)
+            try:
+                # Consume the rest of the body so the connection can be reused
+                for _ in parts:
+                    pass
+            except BaseException:
+                upload.close()
+                raise
+            return upload
+
+        raise UploadRejected("No file found in request")
+
+    def handle_batch(self, parts: Iterator[Part], output_format: str, table_filter: ExtractionFilter,
+                     no_cache: bool):
+        """Extract every 'file' part of a batch upload.
+
+        Each deck is spooled as it arrives and handed to a bounded thread
+        pool, so at most BATCH_CONCURRENCY decks are parsed at once while the
+        rest wait in their spool files. Invalid or corrupt files produce a
+        per-file error entry instead of failing the batch.
+
+        The JSON response maps each filename to its own result under
+        'files'. In NDJSON mode a {"type": "file", ...} line is written per
+        deck as it finishes, followed by a summary line.
+
+        Args:
+            parts: Iterator from open_multipart
+            output_format: Table record format, 'rows' or 'columnar'
+            table_filter: Slide/table selection applied to every deck
+            no_cache: Bypass the result cache lookup
+        """
+        # Only batch uploads need a thread pool; importing it lazily keeps it
+        # off the cold-start path
+        from concurrent.futures import Future, ThreadPoolExecutor
+
+        files: dict[str, dict | Future] = {}
+        seen: set[str] = set()
+        uploads = []
+
+        with ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY) as executor:
+            try:
+                for part in self.metrics.timed(STAGE_MULTIPART, parts):
+                    if part.name != 'file' or part.filename is None:
+                        continue
+                    if len(files) >= MAX_BATCH_FILES:
+                        raise UploadRejected(f"A batch may contain at most {MAX_BATCH_FILES} files")
+
+                    filename = unique_filename(part.filename or "unknown.pptx", seen)
+                    validation_error = validate_pptx_filename(filename)
+                    if validation_error:
+                        files[filename] = {"success": False, "error": validation_error}
+                        continue
+
+                    try:
+                        upload = spool_part(part, filename, MAX_FILE_SIZE_BYTES, check_head=validate_pptx_header)
+                    except UploadRejected as e:
+                        files[filename] = {"success": False, "error": str(e)}
+                        continue
+
+                    uploads.append(upload)
+                    files[filename] = executor.submit(extract_batch_file, upload, output_format, table_filter, no_cache)
+                    self.metrics.count(COUNT_FILES)
+            except BaseException:
+                executor.shutdown(wait=True, cancel_futures=True)
+                for upload in uploads:
+                    upload.close()
+                raise
+
+            self.metrics.bytes_read = self.multipart_reader.bytes_read
+            if not files:
+                raise UploadRejected("No file found in request")
+
+            if self.wants_ndjson():
+                self.stream_batch_ndjson(files)
                 return
 
-            # Extract presentation
-            result = extract_presentation(file_bytes)
-            result["success"] = True
-            result["metadata"]["filename"] = filename
+            with self.metrics.stage(STAGE_EXTRACT):
+                results = {
+                    filename: entry.result() if isinstance(entry, Future) else entry
+                    for filename, entry in files.items()
+                }
+
+        succeeded = sum(1 for result in results.values() if result["success"])
+        self.metrics.count(COUNT_TABLES, sum(len(result.get("tables", ())) for result in results.values()))
+        metadata = {
+            "fileCount": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+        }
+        if self.query_flag('timings'):
+            metadata["timings"] = self.metrics.summary()
+        self.send_json_response(200, {"success": True, "metadata": metadata, "files": results})
+
+    def stream_batch_ndjson(self, files: dict):
+        """Write batch results as NDJSON lines in completion order.
 
-            if len(result["tables"]) == 0:
-                result["warning"] = "No data tables found in this PowerPoint"
+        Args:
+            files: Filename -> result dict or pending Future
+        """
+        from concurrent.futures import Future, as_completed
 
-            # Send success response
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(result).encode())
+        self.send_response(200)
+        self.send_header('Content-Type', NDJSON_CONTENT_TYPE)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Trailer', 'Server-Timing')
+        self.end_headers()
+        self.streaming = True
+
+        succeeded = 0
+        pending = {entry: filename for filename, entry in files.items() if isinstance(entry, Future)}
+        finished = itertools.chain(
+            ((filename, entry) for filename, entry in files.items() if not isinstance(entry, Future)),
+            self.metrics.timed(STAGE_EXTRACT, ((pending[future], future.result()) for future in as_completed(pending))),
+        )
+
+        for filename, result in finished:
+            succeeded += bool(result["success"])
+            self.metrics.count(COUNT_TABLES, len(result.get("tables", ())))
+            self.write_chunk({"type": "file", "filename": filename, "result": result})
+
+        metadata = {
+            "fileCount": len(files),
+            "succeeded": succeeded,
+            "failed": len(files) - succeeded,
+        }
+        if self.query_flag('timings'):
+            metadata["timings"] = self.metrics.summary()
+        self.write_chunk({"type": "summary", "success": True, "metadata": metadata})
+        self.end_chunks()
+
+    def query_flag(self, name: str) -> bool:
+        """Whether a boolean query string parameter is set."""
+        return (self.query_param(name) or '').lower() in ('1', 'true')
+
+    def wants_ndjson(self) -> bool:
+        """Whether the client asked for a streamed NDJSON response.
+
+        Enabled with an `Accept: application/x-ndjson` header or a
+        `?stream=1` query parameter.
+        """
+        if NDJSON_CONTENT_TYPE in self.headers.get('Accept', ''):
+            return True
+        return self.query_flag('stream') or self.query_param('stream') == 'ndjson'
 
-        except Exception as e:
-            self.send_error_response(500, f"Failed to extract data: {str(e)}")
+    def query_param(self, name: str) -> str | None:
+        """Return the first value of a query string parameter, if present."""
+        values = parse_qs(urlsplit(self.path).query).get(name)
+        return values[0] if values else None
+
+    def stream_ndjson(self, upload: SpooledUpload, output_format: str, table_filter: ExtractionFilter,
+                      no_cache: bool, since: str | None = None):
+        """Send tables as newline-delimited JSON while they are extracted.
+
+        Each table is written as a {"type": "table", "table": {...}} line as
+        soon as its slide is parsed, followed by a trailing
+        {"type": "summary", ...} line carrying success, metadata, any
+        warning and the diff requested with `since`, using chunked transfer
+        encoding. Server-Timing is sent as a trailer.
+
+        Args:
+            upload: The uploaded file
+            output_format: Table record format, 'rows' or 'columnar'
+            table_filter: Slide/table selection
+            no_cache: Bypass the result cache lookup
+            since: deckHash of an earlier upload to diff against
+        """
+        with self.metrics.stage(STAGE_CACHE):
+            cache_key, cached, cache_status = cache_lookup(upload, output_format, table_filter, no_cache)
+        self.metrics.note('cache', cache_status)
+        if cached is None:
+            events = iter_upload(upload, output_format, table_filter, no_cache, self.metrics)
+        else:
+            events = self._cached_events(cached)
+
+        # Opening the deck happens here, so unreadable files still get a
+        # regular JSON error response
+        kind, metadata = next(events)
+
+        self.send_response(200)
+        self.send_header('Content-Type', NDJSON_CONTENT_TYPE)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('X-Cache', cache_status.upper())
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Trailer', 'Server-Timing')
+        self.end_headers()
+        self.streaming = True
+
+        tables = []
+        for kind, payload in events:
+            if kind == EVENT_TABLE:
+                tables.append(payload)
+                self.write_chunk({"type": "table", "table": payload})
+
+        if cached is None:
+            with self.metrics.stage(STAGE_CACHE):
+                result_cache.put(cache_key, cache_entry(metadata, tables))
+
+        self.metrics.record_metadata(metadata, len(tables))
+        metadata["cache"] = {"status": cache_status, **result_cache.stats()}
+        metadata["filename"] = upload.filename
+        metadata["deckHash"] = upload.sha256
+        summary = {"type": "summary", "success": True, "metadata": metadata, "tableCount": len(tables)}
+        if not tables:
+            summary["warning"] = NO_TABLES_WARNING
+        if since:
+            with self.metrics.stage(STAGE_DIFF):
+                summary["diff"] = deck_diff(upload, since)
+        if self.query_flag('timings'):
+            metadata["timings"] = self.metrics.summary()
+
+        self.write_chunk(summary)
+        self.end_chunks()
+
+    @staticmethod
+    def _cached_events(result: dict) -> Iterator[tuple[str, dict]]:
+        """Replay a cached result as an engine event stream."""
+        yield EVENT_METADATA, result["metadata"]
+        for table in result["tables"]:
+            yield EVENT_TABLE, table
+
+    def write_chunk(self, payload: dict):
+        """Write one NDJSON line as an HTTP chunk."""
+        with self.metrics.stage(STAGE_SERIALIZE):
+            line = json.dumps(payload).encode() + b'\n'
+        with self.metrics.stage(STAGE_WRITE):
+            self.wfile.write(f'{len(line):X}\r\n'.encode() + line + b'\r\n')
+            self.wfile.flush()
+
+    def end_chunks(self):
+        """Terminate a chunked response, with Server-Timing as a trailer."""
+        self.wfile.write(f'0\r\nServer-Timing: {self.metrics.server_timing()}\r\n\r\n'.encode())
+        self.wfile.flush()
 
     def do_OPTIONS(self):
         """Handle CORS preflight requests."""
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Cache-Control, Accept')
+        self.send_header('Content-Length', '0')
         self.end_headers()
 
-    def send_error_response(self, status_code: int, message: str):
-        """Send a JSON error response.
+    def send_json_response(self, status_code: int, body: dict, headers: dict | None = None):
+        """Send a JSON response with an explicit Content-Length.
 
         Args:
             status_code: HTTP status code
-            message: Error message to include
+            body: JSON-serializable response body
+            headers: Extra response headers
         """
+        with self.metrics.stage(STAGE_SERIALIZE):
+            payload = json.dumps(body).encode()
         self.send_response(status_code)
         self.send_header('Content-Type', 'application/json')
         self.send_header('Access-Control-Allow-Origin', '*')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Server-Timing', self.metrics.server_timing())
+        self.send_header('Content-Length', str(len(payload)))
         self.end_headers()
+        with self.metrics.stage(STAGE_WRITE):
+            self.wfile.write(payload)
+
+    def send_error_response(self, status_code: int, message: str):
+        """Send a JSON error response.
+
+        Args:
+            status_code: HTTP status code
+            message: Error message to include
+        """
         response = {"success": False, "error": message}
-        self.wfile.write(json.dumps(response).encode())
+        self.send_json_response(status_code, response)
@@ -0,0 +1,78 @@
+"""
+Cold-start probe, run by run.py in a fresh interpreter per measurement.
+
+Imports the handler module, serves it locally and sends two uploads of the
+same deck (the second with caching bypassed), printing one JSON line with
+the import time and both request latencies. Imports are kept to a minimum
+before the handler is loaded so its import time is not understated.
+
+Usage:
+    python benchmarks/coldstart_probe.py HANDLER_PATH DECK_PATH
+"""
+
+import sys
+import time
+
+
+def load_handler(path: str):
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location('pptx_extract', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main():
+    handler_path, deck_path = sys.argv[1:3]
+
+    import_start = time.perf_counter()
+    module = load_handler(handler_path)
+    import_seconds = time.perf_counter() - import_start
+    ready_at = time.time()
+    pptx_loaded = 'pptx' in sys.modules
+    module_count = len(sys.modules)
+
+    import http.client
+    import json
+    import threading
+    import uuid
+    from http.server import ThreadingHTTPServer
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), module.handler)
+    server.RequestHandlerClass.log_message = lambda *args: None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with open(deck_path, 'rb') as f:
+        data = f.read()
+    boundary = uuid.uuid4().hex
+    body = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="deck.pptx"\r\n\r\n'
+    ).encode() + data + f'\r\n--{boundary}--\r\n'.encode()
+    headers = {'Content-Type': f'multipart/form-data; boundary={boundary}', 'Cache-Control': 'no-cache'}
+
+    latencies = []
+    for _ in range(2):
+        conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=300)
+        start = time.perf_counter()
+        conn.request('POST', '/api/pptx-extract', body=body, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        conn.close()
+        if response.status != 200:
+            raise SystemExit(f"Request failed with status {response.status}")
+    server.shutdown()
+
+    print(json.dumps({
+        "readyAt": ready_at,
+        "importSeconds": import_seconds,
+        "firstRequestSeconds": latencies[0],
+        "warmRequestSeconds": latencies[1],
+        "modulesLoaded": module_count,
+        "pptxLoaded": pptx_loaded,
+    }))
+
+
+if __name__ == "__main__":
+    main()
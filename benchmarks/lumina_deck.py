@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic Lumina-style PPTX decks for benchmarking.
+
+Decks mimic Lumina exports: a title per slide, performance tables with the
+header sets used in performance_tables.json, formatted metric values, and a
+configurable share of chart and image slides. The same parameters always
+produce byte-identical files (ZIP timestamps and core properties are fixed).
+
+Usage:
+    python benchmarks/lumina_deck.py out.pptx --slides 200 --tables-per-slide 2
+"""
+
+import argparse
+import io
+import random
+import re
+import struct
+import zipfile
+import zlib
+from datetime import datetime
+
+from pptx import Presentation
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE
+from pptx.util import Inches
+
+FIXED_ZIP_TIME = (2024, 1, 1, 0, 0, 0)
+FIXED_CORE_TIME = datetime(2024, 1, 1)
+FIXED_W3CDTF = b'2024-01-01T00:00:00Z'
+W3CDTF_RE = re.compile(rb'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z')
+
+TITLE_ONLY_LAYOUT = 5
+
+# Header sets taken from performance_tables.json
+TABLE_TEMPLATES = [
+    ("Monthly Performance", ["Date", "Impressions", "Video Views", "Completion Rate", "CPM", "Spend", "Reach", "Frequency"]),
+    ("Performance by Tactic", ["Tactic", "Impressions", "Clicks", "CTR", "Spend", "CPC", "Conversions", "CPA"]),
+    ("Creative Performance", ["Creative", "Impressions", "Clicks", "CTR", "Video Completions", "VCR"]),
+    ("Geo Performance", ["DMA", "Impressions", "Reach", "Frequency", "Spend"]),
+    ("Daily Performance", ["Date", "Impressions", "Clicks", "CTR", "Spend"]),
+]
+TACTICS = ["Audience Targeting", "Retargeting", "Contextual", "Geofencing", "Run of Network", "Keyword"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+class DeckSpec:
+    """Parameters of a synthetic deck.
+
+    Attributes:
+        slides: Number of slides
+        tables_per_slide: Tables on each table slide
+        rows: Data rows per table (a header row is added)
+        cols: Columns per table, capped by the header template width
+        chart_ratio: Share of slides holding a chart instead of tables
+        image_ratio: Share of slides holding an image instead of tables
+        seed: Random seed for cell values and slide kinds
+    """
+
+    def __init__(self, slides: int = 50, tables_per_slide: int = 1, rows: int = 12, cols: int = 6,
+                 chart_ratio: float = 0.2, image_ratio: float = 0.1, seed: int = 0):
+        self.slides = slides
+        self.tables_per_slide = tables_per_slide
+        self.rows = rows
+        self.cols = cols
+        self.chart_ratio = chart_ratio
+        self.image_ratio = image_ratio
+        self.seed = seed
+
+    def to_dict(self) -> dict:
+        return {
+            "slides": self.slides,
+            "tablesPerSlide": self.tables_per_slide,
+            "rows": self.rows,
+            "cols": self.cols,
+            "chartRatio": self.chart_ratio,
+            "imageRatio": self.image_ratio,
+            "seed": self.seed,
+        }
+
+
+def _cell_value(rng: random.Random, header: str, row: int) -> str:
+    """Format a plausible value for a metric column."""
+    if header == "Date":
+        return f"{MONTHS[row % 12]} {2023 + row // 12}"
+    if header == "Tactic":
+        return TACTICS[row % len(TACTICS)]
+    if header in ("Creative", "DMA"):
+        return f"{header} {row + 1}"
+    if header in ("Spend", "CPM", "CPC", "CPA"):
+        return f"${rng.uniform(1, 50000 if header == 'Spend' else 40):,.2f}"
+    if header in ("CTR", "Completion Rate", "VCR"):
+        return f"{rng.uniform(0.05, 95):.2f}%"
+    if header == "Frequency":
+        return f"{rng.uniform(1, 6):.1f}"
+    return f"{rng.randint(100, 5_000_000):,}"
+
+
+def _png(width: int, height: int, rng: random.Random) -> bytes:
+    """Build a small solid-color PNG without an imaging library."""
+    color = bytes(rng.randrange(256) for _ in range(3))
+    raw = b''.join(b'\x00' + color * width for _ in range(height))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(raw)) + chunk(b'IEND', b'')
+
+
+def _normalize(data: bytes) -> bytes:
+    """Rewrite an OOXML archive with fixed timestamps.
+
+    Entry times are fixed, and so are the dates in core properties and in
+    the chart workbooks embedded by python-pptx.
+    """
+    out = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as src, zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            content = src.read(info.filename)
+            if info.filename.endswith('.xlsx'):
+                content = _normalize(content)
+            elif info.filename == 'docProps/core.xml':
+                content = W3CDTF_RE.sub(FIXED_W3CDTF, content)
+            entry = zipfile.ZipInfo(info.filename, date_time=FIXED_ZIP_TIME)
+            entry.compress_type = zipfile.ZIP_DEFLATED
+            dst.writestr(entry, content)
+    return out.getvalue()
+
+
+def build_deck(spec: DeckSpec) -> bytes:
+    """Generate a deck for the given spec.
+
+    Args:
+        spec: Deck parameters
+
+    Returns:
+        PPTX file bytes; identical for identical specs
+    """
+    rng = random.Random(spec.seed)
+    prs = Presentation()
+    prs.core_properties.created = FIXED_CORE_TIME
+    prs.core_properties.modified = FIXED_CORE_TIME
+    prs.core_properties.last_modified_by = "benchmark"
+    layout = prs.slide_layouts[TITLE_ONLY_LAYOUT]
+
+    for slide_index in range(spec.slides):
+        slide = prs.slides.add_slide(layout)
+        kind = rng.random()
+
+        if kind < spec.chart_ratio:
+            slide.shapes.title.text = f"Impressions Trend {slide_index + 1}"
+            chart_data = CategoryChartData()
+            chart_data.categories = MONTHS[:6]
+            chart_data.add_series("Impressions", [rng.randint(1000, 100000) for _ in range(6)])
+            slide.shapes.add_chart(XL_CHART_TYPE.COLUMN_CLUSTERED, Inches(1), Inches(1.5), Inches(8), Inches(5),
+                                   chart_data)
+            continue
+
+        if kind < spec.chart_ratio + spec.image_ratio:
+            slide.shapes.title.text = f"Creative Preview {slide_index + 1}"
+            slide.shapes.add_picture(io.BytesIO(_png(64, 48, rng)), Inches(1), Inches(1.5), Inches(6), Inches(4.5))
+            continue
+
+        table_name, template = TABLE_TEMPLATES[rng.randrange(len(TABLE_TEMPLATES))]
+        slide.shapes.title.text = f"{table_name} - Slide {slide_index + 1}"
+        headers = template[:max(1, spec.cols)]
+        height = Inches(5.5 / max(1, spec.tables_per_slide))
+
+        for table_index in range(spec.tables_per_slide):
+            top = Inches(1.5) + height * table_index
+            table = slide.shapes.add_table(spec.rows + 1, len(headers), Inches(0.5), top, Inches(9), height).table
+            for col, header in enumerate(headers):
+                table.cell(0, col).text = header
+            for row in range(spec.rows):
+                for col, header in enumerate(headers):
+                    table.cell(row + 1, col).text = _cell_value(rng, header, row)
+
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return _normalize(buffer.getvalue())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Lumina-style PPTX deck.")
+    parser.add_argument('output', help="Path of the .pptx file to write")
+    parser.add_argument('--slides', type=int, default=50)
+    parser.add_argument('--tables-per-slide', type=int, default=1)
+    parser.add_argument('--rows', type=int, default=12)
+    parser.add_argument('--cols', type=int, default=6)
+    parser.add_argument('--chart-ratio', type=float, default=0.2)
+    parser.add_argument('--image-ratio', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    spec = DeckSpec(args.slides, args.tables_per_slide, args.rows, args.cols, args.chart_ratio, args.image_ratio,
+                    args.seed)
+    data = build_deck(spec)
+    with open(args.output, 'wb') as f:
+        f.write(data)
+    print(f"Wrote {args.output} ({len(data):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
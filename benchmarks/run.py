@@ -0,0 +1,630 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the PPTX extraction function.
+
+Generates deterministic Lumina-style decks (see lumina_deck.py) and measures:
+
+- extraction paths (XML engine, python-pptx engine, extract_table, warm
+  per-slide store, parallel slide scanning, slide content for the CLI) in
+  each output format: wall time, peak RSS and output bytes, each in a fresh
+  process so memory figures are not polluted by earlier runs
+- the HTTP handler end to end, served locally by the threaded server or
+  the asyncio server (api/_extractor/server.py), at several client
+  concurrency levels: latency percentiles, throughput and server peak RSS
+- cold starts: handler import time, process start-to-ready time and the
+  latency of the first and second request in a fresh interpreter, with and
+  without PPTX_PREWARM
+
+Results are written as JSON. Pass --baseline with an earlier results file to
+print the change per metric and flag regressions.
+
+Usage:
+    python benchmarks/run.py                       # standard preset
+    python benchmarks/run.py --preset quick --skip-http
+    python benchmarks/run.py --baseline benchmarks/results/old.json
+    python benchmarks/run.py --skip-extraction --skip-http --handler ../old/api/pptx-extract.py
+    python benchmarks/run.py --skip-extraction --skip-coldstart --server async
+"""
+
+import argparse
+import hashlib
+import http.client
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+API_DIR = os.path.join(REPO_DIR, 'api')
+HANDLER_PATH = os.path.join(API_DIR, 'pptx-extract.py')
+DEFAULT_RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+SERVER_THREADED = 'threaded'  # http.server.ThreadingHTTPServer, as in local development
+SERVER_ASYNC = 'async'  # _extractor.server.ExtractionServer
+SERVERS = (SERVER_THREADED, SERVER_ASYNC)
+
+RESULTS_SCHEMA = 1
+
+PATH_XML = 'xml'
+PATH_PYTHON_PPTX = 'python-pptx'
+PATH_EXTRACT_TABLE = 'extract_table'
+PATH_INCREMENTAL = 'incremental-warm'
+PATH_PARALLEL = 'parallel'
+PATH_SLIDE_CONTENT = 'slide-content'
+EXTRACTION_PATHS = (PATH_XML, PATH_PYTHON_PPTX, PATH_EXTRACT_TABLE, PATH_INCREMENTAL, PATH_PARALLEL,
+                    PATH_SLIDE_CONTENT)
+FORMATS = ('rows', 'columnar')
+
+HTTP_MODE_JSON = 'json'
+HTTP_MODE_COLUMNAR = 'columnar'
+HTTP_MODE_NDJSON = 'ndjson'
+HTTP_MODES = (HTTP_MODE_JSON, HTTP_MODE_COLUMNAR, HTTP_MODE_NDJSON)
+HTTP_SCENARIO_COLD = 'cold'  # Result cache and slide store disabled
+HTTP_SCENARIO_CACHED = 'cached'  # Default caches, warmed before timing
+
+COLDSTART_PROBE = os.path.join(BENCH_DIR, 'coldstart_probe.py')
+COLDSTART_PREWARM_MODES = ('', '1', 'full')  # PPTX_PREWARM values measured
+
+# Deck specs per preset, as DeckSpec keyword arguments
+PRESETS = {
+    'quick': {
+        'small': dict(slides=20, tables_per_slide=1, rows=10, cols=6, seed=1),
+    },
+    'standard': {
+        'small': dict(slides=20, tables_per_slide=1, rows=10, cols=6, seed=1),
+        'medium': dict(slides=100, tables_per_slide=2, rows=15, cols=8, seed=2),
+        'large': dict(slides=400, tables_per_slide=2, rows=20, cols=8, seed=3),
+    },
+}
+PRESET_CONCURRENCY = {'quick': [1, 4], 'standard': [1, 4, 16]}
+
+
+def _max_rss_bytes() -> int:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def _summary(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "mean": statistics.fmean(ordered),
+        "p50": _percentile(ordered, 0.5),
+        "p95": _percentile(ordered, 0.95),
+        "max": ordered[-1],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Extraction paths (run in a child process per measurement)
+# ---------------------------------------------------------------------------
+
+def _extraction_runner(path: str, output_format: str, data: bytes, workers: int):
+    """Return a zero-argument callable that runs one extraction and returns
+    (result, table count)."""
+    sys.path.insert(0, API_DIR)
+    import _extractor as ex
+
+    if path == PATH_XML:
+        def run():
+            result = ex.collect_presentation(ex.iter_presentation_xml(data, output_format))
+            return result, len(result["tables"])
+    elif path == PATH_PYTHON_PPTX:
+        def run():
+            result = ex.collect_presentation(ex.iter_presentation_pptx(data, output_format))
+            return result, len(result["tables"])
+    elif path == PATH_EXTRACT_TABLE:
+        import io
+        from pptx import Presentation
+
+        def run():
+            prs = Presentation(io.BytesIO(data))
+            tables = [ex.extract_table(shape.table) for slide in prs.slides for shape in slide.shapes
+                      if shape.has_table]
+            return tables, len(tables)
+    elif path == PATH_INCREMENTAL:
+        store = ex.SlideStore(ex.ResultCache())
+        ex.collect_presentation(ex.iter_presentation_xml(data, output_format, slide_store=store))
+
+        def run():
+            result = ex.collect_presentation(ex.iter_presentation_xml(data, output_format, slide_store=store))
+            return result, len(result["tables"])
+    elif path == PATH_PARALLEL:
+        def run():
+            result = ex.collect_presentation(ex.iter_presentation_xml(data, output_format, workers=workers,
+                                                                      min_parallel_slides=0))
+            return result, len(result["tables"])
+    elif path == PATH_SLIDE_CONTENT:
+        def run():
+            slides = [payload for kind, payload in ex.iter_slide_content(data, output_format)
+                      if kind == ex.EVENT_SLIDE]
+            return slides, sum(len(slide["tables"]) for slide in slides)
+    else:
+        raise ValueError(f"Unknown extraction path: {path}")
+    return run
+
+
+def run_extraction_child(task: dict) -> dict:
+    """Child process entry point: time one path/format on one deck."""
+    with open(task["deckPath"], 'rb') as f:
+        data = f.read()
+
+    run = _extraction_runner(task["path"], task["format"], data, task["workers"])
+
+    rss_before = _max_rss_bytes()
+    first_start = time.perf_counter()
+    result, table_count = run()
+    first = time.perf_counter() - first_start
+    output_bytes = len(json.dumps(result).encode())
+    del result
+
+    samples = []
+    for _ in range(task["repeat"]):
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+
+    peak = _max_rss_bytes()
+    return {
+        "wallSeconds": {"first": first, **_summary(samples)},
+        "peakRssBytes": peak,
+        "rssDeltaBytes": peak - rss_before,
+        "outputBytes": output_bytes,
+        "tables": table_count,
+    }
+
+
+def measure_extraction(deck_name: str, deck_path: str, path: str, output_format: str, repeat: int,
+                       workers: int) -> dict:
+    task = {"deckPath": deck_path, "path": path, "format": output_format, "repeat": repeat, "workers": workers}
+    proc = subprocess.run([sys.executable, __file__, '--child', json.dumps(task)], capture_output=True, text=True)
+    entry = {"deck": deck_name, "path": path, "format": output_format, "repeat": repeat}
+    if proc.returncode != 0:
+        entry["error"] = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+        return entry
+    entry.update(json.loads(proc.stdout.strip().splitlines()[-1]))
+    if path == PATH_PARALLEL:
+        entry["workers"] = workers
+    return entry
+
+
+# ---------------------------------------------------------------------------
+# HTTP round trips
+# ---------------------------------------------------------------------------
+
+def run_server_child(handler_path: str, server_kind: str = SERVER_THREADED):
+    """Child process entry point: serve the handler on an ephemeral port.
+
+    Prints the port, then serves until stdin is closed.
+    """
+    import importlib.util
+    from http.server import ThreadingHTTPServer
+
+    spec = importlib.util.spec_from_file_location('pptx_extract', handler_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.handler.log_message = lambda *args: None
+
+    if server_kind == SERVER_ASYNC:
+        import asyncio
+
+        from _extractor.server import ExtractionServer  # importable once the handler module has loaded
+
+        extraction_server = ExtractionServer.from_module(module)
+        loop = asyncio.new_event_loop()
+        server = loop.run_until_complete(extraction_server.start('127.0.0.1', 0))
+        threading.Thread(target=loop.run_forever, daemon=True).start()
+        print(server.sockets[0].getsockname()[1], flush=True)
+        sys.stdin.read()
+        return
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), module.handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(server.server_address[1], flush=True)
+    sys.stdin.read()
+    server.shutdown()
+
+
+class LocalServer:
+    """The extraction handler running in a separate process."""
+
+    def __init__(self, scenario: str, handler_path: str = HANDLER_PATH, server_kind: str = SERVER_THREADED):
+        env = dict(os.environ)
+        if scenario == HTTP_SCENARIO_COLD:
+            env.update(PPTX_CACHE_MAX_BYTES='0', PPTX_SLIDE_STORE_MAX_BYTES='0', PPTX_CACHE_DIR='')
+        self.proc = subprocess.Popen([sys.executable, __file__, '--serve', handler_path, server_kind],
+                                     stdin=subprocess.PIPE,
+                                     stdout=subprocess.PIPE, text=True, env=env)
+        self.port = int(self.proc.stdout.readline())
+
+    def peak_rss_bytes(self) -> int | None:
+        """Server peak RSS from /proc (Linux only)."""
+        try:
+            with open(f'/proc/{self.proc.pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmHWM:'):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+        return None
+
+    def close(self):
+        self.proc.stdin.close()
+        self.proc.wait(timeout=30)
+
+
+def _multipart_body(data: bytes, filename: str) -> tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    body = (
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        'Content-Type: application/vnd.openxmlformats-officedocument.presentationml.presentation\r\n\r\n'
+    ).encode() + data + f'\r\n--{boundary}--\r\n'.encode()
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+def _request_target(mode: str) -> tuple[str, dict]:
+    if mode == HTTP_MODE_COLUMNAR:
+        return '/api/pptx-extract?format=columnar', {}
+    if mode == HTTP_MODE_NDJSON:
+        return '/api/pptx-extract', {'Accept': 'application/x-ndjson'}
+    return '/api/pptx-extract', {}
+
+
+def measure_http(server: LocalServer, deck_name: str, data: bytes, scenario: str, mode: str, concurrency: int,
+                 requests: int) -> dict:
+    """Send `requests` uploads from `concurrency` keep-alive clients."""
+    body, content_type = _multipart_body(data, f'{deck_name}.pptx')
+    target, extra_headers = _request_target(mode)
+    headers = {'Content-Type': content_type, 'Content-Length': str(len(body)), **extra_headers}
+
+    latencies = []
+    errors = []
+    response_bytes = []
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def client():
+        conn = http.client.HTTPConnection('127.0.0.1', server.port, timeout=300)
+        try:
+            while True:
+                with lock:
+                    if next(counter, None) is None:
+                        return
+                start = time.perf_counter()
+                try:
+                    conn.request('POST', target, body=body, headers=headers)
+                    response = conn.getresponse()
+                    payload = response.read()
+                    status = response.status
+                except (OSError, http.client.HTTPException) as e:
+                    conn.close()
+                    conn = http.client.HTTPConnection('127.0.0.1', server.port, timeout=300)
+                    status, payload = str(e), b''
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+                    response_bytes.append(len(payload))
+                    if status != 200:
+                        errors.append(status)
+        finally:
+            conn.close()
+
+    if scenario == HTTP_SCENARIO_CACHED:
+        # Populate the result cache so timed requests measure the hit path
+        warm = http.client.HTTPConnection('127.0.0.1', server.port, timeout=300)
+        warm.request('POST', target, body=body, headers=headers)
+        warm.getresponse().read()
+        warm.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(client)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "deck": deck_name,
+        "scenario": scenario,
+        "mode": mode,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "latencySeconds": _summary(latencies),
+        "throughputRps": len(latencies) / elapsed if elapsed else None,
+        "responseBytes": statistics.median(response_bytes),
+        "serverPeakRssBytes": server.peak_rss_bytes(),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Cold starts
+# ---------------------------------------------------------------------------
+
+def measure_coldstart(deck_name: str, deck_path: str, handler_path: str, prewarm: str, runs: int) -> dict:
+    """Start a fresh interpreter `runs` times and time the handler's import
+    and first requests (see coldstart_probe.py)."""
+    env = dict(os.environ, PPTX_CACHE_MAX_BYTES='0', PPTX_SLIDE_STORE_MAX_BYTES='0', PPTX_CACHE_DIR='',
+               PPTX_PREWARM=prewarm)
+    samples = {"startupSeconds": [], "importSeconds": [], "firstRequestSeconds": [], "warmRequestSeconds": []}
+    probe = {}
+    entry = {"deck": deck_name, "prewarm": prewarm or None, "handler": os.path.relpath(handler_path, REPO_DIR),
+             "runs": runs}
+
+    for _ in range(runs):
+        spawned_at = time.time()
+        proc = subprocess.run([sys.executable, COLDSTART_PROBE, handler_path, deck_path], capture_output=True,
+                              text=True, env=env)
+        if proc.returncode != 0:
+            entry["error"] = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+            return entry
+        probe = json.loads(proc.stdout.strip().splitlines()[-1])
+        samples["startupSeconds"].append(probe["readyAt"] - spawned_at)
+        for key in ("importSeconds", "firstRequestSeconds", "warmRequestSeconds"):
+            samples[key].append(probe[key])
+
+    entry.update({key: _summary(values) for key, values in samples.items()})
+    entry["modulesLoaded"] = probe["modulesLoaded"]
+    entry["pptxLoaded"] = probe["pptxLoaded"]
+    return entry
+
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------------------------
+
+# (section, key fields, metric path, higher is better)
+COMPARED_METRICS = [
+    ("extraction", ("deck", "path", "format"), ("wallSeconds", "median"), False),
+    ("extraction", ("deck", "path", "format"), ("peakRssBytes",), False),
+    ("extraction", ("deck", "path", "format"), ("outputBytes",), False),
+    ("http", ("deck", "scenario", "mode", "concurrency"), ("latencySeconds", "p50"), False),
+    ("http", ("deck", "scenario", "mode", "concurrency"), ("latencySeconds", "p95"), False),
+    ("http", ("deck", "scenario", "mode", "concurrency"), ("throughputRps",), True),
+    ("coldstart", ("deck", "prewarm"), ("importSeconds", "median"), False),
+    ("coldstart", ("deck", "prewarm"), ("startupSeconds", "median"), False),
+    ("coldstart", ("deck", "prewarm"), ("firstRequestSeconds", "median"), False),
+]
+
+
+def _metric(entry: dict, metric_path: tuple) -> float | None:
+    value = entry
+    for key in metric_path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def compare_results(baseline: dict, current: dict, threshold: float) -> list[dict]:
+    """Compare matching entries of two results files.
+
+    Args:
+        baseline: Earlier results
+        current: New results
+        threshold: Relative change beyond which a metric counts as a
+            regression (e.g. 0.1 for 10%)
+
+    Returns:
+        One row per compared metric with 'change' (relative) and
+        'regression'
+    """
+    rows = []
+    for section, key_fields, metric_path, higher_is_better in COMPARED_METRICS:
+        previous = {tuple(e.get(k) for k in key_fields): e for e in baseline.get(section, [])}
+        for entry in current.get(section, []):
+            key = tuple(entry.get(k) for k in key_fields)
+            old_entry = previous.get(key)
+            if old_entry is None:
+                continue
+            old, new = _metric(old_entry, metric_path), _metric(entry, metric_path)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            rows.append({
+                "section": section,
+                "key": dict(zip(key_fields, key)),
+                "metric": '.'.join(metric_path),
+                "baseline": old,
+                "current": new,
+                "change": change,
+                "regression": worse > threshold,
+            })
+    return rows
+
+
+def print_comparison(rows: list[dict]):
+    for row in rows:
+        key = '/'.join(str(v) for v in row["key"].values())
+        flag = '  REGRESSION' if row["regression"] else ''
+        print(f"  {row['section']:<10} {key:<40} {row['metric']:<22} {row['change']:+7.1%}{flag}")
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def _git_revision() -> dict:
+    def git(*args):
+        proc = subprocess.run(['git', *args], cwd=REPO_DIR, capture_output=True, text=True)
+        return proc.stdout.strip() if proc.returncode == 0 else None
+
+    status = git('status', '--porcelain', '--untracked-files=no')
+    return {"commit": git('rev-parse', 'HEAD'), "dirty": bool(status) if status is not None else None}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark PPTX extraction paths and the HTTP handler.")
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='standard', help="Deck sizes to generate")
+    parser.add_argument('--slides', type=int, help="Benchmark a single custom deck with this many slides")
+    parser.add_argument('--tables-per-slide', type=int, default=1)
+    parser.add_argument('--rows', type=int, default=12)
+    parser.add_argument('--cols', type=int, default=6)
+    parser.add_argument('--chart-ratio', type=float, default=0.2)
+    parser.add_argument('--image-ratio', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--paths', default=','.join(EXTRACTION_PATHS), help="Comma-separated extraction paths")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per extraction measurement")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help="Workers for the parallel path")
+    parser.add_argument('--concurrency', help="Comma-separated HTTP client concurrency levels")
+    parser.add_argument('--requests', type=int, default=0,
+                        help="HTTP requests per level (default: 4 per client, at least 8)")
+    parser.add_argument('--http-modes', default=','.join(HTTP_MODES))
+    parser.add_argument('--server', choices=SERVERS, default=SERVER_THREADED, help="Server used for HTTP runs")
+    parser.add_argument('--skip-http', action='store_true')
+    parser.add_argument('--skip-extraction', action='store_true')
+    parser.add_argument('--skip-coldstart', action='store_true')
+    parser.add_argument('--coldstart-runs', type=int, default=10, help="Fresh interpreters per cold-start measurement")
+    parser.add_argument('--handler', default=HANDLER_PATH,
+                        help="Handler to serve for HTTP and cold-start runs, e.g. from another checkout")
+    parser.add_argument('--output', help="Results file (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument('--baseline', help="Earlier results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.1, help="Relative change flagged as a regression")
+    parser.add_argument('--fail-on-regression', action='store_true')
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    sys.path.insert(0, BENCH_DIR)
+    from lumina_deck import DeckSpec, build_deck
+
+    if args.slides:
+        deck_specs = {'custom': dict(slides=args.slides, tables_per_slide=args.tables_per_slide, rows=args.rows,
+                                     cols=args.cols, chart_ratio=args.chart_ratio, image_ratio=args.image_ratio,
+                                     seed=args.seed)}
+    else:
+        deck_specs = PRESETS[args.preset]
+    concurrency_levels = ([int(c) for c in args.concurrency.split(',')] if args.concurrency
+                          else PRESET_CONCURRENCY.get(args.preset, [1, 4]))
+    paths = [p for p in args.paths.split(',') if p]
+    http_modes = [m for m in args.http_modes.split(',') if m]
+
+    revision = _git_revision()
+    results = {
+        "schema": RESULTS_SCHEMA,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpuCount": os.cpu_count(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            **revision,
+        },
+        "config": {
+            "preset": None if args.slides else args.preset,
+            "repeat": args.repeat,
+            "workers": args.workers,
+            "concurrency": concurrency_levels,
+            "server": args.server,
+        },
+        "decks": [],
+        "extraction": [],
+        "http": [],
+        "coldstart": [],
+    }
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        decks = []
+        for name, kwargs in deck_specs.items():
+            spec = DeckSpec(**kwargs)
+            data = build_deck(spec)
+            deck_path = os.path.join(work_dir, f'{name}.pptx')
+            with open(deck_path, 'wb') as f:
+                f.write(data)
+            decks.append((name, deck_path, data))
+            results["decks"].append({"name": name, "spec": spec.to_dict(), "bytes": len(data),
+                                     "sha256": hashlib.sha256(data).hexdigest()})
+            print(f"deck {name}: {spec.slides} slides, {len(data):,} bytes")
+
+        if not args.skip_extraction:
+            for name, deck_path, _ in decks:
+                for path in paths:
+                    formats = ('rows',) if path == PATH_EXTRACT_TABLE else FORMATS
+                    for output_format in formats:
+                        entry = measure_extraction(name, deck_path, path, output_format, args.repeat, args.workers)
+                        results["extraction"].append(entry)
+                        if "error" in entry:
+                            print(f"  {name:<8} {path:<17} {output_format:<9} error: {entry['error']}")
+                        else:
+                            print(f"  {name:<8} {path:<17} {output_format:<9} "
+                                  f"{entry['wallSeconds']['median'] * 1000:9.1f} ms  "
+                                  f"peak {entry['peakRssBytes'] / 2**20:7.1f} MB  "
+                                  f"out {entry['outputBytes']:>11,} B")
+
+        if not args.skip_http:
+            for scenario in (HTTP_SCENARIO_COLD, HTTP_SCENARIO_CACHED):
+                server = LocalServer(scenario, args.handler, args.server)
+                try:
+                    for name, _, data in decks:
+                        for mode in http_modes:
+                            for concurrency in concurrency_levels:
+                                requests = args.requests or max(8, concurrency * 4)
+                                entry = measure_http(server, name, data, scenario, mode, concurrency, requests)
+                                results["http"].append(entry)
+                                print(f"  http {scenario:<6} {name:<8} {mode:<8} c={concurrency:<3} "
+                                      f"p50 {entry['latencySeconds']['p50'] * 1000:8.1f} ms  "
+                                      f"p95 {entry['latencySeconds']['p95'] * 1000:8.1f} ms  "
+                                      f"{entry['throughputRps']:7.1f} req/s  errors {entry['errors']}")
+                finally:
+                    server.close()
+
+        if not args.skip_coldstart:
+            # One deck is enough; cold-start cost does not depend on deck size
+            name, deck_path, _ = decks[0]
+            for prewarm in COLDSTART_PREWARM_MODES:
+                entry = measure_coldstart(name, deck_path, args.handler, prewarm, args.coldstart_runs)
+                results["coldstart"].append(entry)
+                label = f"prewarm={prewarm or 'off'}"
+                if "error" in entry:
+                    print(f"  cold   {name:<8} {label:<13} error: {entry['error']}")
+                else:
+                    print(f"  cold   {name:<8} {label:<13} "
+                          f"import {entry['importSeconds']['median'] * 1000:7.1f} ms  "
+                          f"ready {entry['startupSeconds']['median'] * 1000:7.1f} ms  "
+                          f"first {entry['firstRequestSeconds']['median'] * 1000:7.1f} ms  "
+                          f"second {entry['warmRequestSeconds']['median'] * 1000:7.1f} ms")
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        output = os.path.join(DEFAULT_RESULTS_DIR, f"{stamp}-{(revision['commit'] or 'unknown')[:8]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            rows = compare_results(json.load(f), results, args.threshold)
+        print(f"Compared with {args.baseline}:")
+        print_comparison(rows)
+        if args.fail_on_regression and any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == '--child':
+        print(json.dumps(run_extraction_child(json.loads(sys.argv[2]))))
+    elif len(sys.argv) in (3, 4) and sys.argv[1] == '--serve':
+        run_server_child(*sys.argv[2:])
+    else:
+        sys.exit(main())
@@ -38,6 +38,34 @@ export interface ExtractedTable {
   headerMatch?: HeaderValidation
 }
 
+/**
+ * Detected type of a column in columnar output
+ */
+export type ColumnType = 'int' | 'float' | 'currency' | 'percent' | 'date' | 'text'
+
+/**
+ * A table returned by the extraction API with `format=columnar`.
+ * Values are stored per column and parsed to the column's type
+ * (currency/percent as plain numbers, dates as ISO strings); blank cells are null,
+ * as are placeholder cells such as "-" or "N/A" in non-text columns.
+ */
+export interface ColumnarTable {
+  /** Slide number (1-indexed) */
+  slideNumber: number
+  /** Slide title if present */
+  slideTitle: string | null
+  /** Index of table within the slide (0-indexed) */
+  tableIndex: number
+  /** Column headers from the first row (may contain duplicates) */
+  headers: string[]
+  /** One value array per header, in header order */
+  columns: (string | number | null)[][]
+  /** Detected type of each column */
+  columnTypes: ColumnType[]
+  /** Number of data rows (excluding header) */
+  rowCount: number
+}
+
 /**
  * Metadata about the extracted PowerPoint
  */
@@ -46,6 +74,52 @@ export interface PPTXMetadata {
   filename: string
   /** Total number of slides in presentation */
   slideCount: number
+  /** Set when the maxTables limit stopped extraction early */
+  truncated?: boolean
+  /** SHA-256 of the uploaded file; pass as `since` on a later upload to diff against it */
+  deckHash?: string
+  /** Server-side stage timings, returned when `timings=1` is set */
+  timings?: PPTXTimings
+}
+
+/**
+ * Per-request instrumentation. Stage durations are exclusive and in
+ * milliseconds; the same figures are sent in the Server-Timing header.
+ */
+export interface PPTXTimings {
+  totalMs: number
+  /** e.g. multipart, cache, open, store, shapes, tables, diff */
+  stages: Record<string, number>
+  /** slides, parsedSlides, shapes, tables */
+  counts: Record<string, number>
+  bytesRead: number
+  /**
+   * How far the request raised the function process's peak RSS. This is a
+   * new process high-water mark, not the request's own usage: it is 0 on a
+   * warm instance unless the request needed more memory than any earlier one
+   */
+  peakRssDeltaBytes: number | null
+  /**
+   * Peak Python heap allocated during the request (tracemalloc). Omitted
+   * when another request was being traced at the same time
+   */
+  peakAllocatedBytes?: number
+}
+
+/**
+ * Changes since an earlier deck, returned when `since` is given.
+ * Slides are compared by position.
+ */
+export interface PPTXDeckDiff {
+  /** deckHash the upload was compared against */
+  since: string
+  /** False if the earlier deck is unknown to the server */
+  available: boolean
+  changedSlides?: number[]
+  addedSlides?: number[]
+  /** Slide numbers of the earlier deck beyond the end of this one */
+  removedSlides?: number[]
+  tables?: { slideNumber: number; tableIndex: number; change: 'added' | 'removed' | 'changed' }[]
 }
 
 /**
@@ -60,10 +134,28 @@ export interface PPTXExtractResponse {
   tables: ExtractedTable[]
   /** Warning message (e.g., no tables found) */
   warning?: string
+  /** Changes since the deck given by `since` */
+  diff?: PPTXDeckDiff
   /** Error message if success is false */
   error?: string
 }
 
+/**
+ * One line of the streamed (application/x-ndjson) PPTX extraction response.
+ * Table lines arrive as slides are parsed; a summary or error line ends the stream.
+ */
+export type PPTXStreamLine =
+  | { type: 'table'; table: ExtractedTable }
+  | {
+      type: 'summary'
+      success: true
+      metadata: PPTXMetadata
+      tableCount: number
+      warning?: string
+      diff?: PPTXDeckDiff
+    }
+  | { type: 'error'; success: false; error: string }
+
 /**
  * State for PPTX preview modal
  */
@@ -0,0 +1,17 @@
+"""
+Shared setup for the extraction package tests.
+
+The package lives under api/ (the serverless function directory), so it is
+put on sys.path the same way api/pptx-extract.py does. benchmarks/ is added
+too so tests can build decks with its deterministic generator. Run with:
+
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (os.path.join(ROOT_DIR, 'api'), os.path.join(ROOT_DIR, 'benchmarks')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
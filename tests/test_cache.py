@@ -0,0 +1,61 @@
+import os
+
+from _extractor.cache import ResultCache
+from _extractor.incremental import STORE_DISK_SUBDIR, slide_store_from_env
+
+
+def disk_files(root: str) -> list[str]:
+    return sorted(name for _, _, names in os.walk(root) for name in names)
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResultCache(max_memory_bytes=40)
+    cache.put('a', {"v": 'x' * 10})
+    cache.put('b', {"v": 'y' * 10})
+    assert cache.get('a') is not None
+    cache.put('c', {"v": 'z' * 10})
+    assert cache.get('b') is None
+    assert cache.get('a') == {"v": 'x' * 10}
+
+
+def test_disk_tier_round_trip(tmp_path):
+    ResultCache(disk_dir=str(tmp_path)).put('ab12', {"tables": [1, 2]})
+    cache = ResultCache(disk_dir=str(tmp_path))
+    assert cache.get('ab12') == {"tables": [1, 2]}
+    assert cache.stats()["diskHits"] == 1
+
+
+def test_disk_tier_evicts_least_recently_used_past_budget(tmp_path):
+    cache = ResultCache(max_memory_bytes=0, disk_dir=str(tmp_path), max_disk_bytes=10_000)
+    keys = [f'{i:02x}{"0" * 62}' for i in range(40)]
+    for i, key in enumerate(keys):
+        cache.put(key, {"payload": os.urandom(200).hex()})
+        if i >= 1:
+            # Keep the first entry in use
+            assert cache.get(keys[0]) is not None
+
+    sizes = [os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(tmp_path) for name in names]
+    assert sum(sizes) <= 10_000
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[-1]) is not None
+
+
+def test_eviction_leaves_other_directories_alone(tmp_path):
+    other = tmp_path / STORE_DISK_SUBDIR / 'ab'
+    other.mkdir(parents=True)
+    (other / f'{"ab" * 32}.json.gz').write_bytes(b'x' * 50_000)
+
+    cache = ResultCache(max_memory_bytes=0, disk_dir=str(tmp_path), max_disk_bytes=1_000)
+    for i in range(10):
+        cache.put(f'{i:02x}{"0" * 62}', {"payload": 'x' * 200})
+    assert (other / f'{"ab" * 32}.json.gz').exists()
+
+
+def test_slide_store_uses_its_own_subdirectory(tmp_path, monkeypatch):
+    monkeypatch.setenv('PPTX_CACHE_DIR', str(tmp_path))
+    store = slide_store_from_env()
+    store.put_slide('f' * 64, 'Title', [])
+    assert store.cache.disk_dir == os.path.join(str(tmp_path), STORE_DISK_SUBDIR)
+    assert disk_files(tmp_path / STORE_DISK_SUBDIR)
+    assert not [name for name in os.listdir(tmp_path) if name != STORE_DISK_SUBDIR]
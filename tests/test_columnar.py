@@ -0,0 +1,78 @@
+import pytest
+
+from _extractor.columnar import (
+    TYPE_CURRENCY,
+    TYPE_DATE,
+    TYPE_FLOAT,
+    TYPE_INT,
+    TYPE_PERCENT,
+    TYPE_TEXT,
+    build_columnar_table,
+    parse_column,
+)
+
+
+@pytest.mark.parametrize('values, expected', [
+    (['1', '1,234', '-56', '0'], (TYPE_INT, [1, 1234, -56, 0])),
+    (['1.5', '2K', '3.2M', '.5'], (TYPE_FLOAT, [1.5, 2000.0, 3200000.0, 0.5])),
+    (['$1,250.00', '($40)', '-$3.5K'], (TYPE_CURRENCY, [1250.0, -40.0, -3500.0])),
+    (['12.3%', '-4%', '0.52 %'], (TYPE_PERCENT, [12.3, -4.0, 0.52])),
+    (['2024-01-31', '2024-02-29'], (TYPE_DATE, ['2024-01-31', '2024-02-29'])),
+    (['01/31/2024', '1/5/24'], (TYPE_DATE, ['2024-01-31', '2024-01-05'])),
+    (['Jan 5, 2024', '05-Feb-2024'], (TYPE_DATE, ['2024-01-05', '2024-02-05'])),
+    (['Jan 2023', 'Dec 2023', 'September 2024'], (TYPE_DATE, ['2023-01-01', '2023-12-01', '2024-09-01'])),
+])
+def test_detects_and_parses_type(values, expected):
+    assert parse_column(values) == expected
+
+
+def test_leading_zeros_stay_text():
+    assert parse_column(['02134', '10001']) == (TYPE_TEXT, ['02134', '10001'])
+
+
+def test_mixed_column_is_text():
+    assert parse_column(['1', 'two', '3']) == (TYPE_TEXT, ['1', 'two', '3'])
+
+
+def test_unbalanced_parentheses_are_not_currency():
+    assert parse_column(['($40', '$5'])[0] == TYPE_TEXT
+
+
+def test_blank_cells_are_null_and_ignored():
+    assert parse_column(['1', '', None, '3']) == (TYPE_INT, [1, None, None, 3])
+    assert parse_column(['', None]) == (TYPE_TEXT, [None, None])
+    assert parse_column([]) == (TYPE_TEXT, [])
+
+
+@pytest.mark.parametrize('values, expected', [
+    (['12.3%', '-', '4%'], (TYPE_PERCENT, [12.3, None, 4.0])),
+    (['$5', 'N/A', '$1,000'], (TYPE_CURRENCY, [5.0, None, 1000.0])),
+    (['1', '\u2014', 'n/a', '#N/A', '3'], (TYPE_INT, [1, None, None, None, 3])),
+])
+def test_placeholders_are_null_in_typed_columns(values, expected):
+    assert parse_column(values) == expected
+
+
+def test_placeholders_are_kept_in_text_columns():
+    assert parse_column(['Display', 'N/A', '-']) == (TYPE_TEXT, ['Display', 'N/A', '-'])
+    assert parse_column(['-', 'N/A']) == (TYPE_TEXT, ['-', 'N/A'])
+
+
+def test_build_columnar_table():
+    table = build_columnar_table([
+        ['Date', 'Spend', 'Spend'],
+        ['2024-01-01', '$10', '1'],
+        ['2024-01-02', '$20'],
+    ])
+    assert table == {
+        "headers": ['Date', 'Spend', 'Spend'],
+        "columns": [['2024-01-01', '2024-01-02'], [10.0, 20.0], [1, None]],
+        "columnTypes": [TYPE_DATE, TYPE_CURRENCY, TYPE_INT],
+        "rowCount": 2,
+    }
+
+
+def test_build_columnar_table_without_headers():
+    table = build_columnar_table([[], ['a', 'b']])
+    assert table["headers"] == ['Column 1', 'Column 2']
+    assert table["columns"] == [['a'], ['b']]
@@ -0,0 +1,94 @@
+import io
+
+import pytest
+from lumina_deck import DeckSpec, build_deck
+from pptx import Presentation
+from pptx.util import Inches
+
+from _extractor import (
+    FORMAT_COLUMNAR,
+    FORMAT_ROWS,
+    collect_presentation,
+    iter_presentation_pptx,
+    iter_presentation_xml,
+    iter_slide_content_pptx,
+    iter_slide_content_xml,
+)
+
+
+def build_mixed_deck() -> bytes:
+    """A deck exercising what the XML engine reimplements: several layouts,
+    merged cells, vertical-tab line breaks, XML entities, body text levels
+    and notes."""
+    prs = Presentation()
+
+    slide = prs.slides.add_slide(prs.slide_layouts[0])
+    slide.shapes.title.text = "Q3 Review & <Outlook>"
+    slide.placeholders[1].text = "Prepared for \"Acme\"\vConfidential"
+
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.shapes.title.text = "Highlights"
+    body = slide.placeholders[1].text_frame
+    body.text = "Spend up 12%"
+    for text, level in (("CTR < 1% on display", 1), ("Video & audio", 2)):
+        paragraph = body.add_paragraph()
+        paragraph.text = text
+        paragraph.level = level
+    slide.notes_slide.notes_text_frame.text = "Mention the CPM change\vand the new DMAs"
+
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    slide.shapes.title.text = "Performance by Tactic"
+    table = slide.shapes.add_table(4, 4, Inches(0.5), Inches(1.5), Inches(9), Inches(3)).table
+    rows = [
+        ["Tactic", "Impressions", "CTR", "Spend"],
+        ["Retargeting", "1,204,551", "0.42%", "$12,400.00"],
+        ["Contextual & Keyword", "", "0.18%", "$3,100.50"],
+        ["Total", "1,900,000", "0.30%", "$15,500.50"],
+    ]
+    for r, values in enumerate(rows):
+        for c, value in enumerate(values):
+            table.cell(r, c).text = value
+    table.cell(2, 1).text = "88,000\v(est.)"
+    table.cell(3, 0).merge(table.cell(3, 1))
+    table.cell(1, 2).merge(table.cell(2, 2))
+
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    textbox = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(1))
+    textbox.text_frame.text = "Untitled blank slide"
+    table = slide.shapes.add_table(2, 2, Inches(1), Inches(3), Inches(4), Inches(1)).table
+    table.cell(0, 0).text = "Date"
+    table.cell(0, 1).text = "Impressions"
+    table.cell(1, 0).text = "Jan 2024"
+    table.cell(1, 1).text = "5,000"
+    slide.notes_slide.notes_text_frame.text = ""
+
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    slide.shapes.title.text = "Appendix"
+
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
+
+
+DECKS = {
+    'lumina': build_deck(DeckSpec(slides=12, tables_per_slide=2, chart_ratio=0.2, image_ratio=0.1, seed=3)),
+    'mixed': build_mixed_deck(),
+}
+
+
+@pytest.mark.parametrize('output_format', [FORMAT_ROWS, FORMAT_COLUMNAR])
+@pytest.mark.parametrize('deck_name', sorted(DECKS))
+def test_xml_engine_tables_match_python_pptx(deck_name, output_format):
+    deck = DECKS[deck_name]
+    expected = collect_presentation(iter_presentation_pptx(deck, output_format))
+
+    assert collect_presentation(iter_presentation_xml(deck, output_format)) == expected
+    assert expected["tables"]
+
+
+@pytest.mark.parametrize('output_format', [FORMAT_ROWS, FORMAT_COLUMNAR])
+@pytest.mark.parametrize('deck_name', sorted(DECKS))
+def test_xml_engine_slide_content_matches_python_pptx(deck_name, output_format):
+    deck = DECKS[deck_name]
+
+    assert list(iter_slide_content_xml(deck, output_format)) == list(iter_slide_content_pptx(deck, output_format))
@@ -0,0 +1,58 @@
+import pytest
+
+from _extractor.filters import ExtractionFilter, parse_slide_ranges
+
+
+def test_parse_slide_ranges():
+    assert parse_slide_ranges('1-5,8,12-') == [(1, 5), (8, 8), (12, None)]
+    assert parse_slide_ranges(' 3 - 4 , 7 ') == [(3, 4), (7, 7)]
+
+
+@pytest.mark.parametrize('value', ['', '0', '5-3', 'x', '1,,2', '-4', '1-2-3', '2.5'])
+def test_parse_slide_ranges_rejects(value):
+    with pytest.raises(ValueError, match="Invalid slide range"):
+        parse_slide_ranges(value)
+
+
+def test_accepts_slide_number():
+    slide_filter = ExtractionFilter.from_params(slides='2-3,10-')
+    assert [n for n in range(1, 13) if slide_filter.accepts_slide_number(n)] == [2, 3, 10, 11, 12]
+    assert ExtractionFilter().accepts_slide_number(99)
+
+
+def test_title_and_header_patterns_are_case_insensitive():
+    slide_filter = ExtractionFilter.from_params(title='^performance', header='ctr')
+    assert slide_filter.accepts_title('Performance by Tactic')
+    assert not slide_filter.accepts_title('Executive Summary')
+    assert not slide_filter.accepts_title(None)
+    assert slide_filter.accepts_headers(['Date', 'CTR'])
+    assert not slide_filter.accepts_headers(['Date', 'Spend'])
+
+
+def test_select_tables():
+    grids = [[['Date', 'CTR'], ['Jan', '1%']], [['Date', 'Spend'], ['Jan', '$1']], [['Header only']]]
+    slide_filter = ExtractionFilter(header_pattern='ctr')
+    assert slide_filter.select_tables('Any title', grids) == [grids[0], None, grids[2]]
+    assert ExtractionFilter(title_pattern='^Perf').select_tables('Summary', grids) == []
+    assert ExtractionFilter().select_tables('Summary', grids) == grids
+
+
+@pytest.mark.parametrize('params, message', [
+    ({'title': '('}, "Invalid title pattern"),
+    ({'header': '[a'}, "Invalid header pattern"),
+    ({'max_tables': '0'}, "maxTables must be a positive integer"),
+    ({'max_tables': 'ten'}, "maxTables must be a positive integer"),
+    ({'slides': '4-2'}, "Invalid slide range"),
+])
+def test_from_params_rejects(params, message):
+    with pytest.raises(ValueError, match=message):
+        ExtractionFilter.from_params(**params)
+
+
+def test_is_active_and_cache_key():
+    assert not ExtractionFilter.from_params().is_active
+    slide_filter = ExtractionFilter.from_params(slides='1-3,5-', title='^Perf', max_tables='2')
+    assert slide_filter.is_active
+    assert slide_filter.max_tables == 2
+    assert slide_filter.cache_key() == 'slides=1-3,5-|title=^Perf|header=|max=2'
+    assert slide_filter.cache_key() != ExtractionFilter.from_params(slides='1-3,5-', title='^Perf').cache_key()
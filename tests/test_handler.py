@@ -0,0 +1,219 @@
+import http.client
+import io
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+from lumina_deck import DeckSpec, build_deck
+
+from _extractor import ResultCache, SlideStore
+from _extractor.server import load_handler_module, run_handler
+
+BOUNDARY = 'handlertestboundary'
+CONTENT_TYPE = f'multipart/form-data; boundary={BOUNDARY}'
+
+
+@pytest.fixture(scope='module')
+def module():
+    return load_handler_module()
+
+
+@pytest.fixture
+def port(module, monkeypatch):
+    # Fresh caches so tests do not see each other's results
+    monkeypatch.setattr(module, 'result_cache', ResultCache())
+    monkeypatch.setattr(module, 'slide_store', SlideStore(ResultCache()))
+    monkeypatch.setattr(module.handler, 'log_message', lambda *args: None)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), module.handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(scope='module')
+def deck() -> bytes:
+    return build_deck(DeckSpec(slides=8, chart_ratio=0.2, image_ratio=0.1, seed=1))
+
+
+def multipart_body(files: list[tuple[str, bytes]]) -> bytes:
+    body = b''
+    for filename, data in files:
+        body += (
+            f'--{BOUNDARY}\r\n'
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n\r\n'
+        ).encode() + data + b'\r\n'
+    return body + f'--{BOUNDARY}--\r\n'.encode()
+
+
+def post(port: int, files: list[tuple[str, bytes]], target: str = '/', headers: dict | None = None
+         ) -> http.client.HTTPResponse:
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    connection.request('POST', target, body=multipart_body(files),
+                       headers={'Content-Type': CONTENT_TYPE, **(headers or {})})
+    return connection.getresponse()
+
+
+def ndjson_lines(response: http.client.HTTPResponse) -> list[dict]:
+    assert response.getheader('Content-Type') == 'application/x-ndjson'
+    return [json.loads(line) for line in response.read().splitlines()]
+
+
+def test_ndjson_streams_table_lines_then_summary(port, deck):
+    expected = json.loads(post(port, [('deck.pptx', deck)]).read())
+
+    response = post(port, [('deck.pptx', deck)], '/?stream=1', {'Cache-Control': 'no-cache'})
+    lines = ndjson_lines(response)
+
+    assert response.status == 200
+    assert [line["type"] for line in lines] == ["table"] * len(expected["tables"]) + ["summary"]
+    assert [line["table"] for line in lines[:-1]] == expected["tables"]
+    summary = lines[-1]
+    assert summary["success"] is True
+    assert summary["tableCount"] == len(expected["tables"])
+    assert summary["metadata"]["slideCount"] == 8
+    assert summary["metadata"]["deckHash"] == expected["metadata"]["deckHash"]
+
+
+def test_ndjson_replays_cache_hits(port, deck):
+    first = post(port, [('deck.pptx', deck)], headers={'Accept': 'application/x-ndjson'})
+    first_lines = ndjson_lines(first)
+    second = post(port, [('deck.pptx', deck)], headers={'Accept': 'application/x-ndjson'})
+    second_lines = ndjson_lines(second)
+
+    assert (first.getheader('X-Cache'), second.getheader('X-Cache')) == ('MISS', 'HIT')
+    assert second_lines[:-1] == first_lines[:-1]
+    assert second_lines[-1]["metadata"]["cache"]["status"] == 'hit'
+
+
+def test_ndjson_reports_failures_after_headers_in_band(port, deck, module, monkeypatch):
+    def failing_upload(upload, *args):
+        yield 'metadata', {"slideCount": 1}
+        yield 'table', {"slideNumber": 1}
+        raise RuntimeError("slide 2 is corrupt")
+
+    monkeypatch.setattr(module, 'iter_upload', failing_upload)
+    response = post(port, [('deck.pptx', deck)], '/?stream=1')
+    lines = ndjson_lines(response)
+
+    assert response.status == 200
+    assert lines == [
+        {"type": "table", "table": {"slideNumber": 1}},
+        {"type": "error", "success": False, "error": "Failed to extract data: slide 2 is corrupt"},
+    ]
+
+
+def test_no_cache_parses_every_slide_again(port, deck):
+    first = json.loads(post(port, [('deck.pptx', deck)]).read())
+    assert first["metadata"]["incremental"] == {"reusedSlides": 0, "newSlides": 8}
+
+    for headers in ({'Cache-Control': 'no-cache'}, {'Cache-Control': 'no-cache', 'Accept': 'application/x-ndjson'}):
+        response = post(port, [('deck.pptx', deck)], '/?timings=1', headers)
+        body = response.read()
+        metadata = json.loads(body.splitlines()[-1])["metadata"]
+        assert response.getheader('X-Cache') == 'BYPASS'
+        assert metadata["incremental"] == {"reusedSlides": 0, "newSlides": 8}
+        assert metadata["timings"]["counts"]["parsedSlides"] == 8
+
+
+def test_timings_report_per_request_peak_allocation(port, deck):
+    for _ in range(2):
+        response = post(port, [('deck.pptx', deck)], '/?timings=1', {'Cache-Control': 'no-cache'})
+        timings = json.loads(response.read())["metadata"]["timings"]
+        # Measured per request, so a warm instance still reports it
+        assert timings["peakAllocatedBytes"] > len(deck)
+
+    metadata = json.loads(post(port, [('deck.pptx', deck)]).read())["metadata"]
+    assert "timings" not in metadata
+
+
+def raw_request(body: bytes) -> io.BytesIO:
+    head = (
+        'POST / HTTP/1.1\r\n'
+        f'Content-Type: {CONTENT_TYPE}\r\n'
+        f'Content-Length: {len(body)}\r\n\r\n'
+    ).encode()
+    return io.BytesIO(head + body)
+
+
+def test_server_error_with_unread_body_closes_connection(deck, module, monkeypatch):
+    def failing_spool(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(module, 'spool_part', failing_spool)
+    wfile = io.BytesIO()
+    # Larger than one multipart chunk, so part of it is still unread
+    keep_alive = run_handler(module.handler, raw_request(multipart_body([('deck.pptx', b'PK' * 100000)])), wfile,
+                             ('127.0.0.1', 0))
+
+    assert wfile.getvalue().startswith(b'HTTP/1.1 500 ')
+    assert keep_alive is False
+
+
+def test_server_error_after_whole_body_keeps_connection(module):
+    wfile = io.BytesIO()
+    keep_alive = run_handler(module.handler, raw_request(multipart_body([('deck.pptx', b'PK not a zip')])), wfile,
+                             ('127.0.0.1', 0))
+
+    assert wfile.getvalue().startswith(b'HTTP/1.1 500 ')
+    assert keep_alive is True
+
+
+def test_batch_isolates_per_file_errors_and_disambiguates_names(port, deck):
+    other = build_deck(DeckSpec(slides=3, seed=2))
+    response = post(port, [
+        ('deck.pptx', deck),
+        ('deck.pptx', other),
+        ('notes.txt', b'plain text'),
+        ('nomagic.pptx', b'not a zip'),
+        ('corrupt.pptx', b'PK but not a zip'),
+    ], '/?batch=1')
+    result = json.loads(response.read())
+
+    assert response.status == 200
+    assert result["metadata"] == {"fileCount": 5, "succeeded": 2, "failed": 3}
+    files = result["files"]
+    assert list(files) == ['deck.pptx', 'deck (2).pptx', 'notes.txt', 'nomagic.pptx', 'corrupt.pptx']
+    assert files['deck.pptx']["metadata"]["slideCount"] == 8
+    assert files['deck (2).pptx']["metadata"]["slideCount"] == 3
+    assert files['notes.txt'] == {"success": False, "error": "Please upload a .pptx file"}
+    assert files['nomagic.pptx'] == {"success": False, "error": "Invalid PowerPoint file format"}
+    assert files['corrupt.pptx']["success"] is False
+    assert files['corrupt.pptx']["error"].startswith("Failed to extract data: ")
+
+
+def test_batch_rejects_too_many_files(port, deck, module, monkeypatch):
+    monkeypatch.setattr(module, 'MAX_BATCH_FILES', 2)
+    response = post(port, [('a.pptx', deck), ('b.pptx', deck), ('c.pptx', deck)], '/?batch=1')
+
+    assert response.status == 400
+    assert json.loads(response.read()) == {"success": False, "error": "A batch may contain at most 2 files"}
+
+
+def test_batch_ndjson_writes_files_in_completion_order(port, deck, module, monkeypatch):
+    extract_batch_file = module.extract_batch_file
+    first_done = threading.Event()
+
+    def ordered_extract(upload, *args):
+        if upload.filename == 'slow.pptx':
+            first_done.wait(10)
+        result = extract_batch_file(upload, *args)
+        first_done.set()
+        return result
+
+    monkeypatch.setattr(module, 'extract_batch_file', ordered_extract)
+    response = post(port, [('slow.pptx', deck), ('fast.pptx', deck), ('bad.txt', b'')], '/?batch=1&stream=1')
+    lines = ndjson_lines(response)
+
+    assert response.status == 200
+    assert [(line["type"], line.get("filename")) for line in lines] == [
+        ("file", 'bad.txt'),
+        ("file", 'fast.pptx'),
+        ("file", 'slow.pptx'),
+        ("summary", None),
+    ]
+    assert lines[1]["result"]["tables"] == lines[2]["result"]["tables"]
+    assert lines[-1] == {"type": "summary", "success": True,
+                         "metadata": {"fileCount": 3, "succeeded": 2, "failed": 1}}
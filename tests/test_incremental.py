@@ -0,0 +1,161 @@
+import io
+import zipfile
+
+import pytest
+
+from _extractor.cache import ResultCache
+from _extractor.filters import ExtractionFilter
+from _extractor.incremental import SlideStore, diff_decks
+from _extractor.tables import collect_presentation
+from _extractor.warmup import WARMUP_SLIDE_XML
+from _extractor.xml_engine import NS_P, NS_PKG_RELS, NS_R, RT_OFFICE_DOCUMENT, RT_SLIDE, iter_presentation_xml
+
+TABLE_A = [['Date', 'Spend'], ['Jan', '$1']]
+TABLE_B = [['Date', 'Spend'], ['Jan', '$2']]
+HEADER_ONLY = [['Date', 'Spend']]
+
+
+def make_store(slides: dict[str, list], decks: dict[str, list[str]]) -> SlideStore:
+    store = SlideStore(ResultCache(max_memory_bytes=1024 * 1024))
+    for slide_hash, tables in slides.items():
+        store.put_slide(slide_hash, f'title {slide_hash}', tables)
+    for deck_hash, slide_hashes in decks.items():
+        store.put_manifest(deck_hash, slide_hashes)
+    return store
+
+
+def test_unknown_previous_deck():
+    assert diff_decks(make_store({}, {}), 'abc', ['s1']) == {"since": 'abc', "available": False}
+
+
+def test_identical_decks():
+    store = make_store({'s1': [TABLE_A]}, {'old': ['s1']})
+    assert diff_decks(store, 'old', ['s1']) == {
+        "since": 'old', "available": True, "changedSlides": [], "addedSlides": [], "removedSlides": [], "tables": [],
+    }
+
+
+def test_changed_added_and_removed_slides():
+    store = make_store(
+        {'s1': [TABLE_A], 's2': [TABLE_A], 's2b': [TABLE_B, TABLE_A], 's3': [], 'n4': [TABLE_A]},
+        {'old': ['s1', 's2', 's3', 'gone']},
+    )
+    diff = diff_decks(store, 'old', ['s1', 's2b', 's3'])
+    assert diff["changedSlides"] == [2]
+    assert diff["addedSlides"] == []
+    assert diff["removedSlides"] == [4]
+    assert diff["tables"] == [
+        {"slideNumber": 2, "tableIndex": 0, "change": 'changed'},
+        {"slideNumber": 2, "tableIndex": 1, "change": 'added'},
+    ]
+
+    diff = diff_decks(store, 'old', ['s1', 's2', 's3', 'gone', 'n4'])
+    assert diff["changedSlides"] == []
+    assert diff["addedSlides"] == [5]
+    assert diff["tables"] == [{"slideNumber": 5, "tableIndex": 0, "change": 'added'}]
+
+
+def test_removed_table_and_table_index_ignores_header_only_grids():
+    store = make_store({'s1': [HEADER_ONLY, TABLE_A, TABLE_B], 's1b': [TABLE_A]}, {'old': ['s1']})
+    diff = diff_decks(store, 'old', ['s1b'])
+    assert diff["changedSlides"] == [1]
+    assert diff["tables"] == [{"slideNumber": 1, "tableIndex": 1, "change": 'removed'}]
+
+
+def test_slide_scans_missing_from_store_are_listed_without_table_changes():
+    store = make_store({'s1': [TABLE_A]}, {'old': ['s1']})
+    diff = diff_decks(store, 'old', ['evicted'])
+    assert diff["changedSlides"] == [1]
+    assert diff["tables"] == []
+
+
+def build_deck(slides: list[bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        zf.writestr('_rels/.rels', (
+            f'<Relationships xmlns="{NS_PKG_RELS}"><Relationship Id="rId1" Type="{RT_OFFICE_DOCUMENT}" '
+            'Target="ppt/presentation.xml"/></Relationships>'
+        ))
+        zf.writestr('ppt/presentation.xml', (
+            f'<p:presentation xmlns:p="{NS_P}" xmlns:r="{NS_R}"><p:sldIdLst>'
+            + ''.join(f'<p:sldId id="{256 + n}" r:id="rId{n}"/>' for n in range(1, len(slides) + 1))
+            + '</p:sldIdLst></p:presentation>'
+        ))
+        zf.writestr('ppt/_rels/presentation.xml.rels', (
+            f'<Relationships xmlns="{NS_PKG_RELS}">'
+            + ''.join(f'<Relationship Id="rId{n}" Type="{RT_SLIDE}" Target="slides/slide{n}.xml"/>'
+                      for n in range(1, len(slides) + 1))
+            + '</Relationships>'
+        ))
+        for n, slide_xml in enumerate(slides, 1):
+            zf.writestr(f'ppt/slides/slide{n}.xml', slide_xml)
+    return buffer.getvalue()
+
+
+def slide_xml(title: str, metric: str) -> bytes:
+    return WARMUP_SLIDE_XML.replace(b'Warm-up', title.encode()).replace(b'CTR', metric.encode())
+
+
+DECK = build_deck([slide_xml(f'{"Performance" if n % 2 else "Summary"} {n}', 'CTR' if n % 3 else 'Clicks')
+                   for n in range(1, 9)])
+
+FILTERS = [
+    {},
+    {'slides': '2-4'},
+    {'title': '^Performance'},
+    {'header': 'ctr'},
+    {'slides': '3-', 'title': 'Summary', 'header': 'clicks|ctr'},
+    {'max_tables': '2'},
+]
+
+
+def extract(deck: bytes, params: dict, store: SlideStore | None = None) -> dict:
+    result = collect_presentation(iter_presentation_xml(
+        deck, table_filter=ExtractionFilter.from_params(**params), slide_store=store, deck_hash='deck'))
+    result["metadata"].pop("incremental", None)
+    return result
+
+
+@pytest.mark.parametrize('params', FILTERS)
+def test_store_does_not_change_filtered_results(params):
+    expected = extract(DECK, params)
+    cold_store = make_store({}, {})
+    assert extract(DECK, params, cold_store) == expected
+
+    warm_store = make_store({}, {})
+    extract(DECK, {}, warm_store)
+    assert extract(DECK, params, warm_store) == expected
+
+
+def test_title_and_header_filtered_scans_are_not_stored():
+    store = make_store({}, {})
+    extract(DECK, {'title': '^Performance'}, store)
+    extract(DECK, {'header': 'ctr'}, store)
+    assert store.cache.stats()["entries"] == 1  # Only the deck's manifest
+
+
+def test_slide_range_fingerprints_and_stores_only_selected_slides():
+    store = make_store({}, {})
+    events = list(iter_presentation_xml(DECK, table_filter=ExtractionFilter.from_params(slides='2-3'),
+                                        slide_store=store, deck_hash='deck'))
+    assert events[0][1]["incremental"] == {"reusedSlides": 0, "newSlides": 2}
+    assert store.get_manifest('deck') is None
+    assert store.cache.stats()["entries"] == 2
+
+    events = list(iter_presentation_xml(DECK, slide_store=store, deck_hash='deck'))
+    assert events[0][1]["incremental"] == {"reusedSlides": 2, "newSlides": 6}
+    assert len(store.get_manifest('deck')) == 8
+
+
+def test_without_slide_reuse_every_slide_is_parsed_and_stored():
+    store = make_store({}, {})
+    extract(DECK, {}, store)
+    store.cache.hits = 0
+
+    events = list(iter_presentation_xml(DECK, slide_store=store, deck_hash='deck', reuse_slides=False))
+    assert events[0][1]["incremental"] == {"reusedSlides": 0, "newSlides": 8}
+    assert store.cache.hits == 0
+    assert len(store.get_manifest('deck')) == 8
+
+    events = list(iter_presentation_xml(DECK, slide_store=store, deck_hash='deck'))
+    assert events[0][1]["incremental"] == {"reusedSlides": 8, "newSlides": 0}
@@ -0,0 +1,195 @@
+import hashlib
+import io
+
+import pytest
+
+from _extractor.multipart import (
+    EVENT_DATA,
+    EVENT_DONE,
+    EVENT_PART,
+    EVENT_PART_END,
+    MultipartError,
+    MultipartParser,
+    MultipartReader,
+    UploadRejected,
+    parse_boundary,
+    spool_part,
+)
+
+BOUNDARY = b'----formboundary7MA4YWxk'
+
+
+def build_body(parts: list[tuple[str, str | None, bytes]], preamble: bytes = b'', epilogue: bytes = b'') -> bytes:
+    body = preamble
+    for name, filename, data in parts:
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+        body += b'--' + BOUNDARY + b'\r\n'
+        body += f'Content-Disposition: {disposition}\r\n\r\n'.encode()
+        body += data + b'\r\n'
+    return body + b'--' + BOUNDARY + b'--\r\n' + epilogue
+
+
+class CountingStream(io.BytesIO):
+    """BytesIO that records how many bytes were read from it."""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.consumed = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.consumed += len(chunk)
+        return chunk
+
+
+def make_reader(body: bytes, chunk_size: int = 64 * 1024) -> MultipartReader:
+    return MultipartReader(CountingStream(body), BOUNDARY, len(body), chunk_size=chunk_size)
+
+
+def read_parts(reader: MultipartReader) -> list[tuple[str, str | None, bytes]]:
+    return [(part.name, part.filename, b''.join(part.iter_chunks())) for part in reader]
+
+
+PARTS = [
+    ('title', None, b'Q3 report'),
+    ('file', 'deck.pptx', b'PK\x03\x04' + bytes(range(256)) * 4 + b'\r\n--not-the-boundary\r\n'),
+    ('notes', None, b''),
+]
+
+
+def test_parse_boundary():
+    assert parse_boundary('multipart/form-data; boundary=abc') == b'abc'
+    assert parse_boundary('Multipart/Form-Data; charset=utf-8; boundary="a b"') == b'a b'
+    assert parse_boundary('application/json') is None
+    assert parse_boundary('multipart/form-data') is None
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, len(BOUNDARY) + 3, 64, 64 * 1024])
+def test_parts_survive_delimiter_split_across_chunks(chunk_size):
+    body = build_body(PARTS)
+    assert read_parts(make_reader(body, chunk_size)) == PARTS
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 16, 64 * 1024])
+def test_unread_part_is_skipped(chunk_size):
+    reader = make_reader(build_body(PARTS), chunk_size)
+    names = [part.name for part in reader]
+    assert names == ['title', 'file', 'notes']
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 16, 300, 64 * 1024])
+def test_part_abandoned_after_its_last_chunk(chunk_size):
+    # Stop pulling chunks once all of the part's data has arrived, without
+    # letting the generator see the delimiter: the next part must still be
+    # found rather than skipped
+    reader = make_reader(build_body(PARTS), chunk_size)
+    parts = iter(reader)
+
+    first = next(parts)
+    chunks = first.iter_chunks()
+    received = b''
+    while len(received) < len(PARTS[0][2]):
+        received += next(chunks)
+    assert received == PARTS[0][2]
+
+    second = next(parts)
+    assert (second.name, second.filename, b''.join(second.iter_chunks())) == PARTS[1]
+    third = next(parts)
+    assert third.name == 'notes'
+    assert list(parts) == []
+
+
+def test_preamble_closing_delimiter_and_epilogue():
+    body = build_body(PARTS[:1], preamble=b'ignored preamble\r\n',
+                      epilogue=b'epilogue --' + BOUNDARY + b'\r\nContent-Disposition: form-data; name="x"\r\n\r\n')
+    assert read_parts(make_reader(body, chunk_size=4)) == PARTS[:1]
+
+
+def test_missing_closing_delimiter_is_malformed():
+    body = build_body(PARTS[:1])
+    truncated = body[:body.rindex(b'\r\n--' + BOUNDARY)]
+    with pytest.raises(MultipartError):
+        read_parts(make_reader(truncated))
+
+
+def test_body_without_any_delimiter_is_malformed():
+    with pytest.raises(MultipartError):
+        read_parts(make_reader(b'not multipart at all'))
+
+
+def check_pptx_magic(head: bytes) -> str | None:
+    return None if head.startswith(b'PK') else "Invalid PowerPoint file format"
+
+
+def test_parser_events_do_not_depend_on_how_the_body_is_split():
+    body = build_body(PARTS, preamble=b'ignored\r\n', epilogue=b'ignored')
+    parser = MultipartParser(BOUNDARY)
+    events = [event for i in range(len(body)) for event in parser.feed(body[i:i + 1])]
+    parser.close()
+
+    parts = []
+    for event in events:
+        if event[0] == EVENT_PART:
+            parts.append([event[1].get_param('name', header='content-disposition'), event[1].get_filename(), b''])
+        elif event[0] == EVENT_DATA:
+            parts[-1][2] += event[1]
+    assert [tuple(part) for part in parts] == PARTS
+    assert [event[0] for event in events if event[0] != EVENT_DATA] == [EVENT_PART, EVENT_PART_END] * 3 + [EVENT_DONE]
+    assert parser.done
+
+
+def test_parser_close_before_closing_delimiter_is_malformed():
+    parser = MultipartParser(BOUNDARY)
+    parser.feed(build_body(PARTS)[:-10])
+    with pytest.raises(MultipartError):
+        parser.close()
+
+
+def test_spool_part_copies_data_and_digest():
+    data = b'PK\x03\x04' + b'x' * 200_000
+    reader = make_reader(build_body([('file', 'deck.pptx', data)]), chunk_size=4096)
+    part = next(iter(reader))
+    upload = spool_part(part, part.filename, max_bytes=len(data), check_head=check_pptx_magic)
+    try:
+        assert upload.filename == 'deck.pptx'
+        assert upload.size == len(data)
+        assert upload.file.read() == data
+        assert upload.sha256 == hashlib.sha256(data).hexdigest()
+    finally:
+        upload.close()
+
+
+def test_spool_part_rejects_bad_magic_on_first_chunk():
+    body = build_body([('file', 'deck.pptx', b'%PDF' + b'x' * 1_000_000)])
+    reader = make_reader(body, chunk_size=4096)
+    part = next(iter(reader))
+    with pytest.raises(UploadRejected, match="Invalid PowerPoint file format"):
+        spool_part(part, part.filename, max_bytes=10 * 1024 * 1024, check_head=check_pptx_magic)
+    assert reader.bytes_read <= 2 * 4096
+
+
+def test_spool_part_checks_magic_split_across_chunks():
+    reader = make_reader(build_body([('file', 'deck.pptx', b'PK\x03\x04data')]), chunk_size=1)
+    part = next(iter(reader))
+    upload = spool_part(part, part.filename, max_bytes=100, check_head=check_pptx_magic)
+    assert upload.size == 8
+    upload.close()
+
+
+def test_spool_part_checks_magic_of_tiny_file():
+    reader = make_reader(build_body([('file', 'deck.pptx', b'P')]))
+    part = next(iter(reader))
+    with pytest.raises(UploadRejected):
+        spool_part(part, part.filename, max_bytes=100, check_head=check_pptx_magic)
+
+
+def test_spool_part_stops_at_size_limit():
+    max_bytes = 1024 * 1024
+    body = build_body([('file', 'deck.pptx', b'PK' + b'x' * (10 * max_bytes))])
+    reader = make_reader(body, chunk_size=64 * 1024)
+    part = next(iter(reader))
+    with pytest.raises(UploadRejected, match="less than 1MB"):
+        spool_part(part, part.filename, max_bytes=max_bytes, check_head=check_pptx_magic)
+    assert reader.bytes_read < max_bytes + 3 * 64 * 1024
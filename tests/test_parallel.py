@@ -0,0 +1,79 @@
+import io
+import os
+import signal
+import zipfile
+
+import pytest
+
+from _extractor import parallel
+from _extractor.warmup import WARMUP_SLIDE_XML
+from _extractor.xml_engine import iter_slide_content_scans, iter_slide_scans
+
+SLIDE_COUNT = 24
+
+
+@pytest.fixture
+def deck():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        for slide_num in range(1, SLIDE_COUNT + 1):
+            zf.writestr(f'ppt/slides/slide{slide_num}.xml', WARMUP_SLIDE_XML.replace(b'Warm-up', b'Slide %d' % slide_num))
+    with zipfile.ZipFile(buffer) as zf:
+        yield zf, [(n, f'ppt/slides/slide{n}.xml') for n in range(1, SLIDE_COUNT + 1)]
+
+
+@pytest.fixture
+def pool():
+    executor = parallel.get_executor(2)
+    if executor is None:
+        pytest.skip("process pools are unavailable here")
+    yield executor
+    parallel.discard_executor(parallel.get_executor(2))
+
+
+def test_parallel_scans_match_serial(deck, pool):
+    zf, slide_parts = deck
+    assert list(parallel.iter_slide_scans_parallel(zf, slide_parts, pool, 2)) == list(iter_slide_scans(zf, slide_parts))
+
+
+def test_parallel_content_scans_match_serial(deck, pool):
+    zf, slide_parts = deck
+    expected = list(iter_slide_content_scans(zf, slide_parts))
+    assert list(parallel.iter_slide_content_scans_parallel(zf, slide_parts, pool, 2)) == expected
+
+
+def test_killed_worker_falls_back_to_serial_and_pool_is_replaced(deck, pool):
+    zf, slide_parts = deck
+    expected = list(iter_slide_scans(zf, slide_parts))
+    list(pool.map(parallel.scan_slide_batch, [[(1, WARMUP_SLIDE_XML)]] * 2))  # Start the workers
+
+    os.kill(next(iter(pool._processes)), signal.SIGKILL)
+    assert list(parallel.iter_slide_scans_parallel(zf, slide_parts, pool, 2)) == expected
+
+    replacement = parallel.get_executor(2)
+    assert replacement is not pool
+    assert list(parallel.iter_slide_scans_parallel(zf, slide_parts, replacement, 2)) == expected
+
+
+def test_pool_breaking_mid_deck_resumes_after_yielded_slides(deck, pool):
+    zf, slide_parts = deck
+    expected = list(iter_slide_scans(zf, slide_parts))
+    scans = parallel.iter_slide_scans_parallel(zf, slide_parts, pool, 2)
+    received = [next(scans)]
+
+    for pid in list(pool._processes):
+        os.kill(pid, signal.SIGKILL)
+    received.extend(scans)
+    assert received == expected
+
+
+def test_content_scans_resume_serially_when_pool_breaks(deck, pool):
+    zf, slide_parts = deck
+    expected = list(iter_slide_content_scans(zf, slide_parts))
+    scans = parallel.iter_slide_content_scans_parallel(zf, slide_parts, pool, 2)
+    received = [next(scans)]
+
+    for pid in list(pool._processes):
+        os.kill(pid, signal.SIGKILL)
+    received.extend(scans)
+    assert received == expected
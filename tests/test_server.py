@@ -0,0 +1,210 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from lumina_deck import DeckSpec, build_deck
+
+from _extractor import ResultCache, SlideStore
+from _extractor.server import ExtractionServer, load_handler_module
+
+BOUNDARY = 'servertestboundary'
+
+
+@pytest.fixture(scope='module')
+def module():
+    return load_handler_module()
+
+
+@pytest.fixture(scope='module')
+def deck() -> bytes:
+    return build_deck(DeckSpec(slides=6, seed=4))
+
+
+async def cancel_connections():
+    pending = asyncio.all_tasks() - {asyncio.current_task()}
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+@pytest.fixture
+def start_server(module, monkeypatch):
+    """Start an ExtractionServer for the handler module on its own event
+    loop thread, returning its port."""
+    monkeypatch.setattr(module, 'result_cache', ResultCache())
+    monkeypatch.setattr(module, 'slide_store', SlideStore(ResultCache()))
+    monkeypatch.setattr(module.handler, 'log_message', lambda *args: None)
+    started = []
+
+    def start(**options) -> int:
+        loop = asyncio.new_event_loop()
+        extraction_server = ExtractionServer.from_module(module, **{'workers': 1, 'max_queue': 1, **options})
+        listener = loop.run_until_complete(extraction_server.start('127.0.0.1', 0))
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        started.append((loop, thread, listener, extraction_server))
+        return listener.sockets[0].getsockname()[1]
+
+    yield start
+    for loop, thread, listener, extraction_server in started:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        listener.close()
+        loop.run_until_complete(cancel_connections())
+        loop.close()
+        extraction_server.executor.shutdown()
+
+
+def multipart_body(files: list[tuple[str, bytes]]) -> bytes:
+    body = b''
+    for filename, data in files:
+        body += (
+            f'--{BOUNDARY}\r\n'
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n\r\n'
+        ).encode() + data + b'\r\n'
+    return body + f'--{BOUNDARY}--\r\n'.encode()
+
+
+def post(path: str, body: bytes, content_length: int | None = None) -> bytes:
+    length = len(body) if content_length is None else content_length
+    return (
+        f'POST {path} HTTP/1.1\r\nHost: test\r\n'
+        f'Content-Type: multipart/form-data; boundary={BOUNDARY}\r\n'
+        f'Content-Length: {length}\r\n\r\n'
+    ).encode() + body
+
+
+async def connect(port: int, raw: bytes) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(raw)
+    await writer.drain()
+    return reader, writer
+
+
+async def read_response(reader: asyncio.StreamReader) -> tuple[int, dict]:
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = int(head.lower().split(b'content-length: ', 1)[1].split(b'\r\n', 1)[0])
+    return status, json.loads(await reader.readexactly(length))
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, 20))
+
+
+def test_uploads_are_served_on_a_kept_alive_connection(start_server, deck):
+    port = start_server()
+
+    async def exchange():
+        body = multipart_body([('deck.pptx', deck)])
+        reader, writer = await connect(port, post('/', body) + post('/?format=columnar', body))
+        responses = [await read_response(reader), await read_response(reader)]
+        writer.close()
+        return responses
+
+    (first_status, first), (second_status, second) = run(exchange())
+    assert (first_status, second_status) == (200, 200)
+    assert first["metadata"]["slideCount"] == second["metadata"]["slideCount"] == 6
+    assert len(first["tables"]) == len(second["tables"]) > 0
+
+
+def test_invalid_upload_is_rejected_on_its_first_chunk(start_server):
+    port = start_server()
+    body = multipart_body([('deck.pptx', b'not a zip' + b'x' * 100000)])
+
+    async def exchange():
+        # Only the start of the body is sent; the client waits for the answer
+        reader, writer = await connect(port, post('/', body[:1000], content_length=len(body)))
+        response = await read_response(reader)
+        writer.close()
+        return response
+
+    assert run(exchange()) == (400, {"success": False, "error": "Invalid PowerPoint file format"})
+
+
+def test_batch_over_the_file_limit_is_rejected_before_the_rest_arrives(start_server, deck, module, monkeypatch):
+    monkeypatch.setattr(module, 'MAX_BATCH_FILES', 1)
+    port = start_server()
+    body = multipart_body([('a.pptx', deck), ('b.pptx', deck), ('c.pptx', deck)])
+
+    async def exchange():
+        sent = body.index(b'filename="b.pptx"') + 100
+        reader, writer = await connect(port, post('/?batch=1', body[:sent], content_length=len(body)))
+        response = await read_response(reader)
+        writer.close()
+        return response
+
+    assert run(exchange()) == (400, {"success": False, "error": "A batch may contain at most 1 files"})
+
+
+def test_oversized_upload_is_rejected_from_headers(start_server, module):
+    port = start_server()
+    content_length = module.MAX_FILE_SIZE_BYTES * 2
+
+    async def exchange():
+        reader, writer = await connect(port, post('/', b'', content_length=content_length))
+        response = await read_response(reader)
+        writer.close()
+        return response
+
+    assert run(exchange()) == (400, {"success": False, "error": "File size must be less than 50MB"})
+
+
+def test_stalled_upload_does_not_delay_other_requests(start_server, deck):
+    port = start_server(workers=1)
+    body = multipart_body([('deck.pptx', deck)])
+
+    async def exchange():
+        half = len(body) // 2
+        stalled_reader, stalled_writer = await connect(port, post('/', body[:half], content_length=len(body)))
+        await asyncio.sleep(0.2)
+
+        started = time.monotonic()
+        reader, writer = await connect(port, post('/', body))
+        status, result = await read_response(reader)
+        elapsed = time.monotonic() - started
+        writer.close()
+
+        # The stalled upload still completes once the rest arrives
+        stalled_writer.write(body[half:])
+        stalled_status, _ = await read_response(stalled_reader)
+        stalled_writer.close()
+        return status, elapsed, stalled_status
+
+    status, elapsed, stalled_status = run(exchange())
+    assert (status, stalled_status) == (200, 200)
+    assert elapsed < 5
+
+
+def test_upload_past_the_body_deadline_is_answered_with_408(start_server, deck):
+    port = start_server(body_timeout=0.5)
+    body = multipart_body([('deck.pptx', deck)])
+
+    async def exchange():
+        reader, writer = await connect(port, post('/', body[:100], content_length=len(body)))
+        # Trickle part of the body, then stall well short of the read timeout
+        for offset in range(100, 500, 100):
+            await asyncio.sleep(0.1)
+            writer.write(body[offset:offset + 100])
+        response = await read_response(reader)
+        closed = await reader.read() == b''
+        writer.close()
+        return response, closed
+
+    response, closed = run(exchange())
+    assert response == (408, {"success": False, "error": "Upload took too long to arrive"})
+    assert closed
+
+
+def test_body_limit_follows_request_mode(module):
+    extraction_server = ExtractionServer.from_module(module)
+    try:
+        single = module.MAX_FILE_SIZE_BYTES + module.MULTIPART_OVERHEAD_BYTES
+        batch = module.MAX_BATCH_BYTES + module.MULTIPART_OVERHEAD_BYTES
+        assert extraction_server.body_limit('/') == single
+        assert extraction_server.body_limit('/?batch=0') == single
+        assert extraction_server.body_limit('/?format=columnar&batch=TRUE') == batch
+    finally:
+        extraction_server.executor.shutdown()